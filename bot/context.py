@@ -11,10 +11,15 @@ from config.settings import get_settings
 from .middlewares import get_session_maker
 from .services.core.referral_service import ReferralService
 from .services.core.ton_connect import TonConnectService
+from .services.ton.blacklist import get_blacklist
+from .services.ton.code_verdicts import get_code_verdicts
 from .services.ton.gem_scanner import GemScanner
 from .services.ton.gem_watch import GemWatchService
 from .services.ton.price_feed import PriceFeedService
+from .services.ton.recheck_scheduler import RecheckScheduler
 from .services.ton.safety_checker import SafetyChecker
+from .services.ton.simulation_pool import get_simulation_pool
+from .services.ton.smart_money import get_smart_money_registry
 from .services.ton.swap_service import SwapService
 from .utils.cache import configure_cache
 from .utils.i18n import get_i18n
@@ -30,6 +35,10 @@ bot = Bot(
 )
 dp = Dispatcher(storage=MemoryStorage())
 
+smart_money_registry = get_smart_money_registry()
+blacklist = get_blacklist()
+code_verdicts = get_code_verdicts()
+simulation_pool = get_simulation_pool()
 safety_checker = SafetyChecker()
 gem_scanner = GemScanner(safety_checker=safety_checker)
 swap_service = SwapService()
@@ -38,22 +47,35 @@ referral_service = ReferralService()
 gem_watch_service = GemWatchService(bot)
 i18n = get_i18n()
 price_feed_service = PriceFeedService(swap_service.list_tracked_jettons)
+recheck_scheduler = RecheckScheduler(
+    safety_checker,
+    hot=gem_scanner.get_hot_signals,
+    watched=gem_watch_service.watched_tokens,
+    held=swap_service.list_tracked_jettons,
+)
 
 swap_service.set_session_maker(session_maker)
 ton_connect.set_session_maker(session_maker)
 gem_scanner.set_session_maker(session_maker)
+smart_money_registry.set_session_maker(session_maker)
+code_verdicts.set_session_maker(session_maker)
 
 __all__ = [
+    "blacklist",
     "bot",
+    "code_verdicts",
     "dp",
     "gem_scanner",
     "gem_watch_service",
     "i18n",
     "price_feed_service",
+    "recheck_scheduler",
     "referral_service",
     "safety_checker",
     "session_maker",
     "settings",
+    "simulation_pool",
+    "smart_money_registry",
     "swap_service",
     "ton_connect",
 ]
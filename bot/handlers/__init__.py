@@ -8,12 +8,13 @@ from aiogram import Dispatcher
 def register_routers(dispatcher: Dispatcher) -> None:
     """Подключает все доступные роутеры к диспетчеру."""
 
-    from .core import common, referral, wallet
+    from .core import admin, common, referral, wallet
     from .ton import gem_hunter, positions, token_check, trading
 
     routers = (
         wallet.router,  # FSM handlers должны быть первыми
         common.router,
+        admin.router,
         referral.router,
         gem_hunter.router,
         positions.router,
@@ -0,0 +1,114 @@
+"""Админские команды HyperSniper (метрики пайплайна, вердикты шаблонов минтеров)."""
+
+from __future__ import annotations
+
+import html
+import time
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.filters.command import CommandObject
+from aiogram.types import Message
+
+from bot.context import code_verdicts, settings
+from bot.utils.i18n import get_i18n
+from bot.utils.latency import get_latency_metrics
+
+router = Router(name="core-admin")
+i18n = get_i18n()
+
+# Порядок стадий в выводе; стадии плагинов идут следом по алфавиту.
+_STAGE_ORDER = (
+    "cache",
+    "jetton_data",
+    "honeypot",
+    "liquidity",
+    "volume",
+    "smart_money",
+    "blacklist",
+    "scoring",
+    "total",
+    "batch",
+)
+
+
+@router.message(Command("stats"))
+async def handle_stats(message: Message, command: CommandObject) -> None:
+    """Перцентили задержек по стадиям SafetyChecker; ``/stats reset`` обнуляет окно."""
+
+    if message.from_user is None or message.from_user.id not in settings.telegram.admins:
+        return
+    locale = i18n.detect_locale(getattr(message.from_user, "language_code", None))
+    metrics = get_latency_metrics()
+    if (command.args or "").strip().lower() == "reset":
+        metrics.reset()
+        await message.answer(i18n.gettext("stats_reset", locale=locale))
+        return
+    snapshot = metrics.snapshot()
+    if not snapshot:
+        await message.answer(i18n.gettext("stats_empty", locale=locale))
+        return
+    stages = [name for name in _STAGE_ORDER if name in snapshot]
+    stages += sorted(name for name in snapshot if name not in _STAGE_ORDER)
+    lines = [f"{'stage':<12} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7} {'n':>6} {'t/o':>5}"]
+    for name in stages:
+        stage = snapshot[name]
+        lines.append(
+            f"{name[:12]:<12} {stage['p50_ms']:>7.1f} {stage['p95_ms']:>7.1f} "
+            f"{stage['p99_ms']:>7.1f} {stage['max_ms']:>7.1f} {stage['count']:>6} "
+            f"{stage['timeouts']:>5}"
+        )
+    table = html.escape("\n".join(lines))
+    header = i18n.gettext(
+        "stats_header",
+        locale=locale,
+        target=settings.ton_security.max_safety_latency_ms,
+        uptime=round((time.time() - metrics.started_at) / 60),
+    )
+    await message.answer(f"{header}\n<pre>{table}</pre>")
+
+
+@router.message(Command("codeverdict"))
+async def handle_code_verdict(message: Message, command: CommandObject) -> None:
+    """Вердикт шаблона по code hash; ``/codeverdict forget <hash>`` удаляет ошибочный."""
+
+    if message.from_user is None or message.from_user.id not in settings.telegram.admins:
+        return
+    locale = i18n.detect_locale(getattr(message.from_user, "language_code", None))
+    args = (command.args or "").split()
+    forget = bool(args) and args[0].lower() == "forget"
+    if forget:
+        args = args[1:]
+    if len(args) != 1:
+        await message.answer(i18n.gettext("code_verdict_usage", locale=locale))
+        return
+    code_hash = args[0]
+    if forget:
+        await code_verdicts.forget(code_hash)
+        await message.answer(
+            i18n.gettext("code_verdict_forgotten", locale=locale, code_hash=html.escape(code_hash))
+        )
+        return
+    info = code_verdicts.info(code_hash)
+    if info is None:
+        await message.answer(
+            i18n.gettext("code_verdict_none", locale=locale, code_hash=html.escape(code_hash))
+        )
+        return
+    verdict = info["verdict"]
+    await message.answer(
+        i18n.gettext(
+            "code_verdict_info",
+            locale=locale,
+            code_hash=info["code_hash"],
+            verdict="—" if verdict is None else ("OK" if verdict.sell_allowed else "HONEYPOT"),
+            sample=html.escape(info.get("sample_token", "—")),
+            age=info.get("age_sec", "—"),
+            expired=" (expired)" if info.get("expired") else "",
+            confirmations=info.get("confirmations", 0),
+            failures=info["failures"],
+        )
+    )
+
+
+__all__ = ["router"]
@@ -9,7 +9,13 @@ from aiogram.types import CallbackQuery, Message
 from aiogram.exceptions import TelegramBadRequest
 
 from bot.keyboards.inline.gem import build_gem_list_keyboard, build_token_keyboard
-from bot.context import gem_scanner, gem_watch_service, swap_service, ton_connect
+from bot.context import (
+    gem_scanner,
+    gem_watch_service,
+    simulation_pool,
+    swap_service,
+    ton_connect,
+)
 from bot.utils.i18n import get_i18n
 
 router = Router(name="ton-gem-hunter")
@@ -44,6 +50,7 @@ async def callback_refresh(callback: CallbackQuery) -> None:
 async def callback_safety(callback: CallbackQuery) -> None:
     locale = i18n.detect_locale(getattr(callback.from_user, "language_code", None))
     token_address = callback.data.split(":", maxsplit=2)[2]
+    simulation_pool.mark_viewed(token_address)
     signal = await _find_signal(token_address)
     if not signal:
         await callback.answer(i18n.gettext("gem_not_found", locale=locale), show_alert=True)
@@ -110,6 +117,8 @@ async def callback_watch(callback: CallbackQuery) -> None:
     locale = i18n.detect_locale(getattr(callback.from_user, "language_code", None))
     token_address = callback.data.split(":", maxsplit=2)[2]
     state = await gem_watch_service.toggle_watch(callback.from_user.id, token_address)
+    if state:
+        simulation_pool.mark_viewed(token_address)
     key = "gem_watch_on" if state else "gem_watch_off"
     await callback.answer(i18n.gettext(key, locale=locale), show_alert=state)
 
@@ -252,11 +261,7 @@ async def _render_top(locale: str) -> str:
 
 
 async def _find_signal(address: str):
-    tokens = await gem_scanner.get_top(limit=10)
-    for token in tokens:
-        if token.address == address:
-            return token
-    return None
+    return gem_scanner.get_signal(address)
 
 
 __all__ = ["router"]
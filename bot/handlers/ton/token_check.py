@@ -7,7 +7,8 @@ from aiogram.filters import Command
 from aiogram.filters.command import CommandObject
 from aiogram.types import Message
 
-from bot.context import safety_checker
+from bot.context import safety_checker, simulation_pool
+from bot.services.ton.ton_direct import RpcPriority
 from bot.utils.i18n import get_i18n
 
 router = Router(name="ton-token-check")
@@ -21,7 +22,8 @@ async def handle_check(message: Message, command: CommandObject) -> None:
     if not token_address:
         await message.answer(i18n.gettext("check_usage", locale=locale))
         return
-    report = await safety_checker.check_jetton(token_address)
+    simulation_pool.mark_viewed(token_address)
+    report = await safety_checker.check_jetton(token_address, priority=RpcPriority.USER)
     text = i18n.gettext(
         "check_report",
         locale=locale,
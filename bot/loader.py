@@ -8,15 +8,20 @@ from aiogram import Dispatcher
 from loguru import logger
 
 from .context import (
+    blacklist,
     bot,
+    code_verdicts,
     dp,
     gem_scanner,
     gem_watch_service,
     i18n,
     price_feed_service,
+    recheck_scheduler,
     referral_service,
     safety_checker,
     settings,
+    simulation_pool,
+    smart_money_registry,
     swap_service,
     ton_connect,
 )
@@ -47,6 +52,12 @@ async def on_startup(dispatcher: Dispatcher) -> None:
     price_feed_service.subscribe(_price_feed_dispatch)
     logger.debug("on_startup: start price feed")
     await price_feed_service.start()
+    logger.debug("on_startup: load smart money registry")
+    await smart_money_registry.start()
+    logger.debug("on_startup: load blacklist")
+    await blacklist.start()
+    logger.debug("on_startup: load code hash verdicts")
+    await code_verdicts.start()
     logger.debug("on_startup: set bot for gem scanner notifications")
     gem_scanner.set_bot(bot)
     logger.debug("on_startup: start gem scanner")
@@ -59,13 +70,19 @@ async def on_startup(dispatcher: Dispatcher) -> None:
     gem_scanner.subscribe(_log_hot_tokens)
     gem_scanner.subscribe(gem_watch_service.handle_signals)
     swap_service.subscribe_auto_sell(_notify_auto_sell)
+    logger.debug("on_startup: start safety recheck scheduler")
+    recheck_scheduler.subscribe(gem_watch_service.handle_report_update)
+    await recheck_scheduler.start()
     logger.info("on_startup завершён, бот готов принимать апдейты")
 
 
 async def on_shutdown(dispatcher: Dispatcher) -> None:
     """Мягкое выключение сервиса."""
 
+    await recheck_scheduler.stop()
     await gem_scanner.stop()
+    await smart_money_registry.stop()
+    await blacklist.stop()
     await price_feed_service.stop()
     ton_client = await get_ton_client()
     await ton_client.close()
@@ -116,6 +133,11 @@ def _load_plugins() -> None:
         "settings": settings,
         "services": {
             "safety_checker": safety_checker,
+            "smart_money_registry": smart_money_registry,
+            "blacklist": blacklist,
+            "code_verdicts": code_verdicts,
+            "simulation_pool": simulation_pool,
+            "recheck_scheduler": recheck_scheduler,
             "gem_scanner": gem_scanner,
             "swap_service": swap_service,
             "ton_connect": ton_connect,
@@ -1,16 +1,20 @@
 """SQLModel сущности HyperSniper."""
 
+from .code_verdict import CodeHashVerdict  # noqa: F401
 from .gem_cache import GemCache  # noqa: F401
 from .position import Position, PositionStatus  # noqa: F401
 from .referral import ReferralLink  # noqa: F401
 from .user import User  # noqa: F401
 from .settings import UserSettings  # noqa: F401
+from .smart_money import SmartMoneyWallet  # noqa: F401
 
 __all__ = [
+    "CodeHashVerdict",
     "GemCache",
     "Position",
     "PositionStatus",
     "ReferralLink",
+    "SmartMoneyWallet",
     "UserSettings",
     "User",
 ]
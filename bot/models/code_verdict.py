@@ -0,0 +1,23 @@
+"""Вердикты по шаблонам JettonMinter (code hash контракта)."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlmodel import Field
+
+from .base import TimeStampedModel
+
+
+class CodeHashVerdict(TimeStampedModel, table=True):
+    __tablename__ = "code_hash_verdicts"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    code_hash: str = Field(max_length=64, unique=True, index=True)
+    sell_allowed: bool = Field(default=True)
+    sample_token: str = Field(default="", max_length=128)
+    # Сколько симуляций подтвердили вердикт (для запрета — разных токенов шаблона).
+    confirmations: int = Field(default=1)
+
+
+__all__ = ["CodeHashVerdict"]
@@ -0,0 +1,21 @@
+"""Реестр смарт-кошельков (вес влияет на скоринг токенов)."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from sqlmodel import Field
+
+from .base import TimeStampedModel
+
+
+class SmartMoneyWallet(TimeStampedModel, table=True):
+    __tablename__ = "smart_money_wallets"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    address: str = Field(max_length=128, unique=True, index=True)
+    weight: float = Field(default=1.0)
+    label: Optional[str] = Field(default=None, max_length=64)
+
+
+__all__ = ["SmartMoneyWallet"]
@@ -18,10 +18,17 @@ from .position_repo import (
     upsert_rule,
 )
 from .gem_cache_repo import upsert_gem_cache
+from .code_verdict_repo import (
+    delete_code_hash_verdict,
+    load_code_hash_verdicts,
+    upsert_code_hash_verdict,
+)
+from .smart_money_repo import load_smart_money_wallets
 
 __all__ = [
     "attach_wallet_data",
     "clear_wallet_data",
+    "delete_code_hash_verdict",
     "ensure_user_by_telegram_id",
     "get_or_create_user",
     "get_user_by_ref_code",
@@ -30,8 +37,11 @@ __all__ = [
     "get_positions_by_jetton",
     "list_rules_for_wallet",
     "load_active_rules",
+    "load_code_hash_verdicts",
+    "load_smart_money_wallets",
     "mark_rule_status",
     "update_pnl",
+    "upsert_code_hash_verdict",
     "upsert_gem_cache",
     "upsert_rule",
 ]
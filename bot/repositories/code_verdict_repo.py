@@ -0,0 +1,47 @@
+"""Работа с таблицей CodeHashVerdict."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from bot.models import CodeHashVerdict
+
+
+async def load_code_hash_verdicts(session: AsyncSession) -> Sequence[CodeHashVerdict]:
+    return (await session.exec(select(CodeHashVerdict))).all()
+
+
+async def upsert_code_hash_verdict(
+    session: AsyncSession,
+    *,
+    code_hash: str,
+    sell_allowed: bool,
+    sample_token: str,
+    confirmations: int = 1,
+) -> CodeHashVerdict:
+    stmt = select(CodeHashVerdict).where(CodeHashVerdict.code_hash == code_hash)
+    verdict = (await session.exec(stmt)).one_or_none()
+    if verdict is None:
+        verdict = CodeHashVerdict(code_hash=code_hash, sample_token=sample_token)
+    verdict.sell_allowed = sell_allowed
+    verdict.sample_token = sample_token
+    verdict.confirmations = confirmations
+    verdict.touch()
+    session.add(verdict)
+    await session.commit()
+    await session.refresh(verdict)
+    return verdict
+
+
+async def delete_code_hash_verdict(session: AsyncSession, code_hash: str) -> None:
+    stmt = select(CodeHashVerdict).where(CodeHashVerdict.code_hash == code_hash)
+    verdict = (await session.exec(stmt)).one_or_none()
+    if verdict is not None:
+        await session.delete(verdict)
+        await session.commit()
+
+
+__all__ = ["delete_code_hash_verdict", "load_code_hash_verdicts", "upsert_code_hash_verdict"]
@@ -0,0 +1,18 @@
+"""Работа с таблицей SmartMoneyWallet."""
+
+from __future__ import annotations
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from bot.models import SmartMoneyWallet
+
+
+async def load_smart_money_wallets(session: AsyncSession) -> list[tuple[str, float]]:
+    """Все смарт-кошельки как пары (адрес, вес)."""
+
+    stmt = select(SmartMoneyWallet.address, SmartMoneyWallet.weight)
+    return [(address, weight) for address, weight in (await session.exec(stmt)).all()]
+
+
+__all__ = ["load_smart_money_wallets"]
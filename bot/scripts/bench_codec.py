@@ -0,0 +1,76 @@
+"""Бенчмарк декодирования WS событий: stdlib json против общего кодека.
+
+Запуск: ``python -m bot.scripts.bench_codec [--events 50000]``.
+Печатает стоимость декодирования одного кадра jetton-minter-created для
+каждого доступного бэкенда и для активного ``bot.utils.codec``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from typing import Any, Callable
+
+from bot.utils import codec
+
+SAMPLE_FRAME: dict[str, Any] = {
+    "type": "jetton-minter-created",
+    "timestamp": 1_760_000_000,
+    "payload": {
+        "address": "EQBynBO23ywHy_CgarY9NK9FTz0yDsG82PtcbSTQgGoXwiuA",
+        "owner": "EQDtFpEwcFAEcRe5mLVh2N6C0x-_hJEM7W61_JLnSF74p4q2",
+        "total_supply": "1000000000000000000",
+        "symbol": "HYPE",
+        "holders": [f"EQholder{i:040d}" for i in range(20)],
+        "buyers": [f"EQbuyer{i:041d}" for i in range(10)],
+        "liquidity_usd": 12_345.67,
+        "volume_5m_usd": 45_678.9,
+        "simulate_boc": "te6cckEBAQEAAgAAAEysuc0=" * 8,
+    },
+}
+
+
+def _backends() -> dict[str, Callable[[bytes], Any]]:
+    backends: dict[str, Callable[[bytes], Any]] = {"json": json.loads}
+    try:
+        import orjson
+
+        backends["orjson"] = orjson.loads
+    except ImportError:
+        pass
+    try:
+        import msgspec
+
+        backends["msgspec"] = msgspec.json.Decoder().decode
+    except ImportError:
+        pass
+    backends[f"codec ({codec.BACKEND})"] = codec.loads
+    return backends
+
+
+def _measure(loads: Callable[[bytes], Any], frame: bytes, events: int) -> float:
+    started = time.perf_counter()
+    for _ in range(events):
+        loads(frame)
+    return (time.perf_counter() - started) / events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50_000, help="число кадров на бэкенд")
+    args = parser.parse_args()
+
+    frame = json.dumps(SAMPLE_FRAME).encode("utf-8")
+    baseline = _measure(json.loads, frame, args.events)
+    print(f"Кадр: {len(frame)} байт, событий: {args.events}")
+    for name, loads in _backends().items():
+        per_event = _measure(loads, frame, args.events)
+        print(
+            f"{name:<18} {per_event * 1e6:8.2f} мкс/событие  "
+            f"(x{baseline / per_event:.2f} к stdlib json)"
+        )
+
+
+if __name__ == "__main__":
+    main()
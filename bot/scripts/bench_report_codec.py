@@ -0,0 +1,92 @@
+"""Бенчмарк сериализации кеша: pickle против компактного кодека отчётов.
+
+Запуск: ``python -m bot.scripts.bench_report_codec [--entries 20000]``.
+Для CachedReport (то, что SafetyChecker кладёт в кеш) и GemSignal печатает
+размер записи и время кодирования/декодирования одной записи.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from typing import Any, Callable
+
+
+def _samples(entries: int) -> dict[str, list[Any]]:
+    from bot.services.ton.gem_scanner import GemSignal
+    from bot.services.ton.safety_checker import CachedReport, SafetyReport
+
+    reports = [
+        SafetyReport(
+            is_safe=idx % 3 != 0,
+            score=42.5 + idx % 50,
+            reasons=("низкая ликвидность", "LP burned") if idx % 2 else ("smart money",),
+            liquidity_usd=12_345.67 + idx,
+            volume_5m_usd=45_678.9,
+            smart_money_hits=idx % 4,
+            lp_burned=bool(idx % 2),
+            is_new=True,
+            owner=f"0:{idx:064x}",
+            failed_checks=("volume",) if idx % 10 == 0 else (),
+            smart_money_weight=1.5 * (idx % 4),
+        )
+        for idx in range(entries)
+    ]
+    now = time.time()
+    return {
+        "CachedReport": [
+            CachedReport(report=report, fresh_until=now + 30, refresh_at=now + 15)
+            for report in reports
+        ],
+        "GemSignal": [
+            GemSignal(
+                address=f"0:{idx + 10**6:064x}",
+                symbol="HYPE",
+                score=report.score,
+                tags=("new", "smart"),
+                report=report,
+            )
+            for idx, report in enumerate(reports)
+        ],
+    }
+
+
+def _measure(func: Callable[[Any], Any], values: list[Any]) -> float:
+    started = time.perf_counter()
+    for value in values:
+        func(value)
+    return (time.perf_counter() - started) / len(values)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000, help="число записей каждого типа")
+    args = parser.parse_args()
+    # Настройки читаются при импорте сервисов; Redis для бенчмарка не нужен.
+    os.environ.setdefault("CACHE__BACKEND", "memory")
+
+    from bot.services.ton.report_codec import CompactSerializer
+    from aiocache.serializers import PickleSerializer
+
+    serializers = {"pickle": PickleSerializer(), "compact": CompactSerializer()}
+    for kind, values in _samples(args.entries).items():
+        print(f"{kind}: {len(values)} записей")
+        baseline: dict[str, float] = {}
+        for name, serializer in serializers.items():
+            encoded = [serializer.dumps(value) for value in values]
+            size = sum(len(blob) for blob in encoded) / len(encoded)
+            dumps = _measure(serializer.dumps, values)
+            loads = _measure(serializer.loads, encoded)
+            baseline.setdefault("size", size)
+            baseline.setdefault("dumps", dumps)
+            baseline.setdefault("loads", loads)
+            print(
+                f"  {name:<8} {size:7.0f} байт ({size / baseline['size']:.2f}x)  "
+                f"dumps {dumps * 1e6:6.2f} мкс ({dumps / baseline['dumps']:.2f}x)  "
+                f"loads {loads * 1e6:6.2f} мкс ({loads / baseline['loads']:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
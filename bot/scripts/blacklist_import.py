@@ -0,0 +1,43 @@
+"""Потоковый импорт community rug-листов в чёрный список.
+
+Файл — одна запись на строку (адрес в любой форме или code hash в hex/base64,
+дополнительные колонки через запятую игнорируются). Запущенный бот
+подхватит изменения сам (``TON_SECURITY__BLACKLIST_RELOAD_SEC``).
+
+Запуск: ``python -m bot.scripts.blacklist_import rugs.txt --kind owner --source rugdb``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+
+from bot.services.ton.blacklist import BlacklistStore
+from config.settings import get_settings
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("paths", nargs="+", type=Path, help="файлы для импорта")
+    parser.add_argument("--kind", choices=("owner", "code_hash"), default="owner")
+    parser.add_argument("--source", help="метка источника (по умолчанию — имя файла)")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    store = BlacklistStore(get_settings().ton_security.blacklist_db_path)
+    try:
+        for path in args.paths:
+            started = time.perf_counter()
+            with path.open(encoding="utf-8") as fh:
+                imported = store.import_keys(args.kind, fh, args.source or path.name)
+            print(f"{path}: добавлено {imported} записей за {time.perf_counter() - started:.2f} с")
+        print(f"Всего в чёрном списке: {store.count()}")
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Офлайн бенчмарк пропускной способности GemScanner/SafetyChecker.
+
+Проигрывает запись трафика (TON__TRANSPORT_MODE=record) через TonDirectClient
+в режиме replay и измеряет, сколько событий в секунду проходит полный путь
+WS кадр → очередь → GemScanner → SafetyChecker. Сеть не нужна.
+
+Запуск: ``python -m bot.scripts.replay_bench --path database/ton_traffic.jsonl.gz --speed 0``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import time
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--path", help="файл записи трафика (gzip JSONL)")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="1 — реальное время, 10 — x10, 0 — максимальная скорость",
+    )
+    return parser.parse_args()
+
+
+async def _run() -> None:
+    from bot.services.ton.gem_scanner import GemScanner
+    from bot.services.ton.safety_checker import SafetyChecker
+    from bot.services.ton.ton_direct import get_ton_client
+
+    checker = SafetyChecker()
+    scanner = GemScanner(safety_checker=checker)
+    started = time.perf_counter()
+    await scanner.start()
+    client = await get_ton_client()
+    await client.wait_replay()
+    elapsed = time.perf_counter() - started
+    await scanner.stop()
+    await client.close()
+
+    replay = client.replay_stats()
+    ingest = client.ingest_stats()
+    frames = replay["frames_played"]
+    print(f"Кадров проиграно: {frames} за {elapsed:.2f} с ({frames / elapsed:.1f} событий/с)")
+    print(f"Обработано событий: {ingest['processed']}, максимальный lag {ingest['max_lag_ms']} мс")
+    print(f"RPC из записи: {replay['rpc_served']}, без записи: {replay['rpc_missing']}")
+    print(f"Дедупликация: {scanner.dedup_stats()}")
+
+
+def main() -> None:
+    args = _parse_args()
+    # Настройки читаются при первом импорте сервисов, поэтому окружение — до импорта.
+    os.environ["TON__TRANSPORT_MODE"] = "replay"
+    os.environ["TON__REPLAY_SPEED"] = str(args.speed)
+    os.environ.setdefault("TON__WS_OVERFLOW_POLICY", "block")
+    os.environ.setdefault("CACHE__BACKEND", "memory")
+    if args.path:
+        os.environ["TON__TRANSPORT_PATH"] = args.path
+    asyncio.run(_run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Чёрный список владельцев и code hash контрактов.
+
+Точное множество лежит в SQLite (``blacklist_db_path``) и может содержать
+сотни тысяч адресов из community rug-листов. В памяти держится только
+Bloom-фильтр: для подавляющего большинства токенов ответ «нет в списке»
+получается без обращения к диску, а положительные срабатывания
+перепроверяются точным запросом в отдельном потоке. Ключи — канонические
+адреса и hex code hash. Импорт идёт потоково пачками, а перезагрузка
+(например, после ``python -m bot.scripts.blacklist_import``) собирает новый
+фильтр вне event loop и подменяет его одной ссылкой. Адреса из
+``TON_SECURITY__BLACKLIST_ADDRESSES`` в хранилище не пишутся и проверяются
+отдельным множеством: удалённый из настроек адрес перестаёт блокироваться
+после рестарта.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import binascii
+import sqlite3
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Literal
+
+from loguru import logger
+
+from bot.utils.bloom import BloomFilter
+from bot.utils.ton_address import canonical_address
+from config.settings import get_settings
+
+BlacklistKind = Literal["owner", "code_hash"]
+
+_IMPORT_CHUNK = 10_000
+
+
+def normalize_code_hash(value: str) -> str:
+    """code hash в hex нижнем регистре (принимает hex и base64/base64url)."""
+
+    value = value.strip()
+    if len(value) == 64:
+        try:
+            return bytes.fromhex(value).hex()
+        except ValueError:
+            pass
+    try:
+        raw = base64.urlsafe_b64decode(value.replace("+", "-").replace("/", "_"))
+    except (binascii.Error, ValueError):
+        return value.lower()
+    return raw.hex() if len(raw) == 32 else value.lower()
+
+
+def blacklist_key(kind: BlacklistKind, value: str) -> str:
+    return canonical_address(value) if kind == "owner" else normalize_code_hash(value)
+
+
+@dataclass(slots=True, frozen=True)
+class BlacklistHit:
+    """Результат проверки токена по чёрному списку."""
+
+    owner: bool = False
+    code_hash: bool = False
+
+    def __bool__(self) -> bool:
+        return self.owner or self.code_hash
+
+
+class BlacklistStore:
+    """Точное хранилище чёрного списка (SQLite, синхронный API для потоков)."""
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS blacklist ("
+                "kind TEXT NOT NULL, key TEXT NOT NULL, source TEXT NOT NULL, "
+                "PRIMARY KEY (kind, key)) WITHOUT ROWID"
+            )
+
+    def import_keys(
+        self,
+        kind: BlacklistKind,
+        values: Iterable[str],
+        source: str,
+        bloom: BloomFilter | None = None,
+    ) -> int:
+        """Потоковый импорт пачками; пустые строки и комментарии (#) пропускаются."""
+
+        imported = 0
+        chunk: list[tuple[str, str, str]] = []
+        for value in values:
+            value = value.strip()
+            if not value or value.startswith("#"):
+                continue
+            chunk.append((kind, blacklist_key(kind, value.split(",")[0]), source))
+            if len(chunk) >= _IMPORT_CHUNK:
+                imported += self._insert(chunk, bloom)
+                chunk = []
+        if chunk:
+            imported += self._insert(chunk, bloom)
+        return imported
+
+    def contains(self, kind: BlacklistKind, key: str) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM blacklist WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+        return row is not None
+
+    def remove_source(self, source: str) -> int:
+        """Удаляет все ключи, импортированные из ``source``."""
+
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "DELETE FROM blacklist WHERE source = ?", (source,)
+            ).rowcount
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM blacklist").fetchone()[0]
+
+    def build_bloom(self, capacity: int, error_rate: float) -> BloomFilter:
+        # Отдельное соединение: точные проверки не ждут, пока идёт пересборка.
+        conn = sqlite3.connect(self.path)
+        try:
+            total = conn.execute("SELECT COUNT(*) FROM blacklist").fetchone()[0]
+            bloom = BloomFilter(max(capacity, int(total * 1.2)), error_rate)
+            for kind, key in conn.execute("SELECT kind, key FROM blacklist"):
+                bloom.add(f"{kind}:{key}")
+        finally:
+            conn.close()
+        return bloom
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _insert(self, chunk: list[tuple[str, str, str]], bloom: BloomFilter | None) -> int:
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO blacklist (kind, key, source) VALUES (?, ?, ?)", chunk
+            )
+            inserted = self._conn.total_changes - before
+        if bloom is not None:
+            for kind, key, _ in chunk:
+                bloom.add(f"{kind}:{key}")
+        return inserted
+
+
+class BlacklistService:
+    """Bloom-префильтр в памяти поверх точного SQLite хранилища."""
+
+    def __init__(self) -> None:
+        security = get_settings().ton_security
+        self._path = security.blacklist_db_path
+        self._capacity = security.blacklist_bloom_capacity
+        self._error_rate = security.blacklist_bloom_error_rate
+        self._reload_interval = security.blacklist_reload_sec
+        self._static = frozenset(
+            canonical_address(address) for address in security.blacklist_addresses
+        )
+        self._store: BlacklistStore | None = None
+        self._bloom: BloomFilter | None = None
+        self._db_mtime: float | None = None
+        self._reload_task: asyncio.Task[None] | None = None
+        self._reload_lock = asyncio.Lock()
+        self.lookups = 0
+        self.bloom_negatives = 0
+        self.false_positives = 0
+
+    async def start(self) -> None:
+        """Открывает хранилище и строит фильтр."""
+
+        if self._store is None:
+            self._store = await asyncio.to_thread(BlacklistStore, self._path)
+            # Прежние версии сохраняли адреса из настроек в БД — иначе их не удалить.
+            removed = await asyncio.to_thread(self._store.remove_source, "settings")
+            if removed:
+                logger.info(
+                    "Чёрный список: удалено {count} сохранённых адресов из настроек",
+                    count=removed,
+                )
+        await self.reload()
+        if self._reload_interval > 0 and (self._reload_task is None or self._reload_task.done()):
+            self._reload_task = asyncio.create_task(self._reload_loop(), name="blacklist-reload")
+
+    async def stop(self) -> None:
+        if self._reload_task:
+            self._reload_task.cancel()
+        if self._store is not None:
+            await asyncio.to_thread(self._store.close)
+            self._store = None
+            self._bloom = None
+
+    async def reload(self) -> None:
+        """Пересобирает Bloom-фильтр из хранилища и атомарно подменяет текущий."""
+
+        store = self._require_store()
+        async with self._reload_lock:
+            mtime = self._current_mtime()
+            bloom = await asyncio.to_thread(store.build_bloom, self._capacity, self._error_rate)
+            self._bloom = bloom
+            self._db_mtime = mtime
+        logger.info("Чёрный список загружен: {count} записей", count=bloom.count)
+
+    async def import_keys(self, kind: BlacklistKind, values: Iterable[str], source: str) -> int:
+        """Потоковый импорт (в отдельном потоке); новые ключи сразу видны фильтру."""
+
+        store = self._require_store()
+        imported = await asyncio.to_thread(store.import_keys, kind, values, source, self._bloom)
+        self._db_mtime = self._current_mtime()
+        logger.info(
+            "Чёрный список: импортировано {count} ({kind}) из {source}",
+            count=imported,
+            kind=kind,
+            source=source,
+        )
+        return imported
+
+    async def contains(self, kind: BlacklistKind, value: str) -> bool:
+        key = blacklist_key(kind, value)
+        if kind == "owner" and key in self._static:
+            return True
+        if self._store is None:
+            # До start() — только адреса из настроек.
+            return False
+        self.lookups += 1
+        if self._bloom is not None and f"{kind}:{key}" not in self._bloom:
+            self.bloom_negatives += 1
+            return False
+        found = await asyncio.to_thread(self._store.contains, kind, key)
+        if not found:
+            self.false_positives += 1
+        return found
+
+    async def check(self, owner: str | None, code_hash: str | None) -> BlacklistHit:
+        """Проверяет владельца и code hash токена."""
+
+        return BlacklistHit(
+            owner=bool(owner) and await self.contains("owner", owner),
+            code_hash=bool(code_hash) and await self.contains("code_hash", code_hash),
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "bloom": self._bloom.stats() if self._bloom is not None else None,
+            "settings": len(self._static),
+            "lookups": self.lookups,
+            "bloom_negatives": self.bloom_negatives,
+            "false_positives": self.false_positives,
+        }
+
+    async def _reload_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._reload_interval)
+            if self._current_mtime() == self._db_mtime:
+                continue
+            try:
+                await self.reload()
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Чёрный список: перезагрузка не удалась: {error}", error=exc)
+
+    def _current_mtime(self) -> float | None:
+        return self._path.stat().st_mtime if self._path.exists() else None
+
+    def _require_store(self) -> BlacklistStore:
+        if self._store is None:
+            raise RuntimeError("BlacklistService не запущен, вызовите start()")
+        return self._store
+
+
+_service: BlacklistService | None = None
+
+
+def get_blacklist() -> BlacklistService:
+    """Общий чёрный список для SafetyChecker и админских команд."""
+
+    global _service
+    if _service is None:
+        _service = BlacklistService()
+    return _service
+
+
+__all__ = [
+    "BlacklistHit",
+    "BlacklistKind",
+    "BlacklistService",
+    "BlacklistStore",
+    "blacklist_key",
+    "get_blacklist",
+    "normalize_code_hash",
+]
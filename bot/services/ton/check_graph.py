@@ -0,0 +1,185 @@
+"""Граф зависимостей проверок SafetyChecker.
+
+Каждая проверка объявляет, результаты каких проверок ей нужны, и стартует
+сразу, как только они готовы: проверки без зависимостей не ждут RPC
+getJettonData. Если зависимость упала, вместо её результата передаётся
+``fallback``. Результат проверки можно передать заранее (значение или
+future, например из batch RPC); если future упала, проверка выполняется
+сама. Плагины добавляют свои проверки через
+``SafetyChecker.register_check``; по каждой проверке копятся тайминги
+(ожидание зависимостей и собственное выполнение), а время выполнения
+пишется в гистограмму стадии с именем проверки.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from bot.utils.latency import LatencyMetrics
+from .ton_direct import RpcPriority, TonDirectClient
+
+
+@dataclass(slots=True, frozen=True)
+class CheckContext:
+    """Входные данные одного прогона проверок."""
+
+    ton_client: TonDirectClient
+    address: str
+    raw_event: dict[str, Any]
+    priority: RpcPriority
+    state_token: str | None
+
+
+CheckFunc = Callable[[CheckContext, dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass(slots=True, frozen=True)
+class SafetyCheck:
+    """Узел графа: ``run(ctx, deps)``, где deps — результаты ``requires``."""
+
+    name: str
+    run: CheckFunc
+    requires: tuple[str, ...] = ()
+    fallback: Any = None
+
+
+@dataclass(slots=True, frozen=True)
+class ScoreAdjustment:
+    """Результат проверки плагина, который меняет итоговый score."""
+
+    delta: float
+    reason: str | None = None
+
+
+@dataclass(slots=True)
+class _CheckStats:
+    runs: int = 0
+    failures: int = 0
+    cancelled: int = 0
+    wait_total: float = 0.0
+    run_total: float = 0.0
+    run_max: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        finished = max(self.runs, 1)
+        return {
+            "runs": self.runs,
+            "failures": self.failures,
+            "cancelled": self.cancelled,
+            "avg_wait_ms": round(self.wait_total / finished * 1000, 2),
+            "avg_run_ms": round(self.run_total / finished * 1000, 2),
+            "max_run_ms": round(self.run_max * 1000, 2),
+        }
+
+
+class CheckGraph:
+    """Реестр проверок и планировщик их запуска по зависимостям."""
+
+    def __init__(self, metrics: LatencyMetrics | None = None) -> None:
+        # Зависимости регистрируются раньше зависящих, поэтому порядок
+        # добавления уже топологический и циклы невозможны.
+        self._checks: dict[str, SafetyCheck] = {}
+        self._stats: dict[str, _CheckStats] = {}
+        self._metrics = metrics
+
+    def add(self, check: SafetyCheck) -> None:
+        if check.name in self._checks:
+            raise ValueError(f"Проверка {check.name!r} уже зарегистрирована")
+        missing = [name for name in check.requires if name not in self._checks]
+        if missing:
+            raise ValueError(
+                f"Проверка {check.name!r} зависит от незарегистрированных: {', '.join(missing)}"
+            )
+        self._checks[check.name] = check
+        self._stats[check.name] = _CheckStats()
+
+    def fallback(self, name: str) -> Any:
+        return self._checks[name].fallback
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return tuple(self._checks)
+
+    def start(
+        self,
+        ctx: CheckContext,
+        preset: dict[str, Any] | None = None,
+    ) -> dict[str, asyncio.Future[Any]]:
+        """Запускает все проверки; ``preset`` — уже известные результаты (например, из batch).
+
+        Значение-future в ``preset`` ожидается вместо запуска проверки, а при
+        ошибке проверка выполняется обычным образом.
+        """
+
+        preset = preset or {}
+        loop = asyncio.get_running_loop()
+        futures: dict[str, asyncio.Future[Any]] = {}
+        for name, check in self._checks.items():
+            seed = preset.get(name)
+            if name in preset and not asyncio.isfuture(seed):
+                future = loop.create_future()
+                future.set_result(seed)
+                futures[name] = future
+                continue
+            deps = {dep: futures[dep] for dep in check.requires}
+            futures[name] = asyncio.ensure_future(
+                self._run(check, ctx, deps, seed if asyncio.isfuture(seed) else None)
+            )
+        return futures
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    async def _run(
+        self,
+        check: SafetyCheck,
+        ctx: CheckContext,
+        deps: dict[str, asyncio.Future[Any]],
+        seed: asyncio.Future[Any] | None = None,
+    ) -> Any:
+        stats = self._stats[check.name]
+        queued = time.perf_counter()
+        inputs: dict[str, Any] = {}
+        started = queued
+        cancelled = False
+        try:
+            for name, future in deps.items():
+                try:
+                    inputs[name] = await asyncio.shield(future)
+                except asyncio.CancelledError:
+                    if not future.cancelled():
+                        raise
+                    inputs[name] = self._checks[name].fallback
+                except Exception:  # noqa: BLE001
+                    inputs[name] = self._checks[name].fallback
+            if seed is not None:
+                try:
+                    return await asyncio.shield(seed)
+                except asyncio.CancelledError:
+                    if not seed.cancelled():
+                        raise
+                except Exception:  # noqa: BLE001
+                    pass
+            started = time.perf_counter()
+            return await check.run(ctx, inputs)
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            cancelled = True
+            raise
+        except Exception:
+            stats.failures += 1
+            raise
+        finally:
+            finished = time.perf_counter()
+            stats.runs += 1
+            stats.wait_total += started - queued
+            stats.run_total += finished - started
+            stats.run_max = max(stats.run_max, finished - started)
+            if self._metrics is not None and not cancelled:
+                self._metrics.observe(check.name, finished - started)
+
+
+__all__ = ["CheckContext", "CheckFunc", "CheckGraph", "SafetyCheck", "ScoreAdjustment"]
@@ -0,0 +1,319 @@
+"""Память honeypot-вердиктов по шаблонам JettonMinter (code hash).
+
+Большинство новых jetton деплоится из нескольких шаблонов минтера, поэтому
+результат simulateMessageProcess для одного токена обычно верен для всех
+токенов с тем же code hash. Вердикт сохраняется в таблицу
+``code_hash_verdicts`` и держится в памяти: известные шаблоны не симулируются,
+а первый токен нового шаблона анализируется один раз (параллельные токены того
+же шаблона ждут этот анализ).
+
+Симуляция одного токена может провалиться по причинам, не связанным с
+шаблоном (например, BOC без средств), поэтому:
+
+* запрет продажи запоминается только после провала у
+  ``code_verdict_honeypot_confirmations`` разных токенов шаблона, до этого
+  каждый токен симулируется сам;
+* вердикт живёт ``code_verdict_ttl_sec``, после чего шаблон анализируется заново;
+* доля ``code_verdict_resample_ratio`` попаданий в память всё равно
+  симулируется: несовпадение сбрасывает вердикт шаблона.
+
+Ошибочный вердикт можно удалить вручную командой ``/codeverdict forget``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Any, Awaitable, Callable, Coroutine
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.repositories import (
+    delete_code_hash_verdict,
+    load_code_hash_verdicts,
+    upsert_code_hash_verdict,
+)
+from bot.utils.singleflight import SingleFlight
+from config.settings import get_settings
+from .blacklist import normalize_code_hash
+
+# Сколько шаблонов с неподтверждёнными провалами помнить одновременно.
+_MAX_PENDING_FAILURES = 10_000
+
+
+@dataclass(slots=True, frozen=True)
+class CodeVerdict:
+    """Вердикт симуляции продажи для шаблона контракта."""
+
+    sell_allowed: bool
+
+
+@dataclass(slots=True)
+class _Entry:
+    verdict: CodeVerdict
+    sample_token: str
+    checked_at: float
+    confirmations: int = 1
+
+
+class CodeVerdictMemo:
+    """code hash → CodeVerdict с персистентностью в БД."""
+
+    def __init__(self) -> None:
+        security = get_settings().ton_security
+        self._ttl = security.code_verdict_ttl_sec
+        self._resample_ratio = security.code_verdict_resample_ratio
+        self._honeypot_confirmations = security.code_verdict_honeypot_confirmations
+        self._verdicts: dict[str, _Entry] = {}
+        # code hash → токены, у которых продажа не прошла, пока шаблон не подтверждён.
+        self._failures: OrderedDict[str, set[str]] = OrderedDict()
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._flight: SingleFlight[tuple[CodeVerdict, str]] = SingleFlight("code-verdict")
+        self._persist_tasks: set[asyncio.Task[None]] = set()
+        # Записи в БД по порядку: параллельные upsert одного шаблона конфликтуют по UNIQUE.
+        self._db_lock = asyncio.Lock()
+        self.hits = 0
+        self.analyzed = 0
+        self.resampled = 0
+        self.overturned = 0
+
+    def set_session_maker(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self._session_maker = session_maker
+
+    async def start(self) -> None:
+        """Загружает сохранённые вердикты."""
+
+        if self._session_maker is None:
+            return
+        async with self._session_maker() as session:
+            rows = await load_code_hash_verdicts(session)
+        for row in rows:
+            updated_at = row.updated_at
+            if updated_at.tzinfo is None:
+                updated_at = updated_at.replace(tzinfo=timezone.utc)
+            self._verdicts[row.code_hash] = _Entry(
+                verdict=CodeVerdict(sell_allowed=row.sell_allowed),
+                sample_token=row.sample_token,
+                checked_at=updated_at.timestamp(),
+                confirmations=row.confirmations,
+            )
+        logger.info("Вердикты code hash загружены: {count} шаблонов", count=len(self._verdicts))
+
+    def get(self, code_hash: str) -> CodeVerdict | None:
+        """Действующий (не истёкший) вердикт шаблона без симуляции."""
+
+        entry = self._live(normalize_code_hash(code_hash))
+        if entry is None:
+            return None
+        self.hits += 1
+        return entry.verdict
+
+    async def resolve(
+        self,
+        code_hash: str,
+        token: str,
+        analyze: Callable[[], Awaitable[CodeVerdict]],
+    ) -> CodeVerdict:
+        """Вердикт для ``token``: из памяти, выборочной перепроверкой или ``analyze()``."""
+
+        key = normalize_code_hash(code_hash)
+        entry = self._live(key)
+        if entry is not None:
+            if random.random() >= self._resample_ratio:
+                self.hits += 1
+                return entry.verdict
+            return await self._revalidate(key, token, analyze, entry)
+        verdict, analyzed_token = await self._flight.do(
+            key, lambda: self._analyze(key, token, analyze)
+        )
+        if not verdict.sell_allowed and analyzed_token != token and self._live(key) is None:
+            # Провал чужого токена ещё не вердикт шаблона — симулируем свой.
+            verdict, _ = await self._analyze(key, token, analyze)
+        return verdict
+
+    def info(self, code_hash: str) -> dict[str, Any] | None:
+        """Состояние шаблона для админской команды."""
+
+        key = normalize_code_hash(code_hash)
+        entry = self._verdicts.get(key)
+        failures = len(self._failures.get(key, ()))
+        if entry is None:
+            return {"code_hash": key, "verdict": None, "failures": failures} if failures else None
+        return {
+            "code_hash": key,
+            "verdict": entry.verdict,
+            "sample_token": entry.sample_token,
+            "age_sec": round(time.time() - entry.checked_at),
+            "expired": self._live(key) is None,
+            "confirmations": entry.confirmations,
+            "failures": failures,
+        }
+
+    async def forget(self, code_hash: str) -> bool:
+        """Удаляет вердикт шаблона (память и БД); False — шаблон не был известен."""
+
+        key = normalize_code_hash(code_hash)
+        known = self._verdicts.pop(key, None) is not None
+        known = self._failures.pop(key, None) is not None or known
+        if self._session_maker is not None:
+            await self._delete(key)
+        if known:
+            logger.info("Вердикт шаблона {code_hash} удалён вручную", code_hash=key[:16])
+        return known
+
+    def stats(self) -> dict[str, Any]:
+        now = time.time()
+        return {
+            "templates": len(self._verdicts),
+            "honeypot_templates": sum(
+                1 for entry in self._verdicts.values() if not entry.verdict.sell_allowed
+            ),
+            "expired": sum(1 for entry in self._verdicts.values() if self._expired(entry, now)),
+            "unconfirmed_failures": len(self._failures),
+            "hits": self.hits,
+            "analyzed": self.analyzed,
+            "resampled": self.resampled,
+            "overturned": self.overturned,
+            "shared": self._flight.shared,
+        }
+
+    def _live(self, key: str) -> _Entry | None:
+        entry = self._verdicts.get(key)
+        if entry is None or self._expired(entry, time.time()):
+            return None
+        return entry
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self._ttl > 0 and now - entry.checked_at >= self._ttl
+
+    async def _analyze(
+        self,
+        key: str,
+        token: str,
+        analyze: Callable[[], Awaitable[CodeVerdict]],
+    ) -> tuple[CodeVerdict, str]:
+        verdict = await analyze()
+        self.analyzed += 1
+        self._record(key, token, verdict)
+        return verdict, token
+
+    async def _revalidate(
+        self,
+        key: str,
+        token: str,
+        analyze: Callable[[], Awaitable[CodeVerdict]],
+        entry: _Entry,
+    ) -> CodeVerdict:
+        """Выборочная симуляция токена известного шаблона."""
+
+        verdict = await analyze()
+        self.resampled += 1
+        if self._verdicts.get(key) is not entry:
+            # Пока симулировали, вердикт заменили или удалили.
+            return verdict
+        if verdict == entry.verdict:
+            entry.confirmations += 1
+            entry.checked_at = time.time()
+            self._spawn(self._persist(key, entry))
+            return verdict
+        self.overturned += 1
+        logger.warning(
+            "Вердикт шаблона {code_hash} не подтвердился на {token}: сброшен",
+            code_hash=key[:16],
+            token=token,
+        )
+        del self._verdicts[key]
+        if not self._record(key, token, verdict) and self._session_maker is not None:
+            self._spawn(self._delete(key))
+        return verdict
+
+    def _record(self, key: str, token: str, verdict: CodeVerdict) -> bool:
+        """Учитывает результат симуляции; True — вердикт шаблона сохранён."""
+
+        failures = 1
+        if not verdict.sell_allowed:
+            tokens = self._failures.setdefault(key, set())
+            tokens.add(token)
+            self._failures.move_to_end(key)
+            while len(self._failures) > _MAX_PENDING_FAILURES:
+                self._failures.popitem(last=False)
+            failures = len(tokens)
+            if failures < self._honeypot_confirmations:
+                logger.info(
+                    "Шаблон {code_hash}: продажа заблокирована у {token}, "
+                    "ждём подтверждения ({count}/{need})",
+                    code_hash=key[:16],
+                    token=token,
+                    count=failures,
+                    need=self._honeypot_confirmations,
+                )
+                return False
+        self._failures.pop(key, None)
+        entry = _Entry(
+            verdict=verdict,
+            sample_token=token,
+            checked_at=time.time(),
+            confirmations=failures,
+        )
+        self._verdicts[key] = entry
+        logger.info(
+            "Шаблон минтера {code_hash}: продажа {sell} (токен {token})",
+            code_hash=key[:16],
+            sell="разрешена" if verdict.sell_allowed else "ЗАБЛОКИРОВАНА",
+            token=token,
+        )
+        if self._session_maker is not None:
+            self._spawn(self._persist(key, entry))
+        return True
+
+    def _spawn(self, coro: Coroutine[Any, Any, None]) -> None:
+        task = asyncio.create_task(coro)
+        self._persist_tasks.add(task)
+        task.add_done_callback(self._persist_tasks.discard)
+
+    async def _persist(self, key: str, entry: _Entry) -> None:
+        if self._session_maker is None:
+            return
+        try:
+            async with self._db_lock, self._session_maker() as session:
+                await upsert_code_hash_verdict(
+                    session,
+                    code_hash=key,
+                    sell_allowed=entry.verdict.sell_allowed,
+                    sample_token=entry.sample_token,
+                    confirmations=entry.confirmations,
+                )
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Вердикт code hash {code_hash} не сохранён: {error}", code_hash=key, error=exc
+            )
+
+    async def _delete(self, key: str) -> None:
+        assert self._session_maker is not None
+        try:
+            async with self._db_lock, self._session_maker() as session:
+                await delete_code_hash_verdict(session, key)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "Вердикт code hash {code_hash} не удалён из БД: {error}", code_hash=key, error=exc
+            )
+
+
+_memo: CodeVerdictMemo | None = None
+
+
+def get_code_verdicts() -> CodeVerdictMemo:
+    """Общая память вердиктов шаблонов."""
+
+    global _memo
+    if _memo is None:
+        _memo = CodeVerdictMemo()
+    return _memo
+
+
+__all__ = ["CodeVerdict", "CodeVerdictMemo", "get_code_verdicts"]
@@ -0,0 +1,239 @@
+"""Ограниченная очередь приёма событий между WebSocket и обработчиками.
+
+Читатель WebSocket только кладёт события в очередь и сразу читает следующий
+кадр, а пул воркеров прогоняет их через колбэки (GemScanner/SafetyChecker).
+При переполнении действует политика: вытеснить самое старое, заблокировать
+читателя или сбросить излишек на диск и дочитать позже. Spill-файл пишется и
+читается пачками в потоке (``asyncio.to_thread``), чтобы перегруженный цикл
+событий не блокировался на диске.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import asdict
+from enum import Enum
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Awaitable, Callable
+
+from loguru import logger
+
+from bot.utils import codec
+
+if TYPE_CHECKING:
+    from .ton_direct import JettonMinterEvent
+
+
+class OverflowPolicy(str, Enum):
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+    SPILL = "spill"
+
+
+class EventIngestQueue:
+    """Очередь событий JettonMinter с пулом воркеров и метриками."""
+
+    def __init__(
+        self,
+        handler: Callable[["JettonMinterEvent"], Awaitable[None]],
+        *,
+        maxsize: int,
+        workers: int,
+        policy: OverflowPolicy,
+        spill_path: Path | None = None,
+    ) -> None:
+        if policy is OverflowPolicy.SPILL and spill_path is None:
+            raise ValueError("Политика spill требует spill_path")
+        self._handler = handler
+        self._queue: asyncio.Queue[tuple[float, JettonMinterEvent]] = asyncio.Queue(
+            maxsize=max(maxsize, 1)
+        )
+        self._workers_count = max(workers, 1)
+        self._policy = policy
+        self._spill_path = spill_path
+        self._spill_offset = 0
+        self._spilled_pending = 0
+        # Сброшенные события, ещё не записанные на диск (новее всего, что в файле).
+        self._spill_buffer: list[bytes] = []
+        self._spill_lock = asyncio.Lock()
+        self._spill_task: asyncio.Task[None] | None = None
+        self._workers: list[asyncio.Task[None]] = []
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._lag_ewma = 0.0
+
+    async def start(self) -> None:
+        if self._workers and not all(task.done() for task in self._workers):
+            return
+        if self._spill_path is not None:
+            self._spilled_pending = await asyncio.to_thread(self._count_spilled)
+        self._workers = [
+            asyncio.create_task(self._worker(), name=f"ton-ws-worker-{idx}")
+            for idx in range(self._workers_count)
+        ]
+
+    async def stop(self) -> None:
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        # Недописанный хвост сохраняем: после рестарта он дочитается с диска.
+        if self._spill_buffer:
+            await self._flush_spill()
+
+    async def put(self, event: "JettonMinterEvent") -> None:
+        """Ставит событие в очередь согласно политике переполнения."""
+
+        self.enqueued += 1
+        item = (time.monotonic(), event)
+        if self._policy is OverflowPolicy.BLOCK:
+            await self._queue.put(item)
+            return
+        if not self._queue.full() and not self._spilled_pending:
+            self._queue.put_nowait(item)
+            return
+        if self._policy is OverflowPolicy.SPILL:
+            self._spill(event)
+            return
+        if self._queue.full():
+            self._queue.get_nowait()
+            self._queue.task_done()
+            self.dropped += 1
+            logger.debug(
+                "Очередь WS событий переполнена ({size}) — вытеснено самое старое",
+                size=self._queue.maxsize,
+            )
+        self._queue.put_nowait(item)
+
+    async def join(self) -> None:
+        """Ждёт обработки всех событий в очереди (включая сброшенные на диск)."""
+
+        while True:
+            await self._queue.join()
+            if not self._spilled_pending:
+                return
+            await asyncio.sleep(0.01)
+
+    def stats(self) -> dict[str, Any]:
+        """Глубина очереди, задержка обработки (lag) и счётчики потерь."""
+
+        return {
+            "policy": self._policy.value,
+            "depth": self._queue.qsize(),
+            "capacity": self._queue.maxsize,
+            "spilled_pending": self._spilled_pending,
+            "workers": self._workers_count,
+            "enqueued": self.enqueued,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "lag_ms": round(self.last_lag * 1000, 1),
+            "lag_ewma_ms": round(self._lag_ewma * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+        }
+
+    async def _worker(self) -> None:
+        while True:
+            if self._queue.empty() and self._spilled_pending:
+                await self._refill_from_spill()
+            enqueued_at, event = await self._queue.get()
+            try:
+                lag = time.monotonic() - enqueued_at
+                self.last_lag = lag
+                self.max_lag = max(self.max_lag, lag)
+                self._lag_ewma += 0.1 * (lag - self._lag_ewma)
+                await self._handler(event)
+                self.processed += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # noqa: BLE001
+                logger.exception("Обработка WS события упала: {error}", error=exc)
+            finally:
+                self._queue.task_done()
+
+    def _spill(self, event: "JettonMinterEvent") -> None:
+        self._spill_buffer.append(codec.dumps(asdict(event)) + b"\n")
+        self.spilled += 1
+        self._spilled_pending += 1
+        if self._spill_task is None or self._spill_task.done():
+            self._spill_task = asyncio.create_task(self._flush_spill(), name="ton-ws-spill")
+
+    async def _flush_spill(self) -> None:
+        """Дописывает накопленные события в spill-файл пачкой."""
+
+        async with self._spill_lock:
+            while self._spill_buffer:
+                batch, self._spill_buffer = self._spill_buffer, []
+                await asyncio.to_thread(self._write_spill, batch)
+
+    async def _refill_from_spill(self) -> None:
+        """Дочитывает сброшенные события, пока в очереди есть место."""
+
+        from .ton_direct import JettonMinterEvent
+
+        async with self._spill_lock:
+            free = self._queue.maxsize - self._queue.qsize()
+            if free <= 0:
+                return
+            lines, self._spill_offset = await asyncio.to_thread(
+                self._read_spill, self._spill_offset, free
+            )
+            # Файл дочитан, а место осталось — берём ещё не записанные события из памяти.
+            if len(lines) < free and self._spill_buffer:
+                take = free - len(lines)
+                lines += self._spill_buffer[:take]
+                del self._spill_buffer[:take]
+            now = time.monotonic()
+            for line in lines:
+                self._spilled_pending = max(0, self._spilled_pending - 1)
+                try:
+                    event = JettonMinterEvent(**codec.loads(line))
+                except (TypeError, *codec.DecodeError) as exc:
+                    logger.debug("Битая строка spill-файла: {error}", error=exc)
+                    continue
+                self._queue.put_nowait((now, event))
+            if not lines:
+                # Файл пропал или пуст — считать больше нечего.
+                self._spilled_pending = len(self._spill_buffer)
+            if not self._spilled_pending:
+                await asyncio.to_thread(self._remove_spill)
+                self._spill_offset = 0
+
+    def _count_spilled(self) -> int:
+        assert self._spill_path is not None
+        if not self._spill_path.exists():
+            return 0
+        with self._spill_path.open("rb") as fh:
+            return sum(1 for _ in fh)
+
+    def _write_spill(self, lines: list[bytes]) -> None:
+        assert self._spill_path is not None
+        self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._spill_path.open("ab") as fh:
+            fh.writelines(lines)
+
+    def _read_spill(self, offset: int, limit: int) -> tuple[list[bytes], int]:
+        assert self._spill_path is not None
+        if not self._spill_path.exists():
+            return [], 0
+        lines: list[bytes] = []
+        with self._spill_path.open("rb") as fh:
+            fh.seek(offset)
+            while len(lines) < limit:
+                line = fh.readline()
+                if not line:
+                    break
+                lines.append(line)
+            return lines, fh.tell()
+
+    def _remove_spill(self) -> None:
+        assert self._spill_path is not None
+        self._spill_path.unlink(missing_ok=True)
+
+
+__all__ = ["EventIngestQueue", "OverflowPolicy"]
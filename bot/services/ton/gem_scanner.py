@@ -2,6 +2,8 @@
 
 Модуль отслеживает появление новых JettonMinter через TonDirectClient,
 автоматически прогоняет их через SafetyChecker и формирует топ-10 горячих токенов.
+Кандидаты хранятся в ``RankedIndex`` по каноническому адресу: повторный сигнал
+обновляет токен на месте, а пул (``candidate_pool_size``) намного глубже топа.
 """
 
 from __future__ import annotations
@@ -16,8 +18,12 @@ from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from bot.repositories import upsert_gem_cache
+from bot.utils import codec
 from bot.utils.cache import get_cache
+from bot.utils.ranking import RankedIndex
+from bot.utils.ton_address import canonical_address
 from config.settings import get_settings
+from .minter_dedup import MinterDeduplicator
 from .safety_checker import SafetyChecker, SafetyReport
 from .ton_direct import JettonMinterEvent, get_ton_client
 
@@ -35,6 +41,8 @@ class GemSignal:
     tags: tuple[str, ...]
     report: SafetyReport
     created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    # Исходное событие минтера — для перепроверок (в кеш и API не попадает).
+    raw_event: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
 
     def as_dict(self) -> dict[str, str | float | int | bool]:
         return {
@@ -58,12 +66,18 @@ class GemScanner:
         self._app_settings = get_settings()
         self._safety_checker = safety_checker
         self._ton_client = None
-        self._hot_tokens: list[GemSignal] = []
-        self._lock = asyncio.Lock()
+        self._ranking: RankedIndex[GemSignal] = RankedIndex(self._settings.candidate_pool_size)
         self._subscribers: set[Callable[[Sequence[GemSignal]], Awaitable[None]]] = set()
         self._refresh_task: asyncio.Task[None] | None = None
         self._session_maker: async_sessionmaker[AsyncSession] | None = None
         self._cache = get_cache()
+        self._dedup = MinterDeduplicator(
+            max_entries=self._settings.dedup_max_entries,
+            ttl_sec=self._settings.dedup_ttl_sec,
+        )
+        # Токены с провизорным SafetyReport: ждут итоговый отчёт (канонический адрес → событие).
+        self._provisional: dict[str, JettonMinterEvent] = {}
+        self._safety_checker.subscribe_updates(self._on_report_update)
         self._bot: "Bot | None" = None
         self._filters: dict[str, Any] = {
             "min_score": 0.0,
@@ -102,20 +116,75 @@ class GemScanner:
     async def get_top(self, limit: int = 10) -> list[GemSignal]:
         """Возвращает текущий топ в порядке убывания score."""
 
-        async with self._lock:
-            return self._apply_filters(self._hot_tokens)[:limit]
+        return self._apply_filters(limit)
+
+    async def get_hot_signals(self) -> list[GemSignal]:
+        """Топ ``burst_threshold_tokens`` без пользовательских фильтров (для перепроверок)."""
+
+        return self._ranking.top(self._settings.burst_threshold_tokens)
+
+    def get_signal(self, address: str) -> GemSignal | None:
+        """Сигнал из пула кандидатов по адресу в любой форме."""
+
+        return self._ranking.get(canonical_address(address))
+
+    def ranking_stats(self) -> dict[str, int]:
+        return self._ranking.stats()
 
     async def _on_new_jetton(self, event: JettonMinterEvent) -> None:
         """Колбэк от TonDirect/Indexer: прогоняем токен через фильтры."""
 
+        source = event.raw.get("source", "toncenter")
+        verdict = self._dedup.observe(event.address, source)
+        if not verdict.is_first:
+            logger.debug(
+                "Jetton {addr} от {source} — дубль, первым был {first} (+{lag:.0f} мс)",
+                addr=event.address,
+                source=source,
+                first=verdict.first_source,
+                lag=verdict.lag_ms,
+            )
+            return
+
         report = await self._safety_checker.check_jetton(event.address, event.raw)
-        
+        finishing = self._safety_checker.finishing(event.address) if report.is_provisional else None
+        if finishing is not None:
+            self._provisional[verdict.key] = event
+            # Снимаем при любом исходе: упавшее завершение итоговый отчёт не опубликует.
+            finishing.add_done_callback(lambda _: self._drop_provisional(verdict.key, event))
+        await self._admit(event, report)
+
+    def _drop_provisional(self, key: str, event: JettonMinterEvent) -> None:
+        if self._provisional.get(key) is event:
+            del self._provisional[key]
+
+    async def _on_report_update(self, address: str, report: SafetyReport) -> None:
+        """Итоговый или перепроверенный SafetyReport: токен проходит фильтры заново."""
+
+        key = canonical_address(address)
+        event = self._provisional.pop(key, None)
+        if event is None:
+            event = await self._hot_event(key)
+        if event is None:
+            return
+        logger.debug(
+            "Jetton {addr}: итоговый SafetyReport (score={score:.1f}, safe={safe})",
+            addr=event.address,
+            score=report.score,
+            safe=report.is_safe,
+        )
+        await self._admit(event, report)
+
+    async def _admit(self, event: JettonMinterEvent, report: SafetyReport) -> None:
+        """Фильтры GemScanner и добавление сигнала в топ (повтор — замена)."""
+
         # Агрессивный режим: если min_liquidity=0, пропускаем все токены
         aggressive_mode = self._settings.min_liquidity_usd == 0
         
         if not aggressive_mode:
             if not report.is_safe:
                 logger.debug("Jetton {addr} отклонён safety фильтром", addr=event.address)
+                await self._drop_signal(event.address)
                 return
             if report.liquidity_usd < self._settings.min_liquidity_usd:
                 logger.debug(
@@ -124,6 +193,7 @@ class GemScanner:
                     liq=report.liquidity_usd,
                     min_liq=self._settings.min_liquidity_usd,
                 )
+                await self._drop_signal(event.address)
                 return
             if report.volume_5m_usd < self._settings.min_volume_5m_usd:
                 logger.debug(
@@ -132,24 +202,34 @@ class GemScanner:
                     vol=report.volume_5m_usd,
                     min_vol=self._settings.min_volume_5m_usd,
                 )
+                await self._drop_signal(event.address)
                 return
         
         score = self._calc_score(report)
-        async with self._lock:
-            tags = self._build_tags(report)
-            # В агрессивном режиме добавляем метку
-            if aggressive_mode:
-                tags = ("⚠️ Агрессивный",) + tags
-            signal = GemSignal(
-                address=event.address,
-                symbol=event.symbol,
+        tags = self._build_tags(report)
+        # В агрессивном режиме добавляем метку
+        if aggressive_mode:
+            tags = ("⚠️ Агрессивный",) + tags
+        key = canonical_address(event.address)
+        previous = self._ranking.get(key)
+        signal = GemSignal(
+            address=event.address,
+            symbol=event.symbol,
+            score=score,
+            tags=tags,
+            report=report,
+            raw_event=event.raw,
+        )
+        if previous is not None:
+            signal.created_at = previous.created_at
+        is_update = self._ranking.upsert(key, score, signal)
+        if key not in self._ranking:
+            logger.debug(
+                "Jetton {addr} не попал в пул кандидатов: score={score:.1f} ниже всех",
+                addr=event.address,
                 score=score,
-                tags=tags,
-                report=report,
             )
-            self._hot_tokens.append(signal)
-            self._hot_tokens.sort(key=lambda x: x.score, reverse=True)
-            self._hot_tokens = self._hot_tokens[: self._settings.burst_threshold_tokens]
+            return
         
         logger.info(
             "🚀 НОВЫЙ ТОКЕН: {symbol} ({addr}) | score={score:.1f} | liq=${liq} | vol=${vol}",
@@ -162,7 +242,28 @@ class GemScanner:
         await self._persist_signal(signal)
         
         # Уведомляем админов о новом токене
-        await self._notify_admins_new_token(event, signal, report)
+        if not is_update:
+            await self._notify_admins_new_token(event, signal, report)
+
+    async def _hot_event(self, key: str) -> JettonMinterEvent | None:
+        """Событие для токена из топа (перепроверка без нового события минтера)."""
+
+        signal = self._ranking.get(key)
+        if signal is None:
+            return None
+        return JettonMinterEvent(
+            address=signal.address,
+            owner_address=signal.report.owner,
+            total_supply=None,
+            symbol=signal.symbol,
+            timestamp=int(signal.created_at.timestamp()),
+            raw=signal.raw_event,
+        )
+
+    async def _drop_signal(self, address: str) -> None:
+        """Убирает токен из топа, если итоговый отчёт его больше не пропускает."""
+
+        self._ranking.remove(canonical_address(address))
 
     async def _periodic_push(self) -> None:
         """Раз в refresh_interval_sec отправляет топ подписчикам."""
@@ -202,7 +303,7 @@ class GemScanner:
         score = report.score
         score += min(report.liquidity_usd / 1_000, 40)
         score += min(report.volume_5m_usd / 2_000, 30)
-        score += report.smart_money_hits * 5
+        score += report.smart_money_weight * 5
         if report.lp_burned:
             score += 5
         if report.is_new:
@@ -226,6 +327,11 @@ class GemScanner:
     def set_session_maker(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
         self._session_maker = session_maker
 
+    def dedup_stats(self) -> dict[str, Any]:
+        """Статистика дедупликации: какой источник приносит минтеры первым."""
+
+        return self._dedup.stats()
+
     async def _persist_signal(self, signal: GemSignal) -> None:
         if self._session_maker is None:
             return
@@ -249,22 +355,25 @@ class GemScanner:
     def get_filters(self) -> dict[str, Any]:
         return dict(self._filters)
 
-    def _apply_filters(self, tokens: list[GemSignal]) -> list[GemSignal]:
-        filtered = []
-        for token in tokens:
-            if token.score < self._filters["min_score"]:
-                continue
-            if self._filters["lp_burned_only"] and not token.report.lp_burned:
-                continue
-            if token.report.smart_money_hits < self._filters["smart_money_min"]:
-                continue
-            filtered.append(token)
-        sort_key = self._filters.get("sort_key", "score")
-        if sort_key == "volume":
-            filtered.sort(key=lambda token: token.report.volume_5m_usd, reverse=True)
-        else:
-            filtered.sort(key=lambda token: token.score, reverse=True)
-        return filtered
+    def _apply_filters(self, limit: int) -> list[GemSignal]:
+        """Лучшие ``limit`` кандидатов, прошедших пользовательские фильтры."""
+
+        min_score = self._filters["min_score"]
+        lp_burned_only = self._filters["lp_burned_only"]
+        smart_money_min = self._filters["smart_money_min"]
+
+        def passes(token: GemSignal) -> bool:
+            return (
+                token.score >= min_score
+                and (not lp_burned_only or token.report.lp_burned)
+                and token.report.smart_money_hits >= smart_money_min
+            )
+
+        if self._filters.get("sort_key", "score") == "volume":
+            return self._ranking.top(
+                limit, where=passes, sort_key=lambda token: token.report.volume_5m_usd
+            )
+        return self._ranking.top(limit, where=passes)
 
     async def _push_webhooks(self, snapshot: Sequence[GemSignal]) -> None:
         from bot.web.webhooks import get_webhook_subscribers
@@ -273,7 +382,10 @@ class GemScanner:
         if not subscribers:
             return
         payload = {"tokens": [sig.as_dict() for sig in snapshot]}
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=3)) as session:
+        async with aiohttp.ClientSession(
+            timeout=aiohttp.ClientTimeout(total=3),
+            json_serialize=codec.dumps_str,
+        ) as session:
             await asyncio.gather(
                 *(
                     self._post_webhook(session, sub.callback_url, payload)
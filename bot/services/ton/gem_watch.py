@@ -11,6 +11,7 @@ from loguru import logger
 
 from bot.keyboards.inline.gem import build_gem_list_keyboard, build_token_keyboard
 from .gem_scanner import GemSignal
+from .safety_checker import SafetyReport
 
 
 class GemWatchService:
@@ -51,6 +52,12 @@ class GemWatchService:
             self._global_watchers.remove(user_id)
             return True
 
+    async def watched_tokens(self) -> dict[str, int]:
+        """Токены с подписчиками: адрес → число подписчиков."""
+
+        async with self._lock:
+            return {token: len(users) for token, users in self._token_watchers.items()}
+
     async def list_tokens(self, user_id: int) -> list[str]:
         async with self._lock:
             return sorted(self._user_watchlist.get(user_id, set()))
@@ -80,6 +87,22 @@ class GemWatchService:
             keyboard = build_gem_list_keyboard()
             await asyncio.gather(*(self._safe_send(user_id, broadcast_text, keyboard) for user_id in global_watchers))
 
+    async def handle_report_update(
+        self,
+        token: str,
+        previous: SafetyReport,
+        report: SafetyReport,
+    ) -> None:
+        """Существенное изменение SafetyReport после перепроверки — подписчикам токена."""
+
+        async with self._lock:
+            watchers = set(self._token_watchers.get(token, ()))
+        if not watchers:
+            return
+        text = self._format_report_update(token, previous, report)
+        keyboard = build_token_keyboard(token)
+        await asyncio.gather(*(self._safe_send(user_id, text, keyboard) for user_id in watchers))
+
     async def _safe_send(self, user_id: int, text: str, keyboard=None) -> None:
         try:
             await self._bot.send_message(chat_id=user_id, text=text, reply_markup=keyboard)
@@ -96,6 +119,22 @@ class GemWatchService:
             )
         return "\n".join(lines)
 
+    @staticmethod
+    def _format_report_update(token: str, previous: SafetyReport, report: SafetyReport) -> str:
+        lines = [
+            f"🔄 Перепроверка {token[-6:]}: рейтинг {previous.score:.1f} → {report.score:.1f}",
+            f"Ликвидность ${previous.liquidity_usd:,.0f} → ${report.liquidity_usd:,.0f}",
+        ]
+        if previous.is_safe != report.is_safe:
+            lines.append(
+                "✅ Токен прошёл проверку" if report.is_safe else "⛔ Токен больше не безопасен"
+            )
+        if previous.lp_burned != report.lp_burned:
+            lines.append("🔥 LP сожжены" if report.lp_burned else "⚠️ LP больше не сожжены")
+        if report.smart_money_hits > previous.smart_money_hits:
+            lines.append(f"🧠 Smart money: {previous.smart_money_hits} → {report.smart_money_hits}")
+        return "\n".join(lines)
+
     @staticmethod
     def _format_top(signals: Sequence[GemSignal]) -> str:
         lines = ["🔥 Топ HyperSniper (auto-feed):"]
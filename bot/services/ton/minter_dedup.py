@@ -0,0 +1,95 @@
+"""Дедупликация JettonMinter между источниками (toncenter WS, индексер, backfill).
+
+Первое появление минтера запоминается в LRU с ограничением по времени и
+размеру (фиксированный бюджет памяти). Повторы от других источников
+отбрасываются, а разница во времени прихода копится в статистике — так видно,
+какой источник быстрее и на сколько.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+from bot.utils.ton_address import canonical_address
+
+
+@dataclass(slots=True)
+class FirstSeen:
+    source: str
+    at: float
+
+
+@dataclass(slots=True)
+class DedupVerdict:
+    """Результат наблюдения события."""
+
+    key: str
+    is_first: bool
+    first_source: str
+    lag_ms: float
+
+
+class MinterDeduplicator:
+    """LRU «уже видели» с TTL и статистикой гонки источников."""
+
+    def __init__(self, *, max_entries: int, ttl_sec: float) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._ttl = ttl_sec
+        self._seen: OrderedDict[str, FirstSeen] = OrderedDict()
+        self._wins: dict[str, int] = defaultdict(int)
+        self._duplicates: dict[tuple[str, str], int] = defaultdict(int)
+        self._lag_total: dict[tuple[str, str], float] = defaultdict(float)
+        self.evicted = 0
+
+    def observe(self, address: str, source: str) -> DedupVerdict:
+        """Регистрирует событие; is_first=False — минтер уже приходил."""
+
+        key = canonical_address(address)
+        now = time.monotonic()
+        self._expire(now)
+        first = self._seen.get(key)
+        if first is None:
+            self._seen[key] = FirstSeen(source=source, at=now)
+            self._wins[source] += 1
+            if len(self._seen) > self._max_entries:
+                self._seen.popitem(last=False)
+                self.evicted += 1
+            return DedupVerdict(key=key, is_first=True, first_source=source, lag_ms=0.0)
+        lag_ms = (now - first.at) * 1000
+        pair = (first.source, source)
+        self._duplicates[pair] += 1
+        self._lag_total[pair] += lag_ms
+        return DedupVerdict(key=key, is_first=False, first_source=first.source, lag_ms=lag_ms)
+
+    def stats(self) -> dict[str, Any]:
+        """Кто приходит первым и насколько опаздывают остальные источники."""
+
+        return {
+            "entries": len(self._seen),
+            "capacity": self._max_entries,
+            "evicted": self.evicted,
+            "first_wins": dict(self._wins),
+            "late_copies": [
+                {
+                    "first": first,
+                    "late": late,
+                    "count": count,
+                    "avg_lag_ms": round(self._lag_total[(first, late)] / count, 1),
+                }
+                for (first, late), count in self._duplicates.items()
+            ],
+        }
+
+    def _expire(self, now: float) -> None:
+        while self._seen:
+            key, first = next(iter(self._seen.items()))
+            if now - first.at < self._ttl:
+                break
+            del self._seen[key]
+            self.evicted += 1
+
+
+__all__ = ["DedupVerdict", "MinterDeduplicator"]
@@ -8,6 +8,7 @@ from typing import Awaitable, Callable
 import aiohttp
 from loguru import logger
 
+from bot.utils import codec
 from config.settings import get_settings
 
 PriceCallback = Callable[[str, float], Awaitable[None]]
@@ -58,7 +59,7 @@ class PriceFeedService:
                 if resp.status != 200:
                     logger.debug("PriceFeed ошибка HTTP {status}", status=resp.status)
                     return
-                data = await resp.json()
+                data = codec.loads(await resp.read())
         except Exception as exc:  # noqa: BLE001
             logger.debug("PriceFeed запрос упал: {error}", error=exc)
             return
@@ -0,0 +1,324 @@
+"""Планировщик повторных проверок отслеживаемых токенов.
+
+SafetyReport считается один раз при появлении минтера, а ликвидность, LP и
+вход смарт-кошельков в первый час меняются постоянно. Планировщик держит
+токены из топа GemScanner, подписок пользователей и открытых позиций в куче
+по времени следующей проверки. Интервал сокращается для волатильных (отчёт
+заметно меняется между проверками) и популярных (подписчики, позиции)
+токенов и растёт для спокойных. Бюджет RPC ограничен: не больше
+``recheck_per_minute`` перепроверок в минуту и ``recheck_concurrency``
+одновременно, все на приоритете BACKGROUND. Хранимое событие — снимок
+минта (у позиций — пустое), поэтому каждая перепроверка берёт текущие пул,
+объём и холдеры и обходит кеш get-методов. Новый отчёт публикуется
+подписчикам SafetyChecker (GemScanner обновляет топ), а существенные
+изменения — подписчикам планировщика (уведомления watchers).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Sequence
+
+from loguru import logger
+
+from bot.utils.ton_address import canonical_address
+from config.settings import get_settings
+from .gem_scanner import GemSignal
+from .rpc_limiter import PriorityRateLimiter
+from .safety_checker import SafetyChecker, SafetyReport
+from .ton_direct import RpcPriority
+
+ReportUpdateCallback = Callable[[str, SafetyReport, SafetyReport], Awaitable[None]]
+
+# Вес источников в «популярности» токена.
+_SOURCE_WEIGHT = {"hot": 1, "held": 2}
+
+
+@dataclass(slots=True)
+class _Tracked:
+    address: str
+    raw_event: dict[str, Any]
+    sources: set[str] = field(default_factory=set)
+    watchers: int = 0
+    report: SafetyReport | None = None
+    volatility: float = 0.0
+    interval: float = 0.0
+    due: float = 0.0
+    generation: int = 0
+    checks: int = 0
+
+    @property
+    def popularity(self) -> int:
+        return self.watchers + sum(_SOURCE_WEIGHT.get(source, 0) for source in self.sources)
+
+
+class RecheckScheduler:
+    """Очередь перепроверок SafetyReport по времени следующей проверки."""
+
+    def __init__(
+        self,
+        safety_checker: SafetyChecker,
+        *,
+        hot: Callable[[], Awaitable[Sequence[GemSignal]]],
+        watched: Callable[[], Awaitable[dict[str, int]]],
+        held: Callable[[], Awaitable[set[str]]],
+    ) -> None:
+        security = get_settings().ton_security
+        self._enabled = security.recheck_enabled
+        self._base = security.recheck_base_sec
+        self._min = security.recheck_min_sec
+        self._max = security.recheck_max_sec
+        self._sync_interval = security.recheck_sync_sec
+        self._notify_delta = security.recheck_notify_score_delta
+        self._safety_checker = safety_checker
+        self._hot = hot
+        self._watched = watched
+        self._held = held
+        self._entries: dict[str, _Tracked] = {}
+        self._heap: list[tuple[float, int, str, int]] = []
+        self._seq = itertools.count()
+        self._budget = PriorityRateLimiter(
+            rate=security.recheck_per_minute / 60, burst=security.recheck_concurrency
+        )
+        self._slots = asyncio.Semaphore(security.recheck_concurrency)
+        self._wakeup = asyncio.Event()
+        self._callbacks: set[ReportUpdateCallback] = set()
+        self._task: asyncio.Task[None] | None = None
+        self._running: set[asyncio.Task[None]] = set()
+        self._last_sync = 0.0
+        self.rechecks = 0
+        self.failures = 0
+        self.material_changes = 0
+
+    def subscribe(self, callback: ReportUpdateCallback) -> None:
+        """callback(адрес, прежний отчёт, новый) — только при существенных изменениях."""
+
+        self._callbacks.add(callback)
+
+    async def start(self) -> None:
+        if not self._enabled:
+            logger.info("RecheckScheduler выключен (TON_SECURITY__RECHECK_ENABLED=false)")
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="safety-recheck")
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+        for task in list(self._running):
+            task.cancel()
+
+    def track(
+        self,
+        address: str,
+        source: str,
+        *,
+        raw_event: dict[str, Any] | None = None,
+        report: SafetyReport | None = None,
+    ) -> None:
+        """Добавляет токен (или источник к уже отслеживаемому) в расписание."""
+
+        key = canonical_address(address)
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._entries[key] = _Tracked(address=address, raw_event=raw_event or {})
+            entry.report = report
+            entry.sources.add(source)
+            # Без отчёта — проверяем сразу, с отчётом — по обычному расписанию.
+            now = time.monotonic()
+            self._schedule(entry, key, now if report is None else now + self._interval(entry))
+            return
+        if raw_event:
+            entry.raw_event = raw_event
+        if source not in entry.sources:
+            entry.sources.add(source)
+            self._reschedule_if_sooner(entry, key)
+
+    def stats(self) -> dict[str, Any]:
+        by_source: dict[str, int] = {}
+        for entry in self._entries.values():
+            for source in entry.sources:
+                by_source[source] = by_source.get(source, 0) + 1
+        intervals = [entry.interval for entry in self._entries.values() if entry.interval]
+        now = time.monotonic()
+        return {
+            "tracked": len(self._entries),
+            "by_source": by_source,
+            "overdue": sum(1 for entry in self._entries.values() if entry.due <= now),
+            "running": len(self._running),
+            "rechecks": self.rechecks,
+            "failures": self.failures,
+            "material_changes": self.material_changes,
+            "avg_interval_sec": round(sum(intervals) / len(intervals), 1) if intervals else 0.0,
+            "budget": self._budget.stats()["classes"]["background"],
+        }
+
+    async def _run(self) -> None:
+        while True:
+            now = time.monotonic()
+            if now - self._last_sync >= self._sync_interval:
+                await self._safe_sync()
+                now = time.monotonic()
+            wait = self._sync_interval - (now - self._last_sync)
+            entry = self._pop_due(now)
+            if entry is None:
+                if self._heap:
+                    wait = min(wait, self._heap[0][0] - now)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=max(wait, 0.0))
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._budget.acquire(RpcPriority.BACKGROUND)
+            await self._slots.acquire()
+            task = asyncio.create_task(self._recheck(entry), name="safety-recheck-token")
+            self._running.add(task)
+            task.add_done_callback(self._on_recheck_done)
+
+    def _pop_due(self, now: float) -> _Tracked | None:
+        while self._heap and self._heap[0][0] <= now:
+            _, _, key, generation = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry.generation == generation:
+                return entry
+        return None
+
+    async def _recheck(self, entry: _Tracked) -> None:
+        key = canonical_address(entry.address)
+        previous = entry.report
+        try:
+            report = await self._safety_checker.recheck(
+                entry.address, entry.raw_event, priority=RpcPriority.BACKGROUND, fresh=True
+            )
+        except Exception as exc:  # noqa: BLE001
+            self.failures += 1
+            report = None
+            logger.debug(
+                "Перепроверка {addr} не удалась: {error}", addr=entry.address, error=repr(exc)
+            )
+        else:
+            self.rechecks += 1
+        entry.checks += 1
+        # Провизорный отчёт не сравниваем: итоговый SafetyChecker опубликует сам.
+        if report is not None and not report.is_provisional:
+            if previous is not None:
+                change = self._change(previous, report)
+                entry.volatility = 0.5 * entry.volatility + 0.5 * change
+            entry.report = report
+        if self._entries.get(key) is entry:
+            self._schedule(entry, key, time.monotonic() + self._interval(entry))
+        if report is None or report.is_provisional:
+            return
+        if previous is not None and self._is_material(previous, report):
+            self.material_changes += 1
+            await asyncio.gather(
+                *(self._safe_notify(cb, entry.address, previous, report) for cb in self._callbacks)
+            )
+
+    def _on_recheck_done(self, task: asyncio.Task[None]) -> None:
+        self._running.discard(task)
+        self._slots.release()
+
+    async def _safe_sync(self) -> None:
+        try:
+            await self._sync()
+        except Exception as exc:  # noqa: BLE001
+            logger.warning(
+                "RecheckScheduler: не удалось обновить список токенов: {error}", error=exc
+            )
+        self._last_sync = time.monotonic()
+
+    async def _sync(self) -> None:
+        """Сверяет расписание с топом, подписками и позициями."""
+
+        hot = {canonical_address(signal.address): signal for signal in await self._hot()}
+        held = {canonical_address(address): address for address in await self._held()}
+        watched = await self._watched()
+        watchers: dict[str, int] = {}
+        for address, count in watched.items():
+            key = canonical_address(address)
+            watchers[key] = watchers.get(key, 0) + count
+        for signal in hot.values():
+            self.track(signal.address, "hot", raw_event=signal.raw_event, report=signal.report)
+        for address in held.values():
+            self.track(address, "held")
+        for address in watched:
+            self.track(address, "watched")
+        for key in list(self._entries):
+            entry = self._entries[key]
+            entry.sources = {
+                source
+                for source, keys in (("hot", hot), ("held", held), ("watched", watchers))
+                if key in keys
+            }
+            if not entry.sources:
+                del self._entries[key]
+                continue
+            entry.watchers = watchers.get(key, 0)
+
+    def _interval(self, entry: _Tracked) -> float:
+        """Чем волатильнее и популярнее токен, тем чаще проверка."""
+
+        interval = self._base / ((1 + entry.volatility) * (1 + math.log2(1 + entry.popularity)))
+        entry.interval = min(max(interval, self._min), self._max)
+        return entry.interval
+
+    def _schedule(self, entry: _Tracked, key: str, due: float) -> None:
+        # Старые записи кучи остаются и отбрасываются по generation.
+        entry.generation += 1
+        entry.due = due
+        seq = next(self._seq)
+        heapq.heappush(self._heap, (due, seq, key, entry.generation))
+        if self._heap[0][1] == seq:
+            self._wakeup.set()
+
+    def _reschedule_if_sooner(self, entry: _Tracked, key: str) -> None:
+        """Новый источник повышает популярность — следующая проверка может стать раньше."""
+
+        last_check = entry.due - entry.interval
+        due = max(last_check + self._interval(entry), time.monotonic())
+        if due < entry.due:
+            self._schedule(entry, key, due)
+
+    @staticmethod
+    def _change(previous: SafetyReport, report: SafetyReport) -> float:
+        """Относительное изменение отчёта между проверками (0 — без изменений)."""
+
+        def relative(old: float, new: float) -> float:
+            return min(abs(new - old) / max(abs(old), 1.0), 1.0)
+
+        change = relative(previous.liquidity_usd, report.liquidity_usd)
+        change += relative(previous.volume_5m_usd, report.volume_5m_usd)
+        change += float(previous.lp_burned != report.lp_burned)
+        change += float(previous.is_safe != report.is_safe)
+        change += min(abs(report.smart_money_hits - previous.smart_money_hits), 3) * 0.5
+        return change
+
+    def _is_material(self, previous: SafetyReport, report: SafetyReport) -> bool:
+        return (
+            previous.is_safe != report.is_safe
+            or previous.lp_burned != report.lp_burned
+            or report.smart_money_hits > previous.smart_money_hits
+            or abs(report.score - previous.score) >= self._notify_delta
+        )
+
+    async def _safe_notify(
+        self,
+        callback: ReportUpdateCallback,
+        address: str,
+        previous: SafetyReport,
+        report: SafetyReport,
+    ) -> None:
+        try:
+            await callback(address, previous, report)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Подписчик RecheckScheduler упал: {error}", error=exc)
+
+
+__all__ = ["RecheckScheduler", "ReportUpdateCallback"]
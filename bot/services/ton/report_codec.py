@@ -0,0 +1,320 @@
+"""Компактный версионированный кодек SafetyReport / GemSignal для кеша.
+
+Pickle хранит имена модулей, классов и полей в каждой записи — для
+Redis с десятками тысяч отчётов это лишние сотни байт на ключ и заметное
+время на (де)сериализацию. Здесь числовые поля упакованы фиксированной
+struct-раскладкой, адреса ``wc:hex`` — в 33 байта, строки — с длиной,
+``extra`` плагинов — общим JSON кодеком. Отчёт, чей ``extra`` не переживёт
+JSON без потерь (ScoreAdjustment, кортежи, нестроковые ключи), целиком идёт
+через pickle.
+
+Формат записи: ``MAGIC (2) | VERSION (1) | TAG (1) | тело``. Запись другой
+версии при чтении считается промахом кеша, поэтому смена раскладки не требует
+чистки Redis. Остальные значения кеша (списки, словари, RPC ответы) идут через
+pickle, как раньше.
+"""
+
+from __future__ import annotations
+
+import math
+import pickle
+import struct
+from datetime import datetime, timezone
+from typing import Any
+
+from aiocache.serializers import BaseSerializer
+from loguru import logger
+
+from bot.utils import codec
+from .gem_scanner import GemSignal
+from .safety_checker import CachedReport, SafetyReport
+
+MAGIC = b"HS"
+VERSION = 1
+
+_TAG_REPORT = 1
+_TAG_CACHED_REPORT = 2
+_TAG_SIGNAL = 3
+_TAG_SIGNAL_LIST = 4
+
+_HEADER = struct.Struct("<2sBB")
+# flags, score, liquidity_usd, volume_5m_usd, smart_money_weight, smart_money_hits
+_REPORT = struct.Struct("<BddddI")
+_CACHED = struct.Struct("<dd")
+# score, created_at (unix)
+_SIGNAL = struct.Struct("<dd")
+_COUNT = struct.Struct("<H")
+_LENGTH = struct.Struct("<I")
+# Кортеж строк: число строк и длина их UTF-8, склеенных через NUL.
+_TEXTS = struct.Struct("<HI")
+
+_FLAG_SAFE = 1
+_FLAG_LP_BURNED = 2
+_FLAG_NEW = 4
+
+_ADDR_NONE = 0
+_ADDR_RAW = 1
+_ADDR_TEXT = 2
+
+
+class _Writer:
+    __slots__ = ("parts",)
+
+    def __init__(self) -> None:
+        self.parts: list[bytes] = []
+
+    def pack(self, fmt: struct.Struct, *values: Any) -> None:
+        self.parts.append(fmt.pack(*values))
+
+    def text(self, value: str | None) -> None:
+        if value is None:
+            self.parts.append(b"\xff\xff")
+            return
+        raw = value.encode("utf-8")
+        if len(raw) >= 0xFFFF:
+            raw = raw[: 0xFFFE].decode("utf-8", "ignore").encode("utf-8")
+        self.parts.append(_COUNT.pack(len(raw)) + raw)
+
+    def texts(self, values: tuple[str, ...]) -> None:
+        raw = "\0".join(value.replace("\0", "") for value in values).encode("utf-8")
+        self.parts.append(_TEXTS.pack(len(values), len(raw)) + raw)
+
+    def address(self, value: str | None) -> None:
+        if value is None:
+            self.parts.append(bytes((_ADDR_NONE,)))
+            return
+        workchain, sep, account = value.partition(":")
+        if sep and len(account) == 64:
+            try:
+                self.parts.append(
+                    struct.pack("<Bb", _ADDR_RAW, int(workchain)) + bytes.fromhex(account)
+                )
+                return
+            except (ValueError, struct.error):
+                # Не hex или workchain вне int8 — сохраняем строкой.
+                pass
+        self.parts.append(bytes((_ADDR_TEXT,)))
+        self.text(value)
+
+    def blob(self, raw: bytes) -> None:
+        self.parts.append(_LENGTH.pack(len(raw)) + raw)
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.parts)
+
+
+class _Reader:
+    __slots__ = ("data", "pos")
+
+    def __init__(self, data: bytes) -> None:
+        self.data = data
+        self.pos = 0
+
+    def unpack(self, fmt: struct.Struct) -> tuple[Any, ...]:
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def text(self) -> str | None:
+        (length,) = self.unpack(_COUNT)
+        if length == 0xFFFF:
+            return None
+        value = self.data[self.pos : self.pos + length].decode("utf-8")
+        self.pos += length
+        return value
+
+    def texts(self) -> tuple[str, ...]:
+        count, length = self.unpack(_TEXTS)
+        if not count:
+            return ()
+        raw = self.data[self.pos : self.pos + length]
+        self.pos += length
+        return tuple(raw.decode("utf-8").split("\0"))
+
+    def address(self) -> str | None:
+        kind = self.data[self.pos]
+        self.pos += 1
+        if kind == _ADDR_NONE:
+            return None
+        if kind == _ADDR_TEXT:
+            return self.text()
+        workchain = struct.unpack_from("<b", self.data, self.pos)[0]
+        account = self.data[self.pos + 1 : self.pos + 33].hex()
+        self.pos += 33
+        return f"{workchain}:{account}"
+
+    def blob(self) -> bytes:
+        (length,) = self.unpack(_LENGTH)
+        raw = self.data[self.pos : self.pos + length]
+        self.pos += length
+        return raw
+
+
+def _json_safe(value: Any) -> bool:
+    """True, если значение вернётся из JSON тем же (типы и ключи сохраняются)."""
+
+    # Точные типы: подклассы (IntEnum, StrEnum) вернутся из JSON базовыми.
+    if value is None or type(value) in (bool, int, str):
+        return True
+    if type(value) is float:
+        return math.isfinite(value)
+    if type(value) is list:
+        return all(_json_safe(item) for item in value)
+    if type(value) is dict:
+        return all(isinstance(key, str) and _json_safe(item) for key, item in value.items())
+    return False
+
+
+def _write_report(writer: _Writer, report: SafetyReport) -> None:
+    if not _json_safe(report.extra):
+        raise TypeError("extra отчёта не сериализуется в JSON без потерь")
+    flags = (
+        (_FLAG_SAFE if report.is_safe else 0)
+        | (_FLAG_LP_BURNED if report.lp_burned else 0)
+        | (_FLAG_NEW if report.is_new else 0)
+    )
+    writer.pack(
+        _REPORT,
+        flags,
+        report.score,
+        report.liquidity_usd,
+        report.volume_5m_usd,
+        report.smart_money_weight,
+        report.smart_money_hits,
+    )
+    writer.address(report.owner)
+    writer.texts(report.reasons)
+    writer.texts(report.failed_checks)
+    writer.texts(report.pending_checks)
+    writer.blob(codec.dumps(report.extra) if report.extra else b"")
+
+
+def _read_report(reader: _Reader) -> SafetyReport:
+    flags, score, liquidity, volume, weight, hits = reader.unpack(_REPORT)
+    owner = reader.address()
+    reasons = reader.texts()
+    failed = reader.texts()
+    pending = reader.texts()
+    extra = reader.blob()
+    return SafetyReport(
+        is_safe=bool(flags & _FLAG_SAFE),
+        score=score,
+        reasons=reasons,
+        liquidity_usd=liquidity,
+        volume_5m_usd=volume,
+        smart_money_hits=hits,
+        lp_burned=bool(flags & _FLAG_LP_BURNED),
+        is_new=bool(flags & _FLAG_NEW),
+        owner=owner,
+        failed_checks=failed,
+        smart_money_weight=weight,
+        pending_checks=pending,
+        extra=codec.loads(extra) if extra else {},
+    )
+
+
+def _write_signal(writer: _Writer, signal: GemSignal) -> None:
+    writer.pack(_SIGNAL, signal.score, signal.created_at.timestamp())
+    writer.address(signal.address)
+    writer.text(signal.symbol)
+    writer.texts(signal.tags)
+    _write_report(writer, signal.report)
+
+
+def _read_signal(reader: _Reader) -> GemSignal:
+    score, created_at = reader.unpack(_SIGNAL)
+    address = reader.address() or ""
+    symbol = reader.text()
+    tags = reader.texts()
+    return GemSignal(
+        address=address,
+        symbol=symbol,
+        score=score,
+        tags=tags,
+        report=_read_report(reader),
+        created_at=datetime.fromtimestamp(created_at, tz=timezone.utc),
+    )
+
+
+def encode(value: SafetyReport | CachedReport | GemSignal | list[GemSignal]) -> bytes:
+    """Кодирует поддерживаемый объект; для остальных (и не-JSON ``extra``) — TypeError."""
+
+    writer = _Writer()
+    if isinstance(value, CachedReport):
+        writer.pack(_HEADER, MAGIC, VERSION, _TAG_CACHED_REPORT)
+        writer.pack(_CACHED, value.fresh_until, value.refresh_at)
+        _write_report(writer, value.report)
+    elif isinstance(value, SafetyReport):
+        writer.pack(_HEADER, MAGIC, VERSION, _TAG_REPORT)
+        _write_report(writer, value)
+    elif isinstance(value, GemSignal):
+        writer.pack(_HEADER, MAGIC, VERSION, _TAG_SIGNAL)
+        _write_signal(writer, value)
+    elif isinstance(value, list) and value and all(isinstance(v, GemSignal) for v in value):
+        writer.pack(_HEADER, MAGIC, VERSION, _TAG_SIGNAL_LIST)
+        writer.pack(_COUNT, len(value))
+        for signal in value:
+            _write_signal(writer, signal)
+    else:
+        raise TypeError(f"Тип {type(value).__name__} не поддерживается компактным кодеком")
+    return writer.getvalue()
+
+
+def is_compact(data: bytes) -> bool:
+    return data[:2] == MAGIC
+
+
+def decode(data: bytes) -> Any:
+    """Декодирует запись; ValueError, если версия или тег неизвестны."""
+
+    reader = _Reader(data)
+    magic, version, tag = reader.unpack(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("Не компактная запись")
+    if version != VERSION:
+        raise ValueError(f"Неподдерживаемая версия кодека: {version}")
+    if tag == _TAG_CACHED_REPORT:
+        fresh_until, refresh_at = reader.unpack(_CACHED)
+        return CachedReport(
+            report=_read_report(reader), fresh_until=fresh_until, refresh_at=refresh_at
+        )
+    if tag == _TAG_REPORT:
+        return _read_report(reader)
+    if tag == _TAG_SIGNAL:
+        return _read_signal(reader)
+    if tag == _TAG_SIGNAL_LIST:
+        (count,) = reader.unpack(_COUNT)
+        return [_read_signal(reader) for _ in range(count)]
+    raise ValueError(f"Неизвестный тег записи: {tag}")
+
+
+class CompactSerializer(BaseSerializer):
+    """Сериализатор aiocache: компактный кодек для отчётов/сигналов, pickle для остального."""
+
+    DEFAULT_ENCODING = None
+
+    def dumps(self, value: Any) -> bytes:
+        if isinstance(value, (SafetyReport, CachedReport, GemSignal)) or (
+            isinstance(value, list) and value and all(isinstance(v, GemSignal) for v in value)
+        ):
+            try:
+                return encode(value)
+            except TypeError:
+                # extra плагина не JSON — pickle сохранит его как есть.
+                pass
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def loads(self, value: bytes | None) -> Any:
+        if value is None:
+            return None
+        if not is_compact(value):
+            return pickle.loads(value)  # noqa: S301
+        try:
+            return decode(value)
+        except (ValueError, struct.error, UnicodeDecodeError, *codec.DecodeError) as exc:
+            # Запись старой/чужой версии — считаем промахом кеша.
+            logger.debug("Компактная запись кеша отброшена: {error}", error=exc)
+            return None
+
+
+__all__ = ["CompactSerializer", "MAGIC", "VERSION", "decode", "encode", "is_compact"]
@@ -0,0 +1,95 @@
+"""Микро-батчинг JSON-RPC вызовов для TonDirectClient.
+
+Параллельные вызовы, пришедшие в течение короткого окна, собираются в один
+JSON-RPC batch (массив запросов) и отправляются одним HTTP POST. Ответы
+сопоставляются с вызовами по полю ``id``. Пачка уходит с самым срочным
+приоритетом из её вызовов: лимитер RPC считает HTTP запросы, а не вызовы.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable
+
+from .rpc_limiter import RpcPriority
+
+BatchSender = Callable[[list[dict[str, Any]], RpcPriority], Awaitable[list[dict[str, Any]]]]
+
+
+class RpcBatcher:
+    """Копит JSON-RPC запросы и отправляет их пачкой."""
+
+    def __init__(self, send: BatchSender, *, window: float, max_size: int) -> None:
+        self._send = send
+        self._window = max(window, 0.0)
+        self._max_size = max(max_size, 1)
+        self._pending: list[tuple[dict[str, Any], asyncio.Future[dict[str, Any]]]] = []
+        self._priority: RpcPriority | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    async def submit(
+        self,
+        payload: dict[str, Any],
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> dict[str, Any]:
+        """Ставит запрос в текущую пачку и ждёт его ответ (объект с result/error)."""
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[dict[str, Any]] = loop.create_future()
+        self._pending.append((payload, future))
+        if self._priority is None or priority < self._priority:
+            self._priority = priority
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+        return await future
+
+    async def close(self) -> None:
+        """Отправляет хвост очереди и дожидается незавершённых пачек."""
+
+        self._flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        priority = RpcPriority.BACKGROUND if self._priority is None else self._priority
+        self._priority = None
+        task = asyncio.create_task(self._send_batch(batch, priority), name="ton-rpc-batch")
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _send_batch(
+        self,
+        batch: list[tuple[dict[str, Any], asyncio.Future[dict[str, Any]]]],
+        priority: RpcPriority,
+    ) -> None:
+        try:
+            responses = await self._send([payload for payload, _ in batch], priority)
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        by_id = {item.get("id"): item for item in responses if isinstance(item, dict)}
+        for payload, future in batch:
+            if future.done():
+                continue
+            future.set_result(
+                by_id.get(payload["id"])
+                or {"id": payload["id"], "error": "ответ отсутствует в batch"}
+            )
+
+
+__all__ = ["BatchSender", "RpcBatcher"]
@@ -0,0 +1,78 @@
+"""Кеш результатов get-методов TON с привязкой к состоянию контракта.
+
+Ключ — (адрес, метод, аргументы). Если вызывающий знает токен состояния
+(seqno блока или lt последней транзакции), запись живёт, пока токен совпадает
+(но не дольше ``token_ttl``). Без токена запись считается свежей только
+``ttl`` секунд. Вытеснение — LRU по числу записей.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    token: str | None
+    fetched_at: float
+
+
+class GetMethodCache:
+    """LRU кеш get-методов с токенами валидности и статистикой."""
+
+    def __init__(self, *, max_entries: int, ttl: float, token_ttl: float) -> None:
+        self._max_entries = max(max_entries, 1)
+        self._ttl = ttl
+        self._token_ttl = token_ttl
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.evicted = 0
+
+    def get(self, key: Hashable, token: str | None = None) -> tuple[bool, Any]:
+        """Возвращает (найдено, значение) с учётом токена состояния."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        age = time.monotonic() - entry.fetched_at
+        if token is not None and entry.token is not None:
+            fresh = entry.token == token and age < self._token_ttl
+        else:
+            fresh = age < self._ttl
+        if not fresh:
+            del self._entries[key]
+            self.stale += 1
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry.value
+
+    def set(self, key: Hashable, value: Any, token: str | None = None) -> None:
+        self._entries[key] = _Entry(value=value, token=token, fetched_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "capacity": self._max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "evicted": self.evicted,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+__all__ = ["GetMethodCache"]
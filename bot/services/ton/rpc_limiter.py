@@ -0,0 +1,119 @@
+"""Приоритетный token-bucket лимитер RPC трафика TON.
+
+Общий бюджет запросов в секунду делится между классами приоритета. У каждого
+класса своя очередь; при нехватке токенов первыми обслуживаются сделки, затем
+пользовательские проверки, сканер и фоновые задачи.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any
+
+
+class RpcPriority(IntEnum):
+    """Классы приоритета RPC вызовов (меньше — важнее)."""
+
+    TRADE = 0
+    USER = 1
+    SCANNER = 2
+    BACKGROUND = 3
+
+
+class PriorityRateLimiter:
+    """Token bucket с отдельной очередью на каждый класс приоритета."""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        if rate <= 0:
+            raise ValueError("rate должен быть > 0")
+        self._rate = rate
+        self._burst = max(burst, 1)
+        self._tokens = float(self._burst)
+        self._updated = time.monotonic()
+        self._queues: dict[RpcPriority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in RpcPriority
+        }
+        self._dispatcher: asyncio.Task[None] | None = None
+        self._granted = {priority: 0 for priority in RpcPriority}
+        self._wait_total = {priority: 0.0 for priority in RpcPriority}
+
+    async def acquire(self, priority: RpcPriority = RpcPriority.BACKGROUND) -> None:
+        """Ждёт токен для вызова указанного класса."""
+
+        self._refill()
+        if self._tokens >= 1 and not self._has_waiters(up_to=priority):
+            self._tokens -= 1
+            self._granted[priority] += 1
+            return
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._queues[priority].append(future)
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch(), name="ton-rpc-limiter")
+        started = time.monotonic()
+        try:
+            await future
+        finally:
+            self._wait_total[priority] += time.monotonic() - started
+        self._granted[priority] += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Глубина очередей и среднее ожидание по классам."""
+
+        return {
+            "rate": self._rate,
+            "tokens": round(self._tokens, 2),
+            "classes": {
+                priority.name.lower(): {
+                    "queued": len(self._queues[priority]),
+                    "granted": self._granted[priority],
+                    "avg_wait_ms": round(
+                        self._wait_total[priority] / self._granted[priority] * 1000, 2
+                    )
+                    if self._granted[priority]
+                    else 0.0,
+                }
+                for priority in RpcPriority
+            },
+        }
+
+    async def _dispatch(self) -> None:
+        while True:
+            future = self._next_waiter()
+            if future is None:
+                return
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                continue
+            self._tokens -= 1
+            self._pop_waiter(future)
+            future.set_result(None)
+
+    def _next_waiter(self) -> asyncio.Future[None] | None:
+        for priority in RpcPriority:
+            queue = self._queues[priority]
+            while queue and queue[0].done():
+                queue.popleft()
+            if queue:
+                return queue[0]
+        return None
+
+    def _pop_waiter(self, future: asyncio.Future[None]) -> None:
+        for queue in self._queues.values():
+            if queue and queue[0] is future:
+                queue.popleft()
+                return
+
+    def _has_waiters(self, *, up_to: RpcPriority) -> bool:
+        return any(self._queues[priority] for priority in RpcPriority if priority <= up_to)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+__all__ = ["PriorityRateLimiter", "RpcPriority"]
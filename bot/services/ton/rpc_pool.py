@@ -0,0 +1,127 @@
+"""Пул RPC узлов TON с маршрутизацией по задержке.
+
+Для каждого узла ведётся EWMA задержки и доли ошибок. Вызов уходит на самый
+быстрый здоровый узел; для hedged-запросов пул подсказывает второй узел и
+задержку перед дублированием (p95 основного узла).
+"""
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+
+@dataclass(slots=True)
+class EndpointStats:
+    """Скользящая статистика одного RPC узла."""
+
+    url: str
+    latency_ewma: float | None = None
+    error_ewma: float = 0.0
+    last_failure: float = 0.0
+    requests: int = 0
+    failures: int = 0
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=256))
+
+    def p95(self) -> float | None:
+        """95-й перцентиль последних успешных задержек (секунды)."""
+
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def as_dict(self) -> dict[str, Any]:
+        p95 = self.p95()
+        return {
+            "url": self.url,
+            "latency_ms": round(self.latency_ewma * 1000, 1) if self.latency_ewma else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "error_rate": round(self.error_ewma, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class RpcEndpointPool:
+    """Выбирает RPC узел по EWMA задержки и ошибок."""
+
+    def __init__(
+        self,
+        endpoints: Iterable[str],
+        *,
+        alpha: float = 0.2,
+        max_error_rate: float = 0.5,
+        recovery_sec: float = 30.0,
+    ) -> None:
+        unique = list(dict.fromkeys(endpoints))
+        if not unique:
+            raise ValueError("RpcEndpointPool требует хотя бы один RPC узел")
+        self._stats = {url: EndpointStats(url=url) for url in unique}
+        self._alpha = alpha
+        self._max_error_rate = max_error_rate
+        self._recovery_sec = recovery_sec
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    @property
+    def urls(self) -> list[str]:
+        return list(self._stats)
+
+    def pick(self, exclude: Iterable[str] = ()) -> str:
+        """Возвращает URL самого быстрого здорового узла."""
+
+        skip = set(exclude)
+        candidates = [stats for url, stats in self._stats.items() if url not in skip]
+        if not candidates:
+            candidates = list(self._stats.values())
+        now = time.monotonic()
+        healthy = [stats for stats in candidates if self._is_healthy(stats, now)]
+        if healthy:
+            return min(healthy, key=self._score).url
+        return min(candidates, key=lambda stats: stats.error_ewma).url
+
+    def hedge_delay(self, url: str, floor: float) -> float:
+        """Задержка перед hedged-запросом: p95 основного узла, но не меньше floor."""
+
+        p95 = self._stats[url].p95()
+        return max(floor, p95 or 0.0)
+
+    def record_success(self, url: str, latency: float) -> None:
+        stats = self._stats[url]
+        stats.requests += 1
+        stats.samples.append(latency)
+        if stats.latency_ewma is None:
+            stats.latency_ewma = latency
+        else:
+            stats.latency_ewma += self._alpha * (latency - stats.latency_ewma)
+        stats.error_ewma *= 1 - self._alpha
+
+    def record_failure(self, url: str) -> None:
+        stats = self._stats[url]
+        stats.requests += 1
+        stats.failures += 1
+        stats.error_ewma += self._alpha * (1.0 - stats.error_ewma)
+        stats.last_failure = time.monotonic()
+
+    def snapshot(self) -> list[dict[str, Any]]:
+        """Статистика узлов для логов и админ-метрик."""
+
+        return [stats.as_dict() for stats in self._stats.values()]
+
+    def _is_healthy(self, stats: EndpointStats, now: float) -> bool:
+        if stats.error_ewma < self._max_error_rate:
+            return True
+        return now - stats.last_failure >= self._recovery_sec
+
+    @staticmethod
+    def _score(stats: EndpointStats) -> float:
+        # Узлы без замеров пробуем первыми, чтобы быстро собрать статистику.
+        latency = stats.latency_ewma or 0.0
+        return latency * (1.0 + 4.0 * stats.error_ewma)
+
+
+__all__ = ["EndpointStats", "RpcEndpointPool"]
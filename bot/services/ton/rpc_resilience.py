@@ -0,0 +1,134 @@
+"""Circuit breaker и бюджет повторов для RPC узлов TON.
+
+CircuitBreaker отключает узел после серии сбоев и через ``reset_timeout``
+пропускает один пробный запрос (half-open). RetryPolicy решает, можно ли
+повторить вызов: экспоненциальная задержка с полным jitter, общий бюджет
+повторов (доля от числа запросов) и дедлайн вызывающего кода.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from enum import Enum
+from typing import Any
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Автомат closed → open → half-open для одного RPC узла."""
+
+    def __init__(self, *, failure_threshold: int = 5, reset_timeout: float = 10.0) -> None:
+        self._failure_threshold = max(failure_threshold, 1)
+        self._reset_timeout = reset_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.trips = 0
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state is CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self._reset_timeout
+        ):
+            return CircuitState.HALF_OPEN
+        return self._state
+
+    def available(self) -> bool:
+        """Можно ли сейчас отправить запрос на узел (без побочных эффектов)."""
+
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        return state is CircuitState.HALF_OPEN and not self._probing
+
+    def on_attempt(self) -> None:
+        """Фиксирует начало запроса; в half-open это пробный запрос."""
+
+        if self.state is CircuitState.HALF_OPEN:
+            self._state = CircuitState.HALF_OPEN
+            self._probing = True
+
+    def on_success(self) -> None:
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def on_failure(self) -> None:
+        self._probing = False
+        if self._state is CircuitState.HALF_OPEN:
+            self._open()
+            return
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._open()
+
+    def on_cancel(self) -> None:
+        """Запрос отменён (hedge/дедлайн) — пробу можно повторить."""
+
+        self._probing = False
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"state": self.state.value, "failures": self._failures, "trips": self.trips}
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+        self._failures = 0
+        self.trips += 1
+
+
+class RetryPolicy:
+    """Повторы с jitter в пределах бюджета и дедлайна."""
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = 2,
+        base_delay: float = 0.025,
+        max_delay: float = 0.25,
+        budget_ratio: float = 0.2,
+        budget_cap: float = 10.0,
+        min_remaining: float = 0.1,
+    ) -> None:
+        self._max_retries = max(max_retries, 0)
+        self._base_delay = base_delay
+        self._max_delay = max_delay
+        self._budget_ratio = budget_ratio
+        self._budget_cap = budget_cap
+        self._budget = budget_cap
+        self._min_remaining = min_remaining
+        self.retries = 0
+        self.denied = 0
+
+    def on_request(self) -> None:
+        """Каждый первичный запрос пополняет бюджет повторов на budget_ratio."""
+
+        self._budget = min(self._budget_cap, self._budget + self._budget_ratio)
+
+    def next_delay(self, attempt: int, deadline: float | None) -> float | None:
+        """Задержка перед повтором номер ``attempt + 1`` или None, если повтор запрещён."""
+
+        if attempt >= self._max_retries or self._budget < 1:
+            self.denied += 1
+            return None
+        delay = random.uniform(0, min(self._max_delay, self._base_delay * 2**attempt))
+        if deadline is not None and time.monotonic() + delay + self._min_remaining > deadline:
+            self.denied += 1
+            return None
+        self._budget -= 1
+        self.retries += 1
+        return delay
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"retries": self.retries, "denied": self.denied, "budget": round(self._budget, 2)}
+
+
+__all__ = ["CircuitBreaker", "CircuitState", "RetryPolicy"]
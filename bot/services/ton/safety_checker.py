@@ -2,20 +2,47 @@
 
 Проверяет jetton на honeypot, владельцев, ликвидность и активность смарт-кошельков.
 Цель — выдавать вердикт < 600 мс и отбрасывать токсичные токены до попадания в Gem Hunter.
+Задержки каждой стадии (кеш, проверки графа, скоринг, итог) пишутся в гистограммы
+``bot.utils.latency`` — см. админскую команду /stats.
 """
 
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
+import functools
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Awaitable, Callable
 
 from loguru import logger
 
 from config.settings import get_settings
 from bot.utils.cache import get_cache
-from .ton_direct import TonDirectClient, get_ton_client
+from bot.utils.latency import get_latency_metrics
+from bot.utils.singleflight import SingleFlight
+from bot.utils.ton_address import canonical_address
+from .blacklist import BlacklistHit, get_blacklist
+from .check_graph import CheckContext, CheckFunc, CheckGraph, SafetyCheck, ScoreAdjustment
+from .code_verdicts import CodeVerdict, CodeVerdictMemo, get_code_verdicts
+from .simulation_pool import get_simulation_pool
+from .smart_money import SmartMoneyMatch, get_smart_money_registry
+from .ton_direct import RpcPriority, TonDirectClient, TonDirectError, get_ton_client
+
+_BUILTIN_CHECKS = frozenset(
+    {"jetton_data", "honeypot", "liquidity", "volume", "smart_money", "blacklist"}
+)
+
+# Запас на сборку провизорных отчётов после общего дедлайна check_jettons.
+_BATCH_GRACE_SEC = 0.05
+
+# Без этих проверок токен не может считаться безопасным, даже провизорно.
+_GATING_CHECKS = ("jetton_data", "honeypot", "blacklist")
+
+# Поля события, по которым кеш get-методов судит о состоянии контракта.
+_STATE_TOKEN_FIELDS = ("tx_lt", "lt", "seqno")
 
 
 @dataclass(slots=True)
@@ -31,6 +58,36 @@ class SafetyReport:
     lp_burned: bool
     is_new: bool
     owner: str | None
+    failed_checks: tuple[str, ...] = ()
+    smart_money_weight: float = 0.0
+    pending_checks: tuple[str, ...] = ()
+    # Результаты проверок плагинов: имя проверки → значение.
+    extra: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def is_provisional(self) -> bool:
+        """Отчёт собран к дедлайну, часть проверок ещё идёт в фоне."""
+
+        return bool(self.pending_checks)
+
+    @property
+    def verdict_class(self) -> str:
+        """Класс вердикта для TTL кеша: blacklisted / degraded / safe / unsafe."""
+
+        if self.score <= 0:
+            return "blacklisted"
+        if self.failed_checks or self.pending_checks:
+            return "degraded"
+        return "safe" if self.is_safe else "unsafe"
+
+
+@dataclass(slots=True)
+class CachedReport:
+    """Отчёт в кеше: до ``refresh_at`` свежий, до ``fresh_until`` — обновляется заранее."""
+
+    report: SafetyReport
+    fresh_until: float
+    refresh_at: float
 
 
 class SafetyChecker:
@@ -40,101 +97,593 @@ class SafetyChecker:
         cfg = get_settings()
         self._security = cfg.ton_security
         self._cache = get_cache()
-        self._cache_ttl = cfg.cache.ttl_seconds
+        self._ttls = {
+            "blacklisted": self._security.report_ttl_blacklisted_sec,
+            "unsafe": self._security.report_ttl_unsafe_sec,
+            "safe": self._security.report_ttl_safe_sec or cfg.cache.ttl_seconds,
+            "degraded": self._security.report_ttl_degraded_sec,
+        }
+        self._stale_ttl = self._security.report_stale_sec
         self._ton_client: TonDirectClient | None = None
         self._timeout = self._security.max_safety_latency_ms / 1000
+        self._finish_timeout = self._security.report_finish_timeout_sec
+        self._flight: SingleFlight[SafetyReport] = SingleFlight("safety")
+        self._refresh_tasks: set[asyncio.Task[SafetyReport]] = set()
+        self._finishing: dict[str, asyncio.Task[None]] = {}
+        self._update_callbacks: set[Callable[[str, SafetyReport], Awaitable[None]]] = set()
+        self._smart_money = get_smart_money_registry()
+        self._blacklist = get_blacklist()
+        self._simulations = get_simulation_pool()
+        self._code_verdicts: CodeVerdictMemo | None = (
+            get_code_verdicts() if self._security.code_verdict_memo else None
+        )
+        self._metrics = get_latency_metrics()
+        self._graph = CheckGraph(self._metrics)
+        self._graph.add(SafetyCheck("jetton_data", self._fetch_jetton_data, fallback={}))
+        self._graph.add(SafetyCheck("honeypot", self._simulate_honeypot, fallback=False))
+        self._graph.add(
+            SafetyCheck("liquidity", self._calc_liquidity, requires=("jetton_data",), fallback=0.0)
+        )
+        self._graph.add(SafetyCheck("volume", self._calc_volume, fallback=0.0))
+        self._graph.add(
+            SafetyCheck("smart_money", self._check_smart_money, fallback=SmartMoneyMatch())
+        )
+        self._graph.add(
+            SafetyCheck(
+                "blacklist",
+                self._check_blacklist,
+                requires=("jetton_data",),
+                fallback=BlacklistHit(),
+            )
+        )
+        self.stale_served = 0
+        self._class_hits: dict[str, int] = defaultdict(int)
+        self._class_stored: dict[str, int] = defaultdict(int)
 
     async def check_jetton(
         self,
         address: str,
         raw_event: dict[str, Any] | None = None,
+        *,
+        priority: RpcPriority = RpcPriority.SCANNER,
     ) -> SafetyReport:
-        """Возвращает SafetyReport из кеша либо выполняет быструю проверку."""
-
-        cached = await self._cache.get(address)
+        """Возвращает SafetyReport из кеша либо выполняет быструю проверку.
+
+        ``priority`` — класс RPC трафика (пользовательский /check важнее сканера).
+        Параллельные вызовы по одному адресу ждут один общий прогон пайплайна;
+        устаревший отчёт (в окне ``report_stale_sec``) отдаётся сразу, а
+        обновление идёт в фоне. TTL зависит от класса вердикта (см.
+        ``SafetyReport.verdict_class``); degraded отчёты обновляются заранее.
+
+        Если к ``max_safety_latency_ms`` не все проверки завершились, возвращается
+        провизорный отчёт (``pending_checks``), а итоговый публикуется подписчикам
+        ``subscribe_updates`` после фонового завершения.
+        """
+
+        started = time.perf_counter()
+        key = canonical_address(address)
+        with self._metrics.measure("cache"):
+            cached: CachedReport | None = await self._cache.get(self._cache_key(key))
         if cached:
-            return cached
+            report = self._serve_cached(key, address, raw_event or {}, cached)
+        else:
+            report = await self._flight.do(
+                key, lambda: self._check_and_store(key, address, raw_event or {}, priority)
+            )
+        self._metrics.observe("total", time.perf_counter() - started)
+        if report.is_provisional:
+            self._metrics.timeout("total")
+        return report
+
+    async def check_jettons(
+        self,
+        addresses: list[str],
+        raw_events: dict[str, dict[str, Any]] | None = None,
+        *,
+        priority: RpcPriority = RpcPriority.SCANNER,
+        timeout: float | None = None,
+    ) -> dict[str, SafetyReport]:
+        """Пакетная проверка многих токенов под общим дедлайном.
+
+        Кеш читается одним multi-get, getJettonData для промахов уходит
+        batch-запросами, а графы проверок стартуют сразу, не дожидаясь batch;
+        упавший или не успевший batch заменяется запросом по адресу. ``timeout`` по
+        умолчанию — ``max_safety_latency_ms``. Медленные проверки дают
+        провизорные отчёты, как в check_jetton; адреса, упавшие с ошибкой или
+        не получившие даже провизорный отчёт, в ответе отсутствуют.
+        """
+
+        raw_events = raw_events or {}
+        timeout = self._timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        keys = {address: canonical_address(address) for address in dict.fromkeys(addresses)}
+        with self._metrics.measure("cache"):
+            entries = await self._cache.multi_get(
+                [self._cache_key(key) for key in keys.values()]
+            )
+        reports: dict[str, SafetyReport] = {}
+        missing: dict[str, str] = {}
+        for (address, key), cached in zip(keys.items(), entries):
+            if cached:
+                reports[address] = self._serve_cached(
+                    key, address, raw_events.get(address, {}), cached
+                )
+            else:
+                missing[address] = key
+        if not missing:
+            return reports
+
         ton_client = await self._ensure_client()
-        report = await asyncio.wait_for(
-            self._run_pipeline(ton_client, address, raw_event or {}),
-            timeout=self._timeout,
+        # Адреса, которые уже проверяются, присоединятся к своему прогону.
+        to_fetch = [
+            address for address, key in missing.items() if not self._flight.in_flight(key)
+        ]
+        # Под общим дедлайном только batch getJettonData; задачи токенов создаются вне
+        # его, иначе фоновое завершение провизорных отчётов унаследует этот дедлайн.
+        with ton_client.deadline(timeout):
+            batch = asyncio.ensure_future(
+                ton_client.get_jetton_data_many(
+                    to_fetch,
+                    priority=priority,
+                    state_tokens={
+                        address: self._state_token(raw_events.get(address, {}))
+                        for address in to_fetch
+                    },
+                )
+            )
+        batch.add_done_callback(lambda done: done.cancelled() or done.exception())
+        tasks = {
+            asyncio.ensure_future(
+                self._flight.do(
+                    key,
+                    functools.partial(
+                        self._check_from_batch,
+                        batch,
+                        deadline,
+                        key,
+                        address,
+                        raw_events.get(address, {}),
+                        priority,
+                    ),
+                )
+            ): address
+            for address, key in missing.items()
+        }
+        done, late = await asyncio.wait(tasks, timeout=timeout + _BATCH_GRACE_SEC)
+        for task in late:
+            task.cancel()
+            self._metrics.timeout("batch")
+        self._metrics.observe("batch", time.monotonic() - started)
+        for task in done:
+            if task.exception() is not None:
+                logger.debug(
+                    "Пакетная проверка {addr} не удалась: {error}",
+                    addr=tasks[task],
+                    error=repr(task.exception()),
+                )
+                continue
+            reports[tasks[task]] = task.result()
+        if late:
+            logger.debug(
+                "check_jettons: {late} из {total} токенов не уложились в {timeout:.3f}s",
+                late=len(late),
+                total=len(keys),
+                timeout=timeout,
+            )
+        return reports
+
+    async def recheck(
+        self,
+        address: str,
+        raw_event: dict[str, Any] | None = None,
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+        fresh: bool = False,
+    ) -> SafetyReport:
+        """Перепроверка мимо кеша: свежий отчёт кладётся в кеш и публикуется.
+
+        ``fresh`` — ``raw_event`` устарел (событие минта): пул, объём и холдеры
+        берутся из ``get_jetton_state``, а get-методы и симуляция идут мимо
+        кеша по свежему state token. Итоговый отчёт сразу уходит подписчикам
+        ``subscribe_updates``; провизорный будет опубликован после фонового
+        завершения проверок.
+        """
+
+        key = canonical_address(address)
+        raw_event = raw_event or {}
+        state_token = None
+        if fresh:
+            raw_event, state_token = await self._fresh_event(address, raw_event, priority)
+        report = await self._flight.do(
+            key,
+            lambda: self._check_and_store(
+                key, address, raw_event, priority, state_token=state_token
+            ),
+        )
+        if not report.is_provisional:
+            await self._publish(address, report)
+        return report
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики объединения проверок и stale-while-revalidate."""
+
+        return {
+            **self._flight.stats(),
+            "stale_served": self.stale_served,
+            "refreshing": len(self._refresh_tasks),
+            "finishing": len(self._finishing),
+            "checks": self._graph.stats(),
+            "simulations": self._simulations.stats(),
+            "by_verdict": {
+                verdict: {
+                    "ttl_sec": ttl,
+                    "hits": self._class_hits[verdict],
+                    "stored": self._class_stored[verdict],
+                    "hit_rate": self._hit_rate(verdict),
+                }
+                for verdict, ttl in self._ttls.items()
+            },
+        }
+
+    def subscribe_updates(self, callback: Callable[[str, SafetyReport], Awaitable[None]]) -> None:
+        """Подписка на итоговые отчёты, дозревшие после провизорных: callback(адрес, отчёт)."""
+
+        self._update_callbacks.add(callback)
+
+    def finishing(self, address: str) -> asyncio.Task[None] | None:
+        """Фоновая задача, доводящая провизорный отчёт ``address``; None — уже завершена."""
+
+        return self._finishing.get(canonical_address(address))
+
+    def register_check(
+        self,
+        name: str,
+        func: CheckFunc,
+        *,
+        requires: tuple[str, ...] = (),
+        fallback: Any = None,
+    ) -> None:
+        """Добавляет проверку плагина в граф.
+
+        ``func(ctx, deps)`` получает CheckContext и результаты ``requires``
+        (встроенные: jetton_data, honeypot, liquidity, volume, smart_money, blacklist).
+        Результат попадает в ``SafetyReport.extra``; ScoreAdjustment меняет score.
+        """
+
+        self._graph.add(SafetyCheck(name, func, requires=tuple(requires), fallback=fallback))
+        logger.info("SafetyChecker: подключена проверка {name}", name=name)
+
+    def _hit_rate(self, verdict: str) -> float:
+        # Каждая запись в кеш — это промах, закончившийся отчётом данного класса.
+        total = self._class_hits[verdict] + self._class_stored[verdict]
+        return round(self._class_hits[verdict] / total, 3) if total else 0.0
+
+    def _serve_cached(
+        self,
+        key: str,
+        address: str,
+        raw_event: dict[str, Any],
+        cached: CachedReport,
+    ) -> SafetyReport:
+        self._class_hits[cached.report.verdict_class] += 1
+        now = time.time()
+        if now >= cached.fresh_until:
+            self.stale_served += 1
+        if now >= cached.refresh_at:
+            self._refresh_in_background(key, address, raw_event)
+        return cached.report
+
+    async def _check_and_store(
+        self,
+        key: str,
+        address: str,
+        raw_event: dict[str, Any],
+        priority: RpcPriority,
+        *,
+        jetton_data: dict[str, Any] | asyncio.Future[dict[str, Any]] | None = None,
+        timeout: float | None = None,
+        state_token: str | None = None,
+    ) -> SafetyReport:
+        """Запускает проверки и ждёт их до дедлайна; хвост доделывается в фоне.
+
+        ``jetton_data`` — готовые данные или future (из batch); упавшая future
+        заменяется обычным запросом getJettonData.
+        """
+
+        ton_client = await self._ensure_client()
+        # RPC дедлайн — на полное завершение, вызывающий ждёт только ``timeout``.
+        ctx = CheckContext(
+            ton_client=ton_client,
+            address=address,
+            raw_event=raw_event,
+            priority=priority,
+            state_token=state_token or self._state_token(raw_event),
         )
-        await self._cache.set(address, report, ttl=self._cache_ttl)
+        with ton_client.deadline(self._finish_timeout):
+            checks = self._graph.start(
+                ctx, {"jetton_data": jetton_data} if jetton_data is not None else None
+            )
+        await asyncio.wait(checks.values(), timeout=self._timeout if timeout is None else timeout)
+        with self._metrics.measure("scoring"):
+            report = self._build_report(raw_event, checks)
+        for name in report.pending_checks:
+            self._metrics.timeout(name)
+        await self._store(key, report)
+        if report.pending_checks:
+            logger.debug(
+                "SafetyReport {addr} провизорный, ждём: {pending}",
+                addr=address,
+                pending=", ".join(report.pending_checks),
+            )
+            task = asyncio.create_task(self._finish_checks(key, address, raw_event, checks))
+            self._finishing[key] = task
+            task.add_done_callback(functools.partial(self._on_finish_done, key))
         return report
 
-    async def _run_pipeline(
+    async def _fresh_event(
+        self,
+        address: str,
+        raw_event: dict[str, Any],
+        priority: RpcPriority,
+    ) -> tuple[dict[str, Any], str]:
+        """Событие с текущим состоянием токена и state token для обхода кеша."""
+
+        event = {
+            name: value for name, value in raw_event.items() if name not in _STATE_TOKEN_FIELDS
+        }
+        ton_client = await self._ensure_client()
+        try:
+            event.update(await ton_client.get_jetton_state(address, priority=priority))
+        except TonDirectError as exc:
+            # Рыночные поля остаются прежними, но get-методы всё равно спросим заново.
+            logger.debug(
+                "Состояние {addr} для перепроверки не получено: {error}", addr=address, error=exc
+            )
+        token = self._state_token(event) or f"recheck:{time.time_ns()}"
+        return event, token
+
+    async def _check_from_batch(
         self,
-        ton_client: TonDirectClient,
+        batch: asyncio.Future[dict[str, dict[str, Any] | Exception]],
+        deadline: float,
+        key: str,
         address: str,
         raw_event: dict[str, Any],
+        priority: RpcPriority,
     ) -> SafetyReport:
-        """Основные проверки выполняются параллельно."""
-
-        jetton_data = await ton_client.get_jetton_data(address)
-        results = await asyncio.gather(
-            self._simulate_honeypot(ton_client, address, raw_event),
-            self._calc_liquidity(jetton_data, raw_event),
-            self._calc_volume(raw_event),
-            self._check_smart_money(raw_event),
-            return_exceptions=True,
-        )
-        honeypot_allowed = self._unwrap(results[0], True)
-        liquidity = self._unwrap(results[1], 0.0)
-        volume = self._unwrap(results[2], 0.0)
-        smart_money_hits = self._unwrap(results[3], 0)
-        owner = jetton_data.get("admin_address") or raw_event.get("owner")
+        # Граф стартует сразу: honeypot, объём и smart money не ждут batch.
+        return await self._check_and_store(
+            key,
+            address,
+            raw_event,
+            priority,
+            jetton_data=asyncio.ensure_future(self._batch_item(batch, address)),
+            timeout=max(deadline - time.monotonic(), 0.0),
+        )
+
+    @staticmethod
+    async def _batch_item(
+        batch: asyncio.Future[dict[str, dict[str, Any] | Exception]],
+        address: str,
+    ) -> dict[str, Any]:
+        """getJettonData адреса из batch; ошибка — повод запросить адрес отдельно."""
+
+        # Адреса нет в batch, если он уже проверялся при старте batch — запросим сами.
+        jetton_data = (await asyncio.shield(batch)).get(address)
+        if jetton_data is None:
+            raise KeyError(address)
+        if isinstance(jetton_data, Exception):
+            raise jetton_data
+        return jetton_data
+
+    async def _finish_checks(
+        self,
+        key: str,
+        address: str,
+        raw_event: dict[str, Any],
+        checks: dict[str, asyncio.Future[Any]],
+    ) -> None:
+        """Доводит провизорный отчёт до итогового, кладёт в кеш и публикует."""
+
+        _, late = await asyncio.wait(checks.values(), timeout=self._finish_timeout)
+        for task in late:
+            task.cancel()
+        if late:
+            await asyncio.wait(late)
+        with self._metrics.measure("scoring"):
+            report = self._build_report(raw_event, checks)
+        await self._store(key, report)
+        await self._publish(address, report)
+
+    def _on_finish_done(self, key: str, task: asyncio.Task[None]) -> None:
+        if self._finishing.get(key) is task:
+            del self._finishing[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(
+                "Фоновое завершение SafetyReport не удалось: {error}",
+                error=repr(task.exception()),
+            )
+
+    async def _publish(self, address: str, report: SafetyReport) -> None:
+        await asyncio.gather(
+            *(self._safe_publish(callback, address, report) for callback in self._update_callbacks)
+        )
+
+    async def _safe_publish(
+        self,
+        callback: Callable[[str, SafetyReport], Awaitable[None]],
+        address: str,
+        report: SafetyReport,
+    ) -> None:
+        try:
+            await callback(address, report)
+        except Exception as exc:  # noqa: BLE001
+            logger.exception("Подписчик обновлений SafetyReport упал: {error}", error=exc)
+
+    async def _store(self, key: str, report: SafetyReport) -> None:
+        verdict = report.verdict_class
+        ttl = self._ttls[verdict]
+        now = time.time()
+        refresh_in = ttl
+        if verdict == "degraded":
+            refresh_in = ttl * self._security.report_refresh_ahead_ratio
+        self._class_stored[verdict] += 1
+        await self._cache.set(
+            self._cache_key(key),
+            CachedReport(report=report, fresh_until=now + ttl, refresh_at=now + refresh_in),
+            ttl=ttl + self._stale_ttl,
+        )
+
+    def _refresh_in_background(
+        self,
+        key: str,
+        address: str,
+        raw_event: dict[str, Any],
+    ) -> None:
+        """Фоновое обновление отчёта (не более одного на адрес)."""
+
+        if self._flight.in_flight(key) or key in self._finishing:
+            return
+        task = asyncio.create_task(
+            self._flight.do(
+                key,
+                lambda: self._check_and_store(key, address, raw_event, RpcPriority.BACKGROUND),
+            )
+        )
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._on_refresh_done)
+
+    def _on_refresh_done(self, task: asyncio.Task[SafetyReport]) -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug(
+                "Фоновое обновление SafetyReport не удалось: {error}",
+                error=repr(task.exception()),
+            )
+
+    @staticmethod
+    def _cache_key(key: str) -> str:
+        return f"safety:{key}"
+
+    def _build_report(
+        self,
+        raw_event: dict[str, Any],
+        checks: dict[str, asyncio.Future[Any]],
+    ) -> SafetyReport:
+        """Собирает отчёт из завершённых проверок; незавершённые попадают в pending."""
+
+        pending = tuple(name for name, task in checks.items() if not task.done())
+        failed = tuple(
+            name
+            for name, task in checks.items()
+            if task.done() and (task.cancelled() or task.exception() is not None)
+        )
+
+        def result(name: str) -> Any:
+            task = checks[name]
+            fallback = self._graph.fallback(name)
+            if not task.done() or task.cancelled():
+                return fallback
+            return self._unwrap(task.exception() or task.result(), fallback)
+
+        # Не завершённые или упавшие проверки владельца, honeypot и чёрного списка
+        # не дают вердикта «безопасно»: их fallback только для скоринга.
+        unverified = tuple(name for name in _GATING_CHECKS if name in pending or name in failed)
+        ownership_known = "jetton_data" not in unverified
+        jetton_data = result("jetton_data")
+        # Ошибка или незавершённая симуляция — не разрешение: fail-closed.
+        honeypot_allowed = result("honeypot")
+        liquidity = result("liquidity")
+        volume = result("volume")
+        smart_money: SmartMoneyMatch = result("smart_money")
+        owner = self._owner(jetton_data, raw_event)
         lp_burned = bool(
             jetton_data.get("lp_status") == "burned"
             or raw_event.get("lp_burned")
-            or not owner
+            or (ownership_known and not owner)
         )
         is_new = self._is_new_token(raw_event)
         score, reasons = self._score_token(
             honeypot_allowed=honeypot_allowed,
+            ownership_known=ownership_known,
             owner=owner,
+            blacklisted=result("blacklist"),
             liquidity=liquidity,
             volume=volume,
-            smart_money_hits=smart_money_hits,
+            smart_money_weight=smart_money.weight,
             lp_burned=lp_burned,
             is_new=is_new,
         )
+        extra = {name: result(name) for name in checks if name not in _BUILTIN_CHECKS}
+        if score > 0:
+            for value in extra.values():
+                if isinstance(value, ScoreAdjustment):
+                    score = max(0.0, min(score + value.delta, 100.0))
+                    if value.reason:
+                        reasons.append(value.reason)
+        if pending:
+            reasons.append(f"проверки не завершены: {', '.join(pending)}")
         return SafetyReport(
-            is_safe=score >= 70 and honeypot_allowed,
+            is_safe=score >= 70 and honeypot_allowed and not unverified,
             score=score,
             reasons=tuple(reasons),
             liquidity_usd=liquidity,
             volume_5m_usd=volume,
-            smart_money_hits=smart_money_hits,
+            smart_money_hits=smart_money.hits,
             lp_burned=lp_burned,
             is_new=is_new,
             owner=owner,
+            failed_checks=failed,
+            smart_money_weight=smart_money.weight,
+            pending_checks=pending,
+            extra=extra,
         )
 
-    async def _simulate_honeypot(
-        self,
-        ton_client: TonDirectClient,
-        address: str,
-        raw_event: dict[str, Any],
-    ) -> bool:
-        """Проверка honeypot через simulateMessageProcess."""
+    async def _fetch_jetton_data(self, ctx: CheckContext, deps: dict[str, Any]) -> dict[str, Any]:
+        """Данные JettonMinter (владелец, статус LP)."""
+
+        return await ctx.ton_client.get_jetton_data(
+            ctx.address,
+            priority=ctx.priority,
+            state_token=ctx.state_token,
+        )
+
+    async def _simulate_honeypot(self, ctx: CheckContext, deps: dict[str, Any]) -> bool:
+        """Проверка honeypot: вердикт шаблона по code hash либо simulateMessageProcess."""
 
-        boc = raw_event.get("simulate_boc")
+        code_hash = ctx.raw_event.get("code_hash") if self._code_verdicts is not None else None
+        boc = ctx.raw_event.get("simulate_boc")
         if not boc:
-            return True
-        try:
-            result = await ton_client.simulate_tx(boc, address)
-        except Exception as exc:  # noqa: BLE001
-            logger.debug("simulate_tx {addr} упал: {error}", addr=address, error=exc)
-            return False
+            verdict = self._code_verdicts.get(code_hash) if code_hash else None
+            return verdict.sell_allowed if verdict is not None else True
+        if not code_hash:
+            return await self._simulate(ctx, boc)
+        verdict = await self._code_verdicts.resolve(
+            code_hash, ctx.address, functools.partial(self._analyze_template, ctx, boc)
+        )
+        return verdict.sell_allowed
+
+    async def _analyze_template(self, ctx: CheckContext, boc: str) -> CodeVerdict:
+        """Симуляция токена как образца шаблона (новый шаблон или выборочная перепроверка)."""
+
+        return CodeVerdict(sell_allowed=await self._simulate(ctx, boc))
+
+    async def _simulate(self, ctx: CheckContext, boc: str) -> bool:
+        result = await self._simulations.simulate(
+            ctx.ton_client,
+            boc,
+            ctx.address,
+            priority=ctx.priority,
+            state_token=ctx.state_token,
+        )
         return bool(result.get("success", True))
 
-    async def _calc_liquidity(
-        self,
-        jetton_data: dict[str, Any],
-        raw_event: dict[str, Any],
-    ) -> float:
-        """Оценка ликвидности в USD."""
+    async def _calc_liquidity(self, ctx: CheckContext, deps: dict[str, Any]) -> float:
+        """Оценка ликвидности в USD (без jetton_data — только по событию)."""
 
+        jetton_data = deps["jetton_data"]
+        raw_event = ctx.raw_event
         liquidity = (
             jetton_data.get("liquidity_usd")
             or raw_event.get("liquidity_usd")
@@ -145,21 +694,45 @@ class SafetyChecker:
         except (TypeError, ValueError):
             return 0.0
 
-    async def _calc_volume(self, raw_event: dict[str, Any]) -> float:
+    async def _calc_volume(self, ctx: CheckContext, deps: dict[str, Any]) -> float:
         """Оборот за последние 5 минут."""
 
-        volume = raw_event.get("volume_5m_usd") or raw_event.get("volume_usd")
+        volume = ctx.raw_event.get("volume_5m_usd") or ctx.raw_event.get("volume_usd")
         try:
             return float(volume or 0.0)
         except (TypeError, ValueError):
             return 0.0
 
-    async def _check_smart_money(self, raw_event: dict[str, Any]) -> int:
-        """Количество входов смарт-кошельков в пул."""
+    async def _check_smart_money(
+        self,
+        ctx: CheckContext,
+        deps: dict[str, Any],
+    ) -> SmartMoneyMatch:
+        """Входы смарт-кошельков в пул: количество и суммарный вес по реестру."""
+
+        raw_event = ctx.raw_event
+        return self._smart_money.match(
+            itertools.chain(raw_event.get("holders", []), raw_event.get("buyers", []))
+        )
+
+    async def _check_blacklist(self, ctx: CheckContext, deps: dict[str, Any]) -> BlacklistHit:
+        """Владелец и code hash контракта против чёрного списка."""
+
+        return await self._blacklist.check(
+            self._owner(deps["jetton_data"], ctx.raw_event),
+            ctx.raw_event.get("code_hash"),
+        )
+
+    @staticmethod
+    def _owner(jetton_data: dict[str, Any], raw_event: dict[str, Any]) -> str | None:
+        return jetton_data.get("admin_address") or raw_event.get("owner")
+
+    @staticmethod
+    def _state_token(raw_event: dict[str, Any]) -> str | None:
+        """lt последней транзакции минтера (или seqno блока), если событие его несёт."""
 
-        addresses = set(raw_event.get("holders", [])) | set(raw_event.get("buyers", []))
-        trusted = set(self._security.trusted_smart_money)
-        return len(addresses & trusted)
+        token = raw_event.get("tx_lt") or raw_event.get("lt") or raw_event.get("seqno")
+        return str(token) if token else None
 
     def _is_new_token(self, raw_event: dict[str, Any]) -> bool:
         """Jetton считается новым, если ему < 2 часов."""
@@ -174,24 +747,33 @@ class SafetyChecker:
         self,
         *,
         honeypot_allowed: bool,
+        ownership_known: bool,
         owner: str | None,
+        blacklisted: BlacklistHit,
         liquidity: float,
         volume: float,
-        smart_money_hits: int,
+        smart_money_weight: float,
         lp_burned: bool,
         is_new: bool,
     ) -> tuple[float, list[str]]:
-        """Формула скоринга (0-100)."""
+        """Формула скоринга (0-100).
+
+        Без данных минтера (``ownership_known=False``) бонусы за отсутствие
+        владельца и burn LP не начисляются.
+        """
 
         score = 60.0
         reasons: list[str] = []
         if not honeypot_allowed:
             score -= 40
             reasons.append("simulate_tx заблокировал транзакцию")
-        if owner and owner in self._security.blacklist_addresses:
-            reasons.append("адрес владельца в чёрном списке")
+        if blacklisted:
+            if blacklisted.owner:
+                reasons.append("адрес владельца в чёрном списке")
+            if blacklisted.code_hash:
+                reasons.append("код контракта в чёрном списке")
             return 0.0, reasons
-        if not owner:
+        if ownership_known and not owner:
             score += 8
             reasons.append("адрес владельца не найден — возможный burn")
         if liquidity < self._security.min_liquidity_usd:
@@ -203,8 +785,8 @@ class SafetyChecker:
             score -= 5
         else:
             score += min(volume / 2_000, 15)
-        score += smart_money_hits * 4
-        if lp_burned:
+        score += smart_money_weight * 4
+        if lp_burned and ownership_known:
             score += 5
             reasons.append("LP burned")
         if is_new:
@@ -222,11 +804,11 @@ class SafetyChecker:
         if isinstance(value, Exception):
             logger.debug(
                 "SafetyChecker подзадача завершилась ошибкой: {error}",
-                error=value,
+                error=repr(value),
             )
             return fallback
         return value
 
 
-__all__ = ["SafetyChecker", "SafetyReport"]
+__all__ = ["CachedReport", "SafetyChecker", "SafetyReport", "ScoreAdjustment"]
 
@@ -0,0 +1,240 @@
+"""Пул honeypot симуляций (simulateMessageProcess) с лимитом параллелизма.
+
+Всплеск новых минтеров не превращается в сотни одновременных симуляций:
+одновременно выполняется не больше ``simulation_concurrency``, остальные ждут
+в очереди с приоритетом. Токены, которые пользователь сейчас смотрит
+(карточка сигнала, подписка, /check), обслуживаются раньше сканера.
+Одинаковые BOC для одного адреса симулируются один раз, а задания, которые
+все ожидающие бросили до старта (дедлайн проверки), не запускаются вовсе.
+Ожидание в очереди и время самой симуляции учитываются раздельно.
+Общая симуляция идёт вне контекста отправителей, каждый ожидающий ждёт её
+результат в пределах своего дедлайна RPC.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from bot.utils.ton_address import canonical_address
+from config.settings import get_settings
+from .ton_direct import RpcPriority, TonDirectClient, TonRpcDeadlineExceeded
+
+
+@dataclass(slots=True, eq=False)
+class _SimulationJob:
+    key: tuple[str, str]
+    ton_client: TonDirectClient
+    boc: str
+    address: str
+    priority: RpcPriority
+    state_token: str | None
+    future: asyncio.Future[dict[str, Any]]
+    queued_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class _Timing:
+    count: int = 0
+    total: float = 0.0
+    peak: float = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.peak = max(self.peak, value)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.peak * 1000, 2),
+        }
+
+
+class SimulationPool:
+    """Очередь симуляций с приоритетом и общим результатом для одинаковых BOC."""
+
+    def __init__(self, concurrency: int | None = None, view_ttl: float | None = None) -> None:
+        security = get_settings().ton_security
+        self._concurrency = max(concurrency or security.simulation_concurrency, 1)
+        self._view_ttl = security.simulation_view_ttl_sec if view_ttl is None else view_ttl
+        self._heap: list[tuple[int, int, _SimulationJob]] = []
+        self._seq = itertools.count()
+        self._jobs: dict[tuple[str, str], _SimulationJob] = {}
+        self._viewed: dict[str, float] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._running = 0
+        self.submitted = 0
+        self.shared = 0
+        self.abandoned = 0
+        self.failures = 0
+        self._wait = {priority: _Timing() for priority in RpcPriority}
+        self._sim = _Timing()
+
+    def mark_viewed(self, address: str) -> None:
+        """Пользователь смотрит токен: его симуляции поднимаются в очереди."""
+
+        key = canonical_address(address)
+        now = time.monotonic()
+        self._viewed = {token: expires for token, expires in self._viewed.items() if expires > now}
+        self._viewed[key] = now + self._view_ttl
+        for job in list(self._jobs.values()):
+            if job.address == key and job.started_at is None and job.priority > RpcPriority.USER:
+                self._push(job, RpcPriority.USER)
+        self._pump()
+
+    def is_viewed(self, address: str) -> bool:
+        key = canonical_address(address)
+        expires = self._viewed.get(key)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._viewed[key]
+            return False
+        return True
+
+    async def simulate(
+        self,
+        ton_client: TonDirectClient,
+        boc: str,
+        address: str,
+        *,
+        priority: RpcPriority = RpcPriority.SCANNER,
+        state_token: str | None = None,
+    ) -> dict[str, Any]:
+        """Ставит симуляцию в очередь и ждёт результат (общий для одинаковых BOC).
+
+        Ожидание ограничено дедлайном RPC вызывающего кода, сама симуляция — нет.
+        """
+
+        address = canonical_address(address)
+        if self.is_viewed(address):
+            priority = min(priority, RpcPriority.USER)
+        key = (address, boc)
+        job = self._jobs.get(key)
+        if job is None:
+            job = _SimulationJob(
+                key=key,
+                ton_client=ton_client,
+                boc=boc,
+                address=address,
+                priority=priority,
+                state_token=state_token,
+                future=asyncio.get_running_loop().create_future(),
+            )
+            self._jobs[key] = job
+            self.submitted += 1
+            self._push(job, priority)
+        else:
+            self.shared += 1
+            if job.started_at is None and priority < job.priority:
+                self._push(job, priority)
+        deadline = TonDirectClient.current_deadline()
+        job.waiters += 1
+        self._pump()
+        try:
+            if deadline is None:
+                return await asyncio.shield(job.future)
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(job.future), deadline - time.monotonic()
+                )
+            except asyncio.TimeoutError:
+                if job.future.done():
+                    raise
+                raise TonRpcDeadlineExceeded(
+                    f"Симуляция {address}: истёк дедлайн ожидания", deadline=deadline
+                ) from None
+        finally:
+            job.waiters -= 1
+            if job.waiters == 0 and job.started_at is None and not job.future.done():
+                # Никто больше не ждёт — слот под симуляцию не тратим.
+                self.abandoned += 1
+                job.future.cancel()
+                self._jobs.pop(key, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency": self._concurrency,
+            "running": self._running,
+            "queued": sum(1 for job in self._jobs.values() if job.started_at is None),
+            "viewed": len(self._viewed),
+            "submitted": self.submitted,
+            "shared": self.shared,
+            "abandoned": self.abandoned,
+            "failures": self.failures,
+            "wait": {
+                priority.name.lower(): self._wait[priority].as_dict() for priority in RpcPriority
+            },
+            "simulation": self._sim.as_dict(),
+        }
+
+    def _push(self, job: _SimulationJob, priority: RpcPriority) -> None:
+        # Повышение приоритета — новая запись в куче; устаревшие отбрасываются в _pump.
+        job.priority = priority
+        heapq.heappush(self._heap, (int(priority), next(self._seq), job))
+
+    def _pump(self) -> None:
+        while self._running < self._concurrency and self._heap:
+            priority, _, job = heapq.heappop(self._heap)
+            if job.started_at is not None or job.future.done() or priority != job.priority:
+                continue
+            job.started_at = time.monotonic()
+            self._wait[job.priority].add(job.started_at - job.queued_at)
+            self._running += 1
+            # Пустой контекст: дедлайн первого отправителя не обрывает симуляцию для остальных.
+            task = asyncio.create_task(
+                self._run(job), name="honeypot-simulation", context=contextvars.Context()
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, job: _SimulationJob) -> None:
+        try:
+            result = await job.ton_client.simulate_tx(
+                job.boc,
+                job.address,
+                priority=job.priority,
+                state_token=job.state_token,
+            )
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as exc:  # noqa: BLE001
+            self.failures += 1
+            if not job.future.done():
+                job.future.set_exception(exc)
+                # Все ожидающие могли уйти по таймауту — исключение не должно «теряться» в логах.
+                job.future.exception()
+        else:
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            assert job.started_at is not None
+            self._sim.add(time.monotonic() - job.started_at)
+            self._running -= 1
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+            self._pump()
+
+
+_pool: SimulationPool | None = None
+
+
+def get_simulation_pool() -> SimulationPool:
+    """Общий пул симуляций для SafetyChecker и хендлеров."""
+
+    global _pool
+    if _pool is None:
+        _pool = SimulationPool()
+    return _pool
+
+
+__all__ = ["SimulationPool", "get_simulation_pool"]
@@ -0,0 +1,197 @@
+"""Реестр смарт-кошельков HyperSniper.
+
+Кошельки загружаются из файла (``address[,weight[,label]]`` по строке),
+таблицы ``smart_money_wallets`` и списка ``TON_SECURITY__TRUSTED_SMART_MONEY``.
+Индекс хранит 64-битные хеши канонических адресов с весами, поэтому 100k+
+кошельков занимают единицы мегабайт, а пересечение с холдерами/покупателями
+события — одна операция над множествами. Перезагрузка собирает новый индекс
+вне event loop и подменяет его одной ссылкой.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from bot.repositories import load_smart_money_wallets
+from bot.utils.ton_address import canonical_address
+from config.settings import get_settings
+
+
+def wallet_hash(address: str) -> int:
+    """64-битный ключ индекса для адреса в любой форме."""
+
+    digest = hashlib.blake2b(canonical_address(address).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+@dataclass(slots=True, frozen=True)
+class SmartMoneyMatch:
+    """Сколько смарт-кошельков найдено и их суммарный вес."""
+
+    hits: int = 0
+    weight: float = 0.0
+
+
+class SmartMoneyIndex:
+    """Неизменяемый снимок реестра: хеш адреса → вес."""
+
+    __slots__ = ("_weights", "loaded_at", "sources")
+
+    def __init__(self, weights: dict[int, float], sources: dict[str, int]) -> None:
+        self._weights = weights
+        self.loaded_at = time.time()
+        self.sources = sources
+
+    def __len__(self) -> int:
+        return len(self._weights)
+
+    def match(self, wallets: Iterable[str]) -> SmartMoneyMatch:
+        common = self._weights.keys() & {wallet_hash(wallet) for wallet in wallets}
+        return SmartMoneyMatch(
+            hits=len(common),
+            weight=sum(self._weights[key] for key in common),
+        )
+
+    def weight(self, wallet: str) -> float:
+        return self._weights.get(wallet_hash(wallet), 0.0)
+
+
+class SmartMoneyRegistry:
+    """Загружает и периодически перезагружает индекс смарт-кошельков."""
+
+    def __init__(self) -> None:
+        security = get_settings().ton_security
+        self._path = security.smart_money_path
+        self._reload_interval = security.smart_money_reload_sec
+        self._static = list(security.trusted_smart_money)
+        self._session_maker: async_sessionmaker[AsyncSession] | None = None
+        self._index = SmartMoneyIndex(
+            {wallet_hash(address): 1.0 for address in self._static},
+            {"settings": len(self._static)},
+        )
+        self._file_mtime: float | None = None
+        self._reload_task: asyncio.Task[None] | None = None
+        self._reload_lock = asyncio.Lock()
+        self.reloads = 0
+
+    def set_session_maker(self, session_maker: async_sessionmaker[AsyncSession]) -> None:
+        self._session_maker = session_maker
+
+    async def start(self) -> None:
+        """Первичная загрузка и фоновая перезагрузка раз в ``smart_money_reload_sec``."""
+
+        await self.reload()
+        if self._reload_interval > 0 and (self._reload_task is None or self._reload_task.done()):
+            self._reload_task = asyncio.create_task(self._reload_loop(), name="smart-money-reload")
+
+    async def stop(self) -> None:
+        if self._reload_task:
+            self._reload_task.cancel()
+
+    def match(self, wallets: Iterable[str]) -> SmartMoneyMatch:
+        """Пересечение кошельков события с реестром."""
+
+        return self._index.match(wallets)
+
+    def weight(self, wallet: str) -> float:
+        return self._index.weight(wallet)
+
+    async def reload(self) -> None:
+        """Собирает новый индекс из всех источников и атомарно подменяет текущий."""
+
+        async with self._reload_lock:
+            rows: list[tuple[str, float]] = []
+            if self._session_maker is not None:
+                try:
+                    async with self._session_maker() as session:
+                        rows = await load_smart_money_wallets(session)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Smart money: таблица недоступна: {error}", error=exc)
+            mtime = self._current_mtime()
+            index = await asyncio.to_thread(self._build_index, rows)
+            self._index = index
+            self._file_mtime = mtime
+            self.reloads += 1
+        logger.info(
+            "Smart money реестр загружен: {count} кошельков ({sources})",
+            count=len(index),
+            sources=index.sources,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "wallets": len(self._index),
+            "sources": self._index.sources,
+            "loaded_at": self._index.loaded_at,
+            "reloads": self.reloads,
+        }
+
+    async def _reload_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self._reload_interval)
+            # Без БД перечитываем только изменившийся файл.
+            if self._session_maker is None and self._current_mtime() == self._file_mtime:
+                continue
+            try:
+                await self.reload()
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Smart money: перезагрузка не удалась: {error}", error=exc)
+
+    def _current_mtime(self) -> float | None:
+        if self._path is None or not self._path.exists():
+            return None
+        return self._path.stat().st_mtime
+
+    def _build_index(self, rows: list[tuple[str, float]]) -> SmartMoneyIndex:
+        weights: dict[int, float] = {wallet_hash(address): 1.0 for address in self._static}
+        sources = {"settings": len(self._static), "file": 0, "db": len(rows)}
+        if self._path is not None and self._path.exists():
+            for address, weight in self._read_file(self._path):
+                weights[wallet_hash(address)] = weight
+                sources["file"] += 1
+        for address, weight in rows:
+            weights[wallet_hash(address)] = weight
+        return SmartMoneyIndex(weights, sources)
+
+    @staticmethod
+    def _read_file(path: Path) -> Iterable[tuple[str, float]]:
+        with path.open(encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                address, _, rest = line.partition(",")
+                weight = rest.partition(",")[0].strip()
+                try:
+                    yield address.strip(), float(weight) if weight else 1.0
+                except ValueError:
+                    logger.debug("Smart money: пропущена строка {line}", line=line)
+
+
+_registry: SmartMoneyRegistry | None = None
+
+
+def get_smart_money_registry() -> SmartMoneyRegistry:
+    """Общий реестр для SafetyChecker и GemScanner."""
+
+    global _registry
+    if _registry is None:
+        _registry = SmartMoneyRegistry()
+    return _registry
+
+
+__all__ = [
+    "SmartMoneyIndex",
+    "SmartMoneyMatch",
+    "SmartMoneyRegistry",
+    "get_smart_money_registry",
+    "wallet_hash",
+]
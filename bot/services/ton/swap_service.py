@@ -18,8 +18,9 @@ from bot.repositories import (
     update_pnl,
     upsert_rule,
 )
+from bot.utils import codec
 from config.settings import get_settings
-from .ton_direct import TonDirectClient, get_ton_client
+from .ton_direct import RpcPriority, TonDirectClient, get_ton_client
 
 
 @dataclass(slots=True)
@@ -76,7 +77,7 @@ class SwapService:
             amount=amount_ton,
             slippage=slippage_percent,
         )
-        fee = await ton_client.estimate_fee(payload)
+        fee = await ton_client.estimate_fee(payload, priority=RpcPriority.TRADE)
         estimated_receive = amount_ton * 0.97  # грубая оценка
         min_receive = estimated_receive * (1 - slippage_percent / 100)
         return SwapQuote(
@@ -104,7 +105,7 @@ class SwapService:
             amount=amount_jetton,
             slippage=slippage_percent,
         )
-        fee = await ton_client.estimate_fee(payload)
+        fee = await ton_client.estimate_fee(payload, priority=RpcPriority.TRADE)
         estimated_receive = amount_jetton * 0.95
         min_receive = estimated_receive * (1 - slippage_percent / 100)
         return SwapQuote(
@@ -257,7 +258,6 @@ class SwapService:
         """Генерирует payload в base64 (готов к tonsdk)."""
 
         import base64
-        import json
 
         data = {
             "action": kwargs["action"],
@@ -267,7 +267,7 @@ class SwapService:
             "slippage": kwargs["slippage"],
             "referral_payload": self._referral.omniston_payload,
         }
-        return base64.b64encode(json.dumps(data).encode("utf-8")).decode("utf-8")
+        return base64.b64encode(codec.dumps(data)).decode("utf-8")
 
 
 __all__ = ["SwapService", "SwapQuote", "TakeProfitRule"]
@@ -10,21 +10,53 @@ TonDirectClient выполняет две ключевые задачи:
 from __future__ import annotations
 
 import asyncio
-import json
+import itertools
+import random
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
-from typing import Any, Awaitable, Callable, Coroutine
+from typing import Any, Awaitable, Callable, Coroutine, Iterator
 from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 import aiohttp
 from loguru import logger
 
+from bot.utils import codec
+from bot.utils.singleflight import SingleFlight
 from config.settings import get_settings
+from .event_queue import EventIngestQueue, OverflowPolicy
+from .rpc_batch import RpcBatcher
+from .rpc_cache import GetMethodCache
+from .rpc_limiter import PriorityRateLimiter, RpcPriority
+from .rpc_pool import RpcEndpointPool
+from .rpc_resilience import CircuitBreaker, RetryPolicy
+from .transport_replay import TrafficRecorder, TrafficReplayer
+
+# Абсолютный дедлайн (time.monotonic) текущего RPC сценария, см. TonDirectClient.deadline().
+_rpc_deadline: ContextVar[float | None] = ContextVar("ton_rpc_deadline", default=None)
+
+_RETRYABLE_HTTP_STATUSES = frozenset({429, 500, 502, 503, 504})
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
 
 class TonDirectError(RuntimeError):
     """Базовое исключение слоя прямого подключения к TON."""
 
 
+class TonRpcUnavailable(TonDirectError):
+    """Узел недоступен: сеть, таймаут, HTTP 429/5xx или открытый circuit breaker."""
+
+
+class TonRpcDeadlineExceeded(TonDirectError):
+    """Истёк дедлайн вызывающего кода (TonDirectClient.deadline), узел не виноват."""
+
+    def __init__(self, message: str, *, deadline: float | None = None) -> None:
+        super().__init__(message)
+        self.deadline = deadline
+
+
 @dataclass(slots=True)
 class JettonMinterEvent:
     """Событие появления нового JettonMinter."""
@@ -37,92 +69,741 @@ class JettonMinterEvent:
     raw: dict[str, Any]
 
 
+@dataclass(slots=True)
+class WsFeed:
+    """Одна WebSocket подписка и статистика прихода событий по ней."""
+
+    name: str
+    endpoint: str
+    headers: dict[str, str] | None = None
+    connected: bool = False
+    reconnects: int = 0
+    events: int = 0
+    first_arrivals: int = 0
+    late_arrivals: int = 0
+    lag_total_ms: float = 0.0
+    latency_total_ms: float = 0.0
+    latency_samples: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "endpoint": self.endpoint,
+            "connected": self.connected,
+            "reconnects": self.reconnects,
+            "events": self.events,
+            "first_arrivals": self.first_arrivals,
+            "late_arrivals": self.late_arrivals,
+            "avg_lag_behind_first_ms": round(self.lag_total_ms / self.late_arrivals, 1)
+            if self.late_arrivals
+            else 0.0,
+            "avg_event_latency_ms": round(self.latency_total_ms / self.latency_samples, 1)
+            if self.latency_samples
+            else None,
+        }
+
+
 class TonDirectClient:
     """Лёгкий tonsdk-клиент поверх публичных toncenter RPC/WebSocket."""
 
     def __init__(self) -> None:
         settings = get_settings()
         self._rpc_endpoint = str(settings.ton.rpc_endpoint)
-        self._ws_endpoint = str(settings.ton.ws_endpoint)
-        self._ws_headers: dict[str, str] | None = None
-        self._ws_endpoint = self._normalize_ws_endpoint(self._ws_endpoint)
+        self._pool = RpcEndpointPool(
+            [self._rpc_endpoint, *(str(url) for url in settings.ton.rpc_endpoints)]
+        )
+        self._hedge_methods = (
+            frozenset(settings.ton.rpc_hedge_methods) if len(self._pool) > 1 else frozenset()
+        )
+        self._hedge_min_delay = settings.ton.rpc_hedge_min_delay_ms / 1000
+        self._request_timeout = settings.ton.rpc_request_timeout_ms / 1000
+        self._breakers = {
+            url: CircuitBreaker(
+                failure_threshold=settings.ton.rpc_breaker_failure_threshold,
+                reset_timeout=settings.ton.rpc_breaker_reset_sec,
+            )
+            for url in self._pool.urls
+        }
+        self._retry = RetryPolicy(
+            max_retries=settings.ton.rpc_retry_attempts,
+            base_delay=settings.ton.rpc_retry_base_delay_ms / 1000,
+            budget_ratio=settings.ton.rpc_retry_budget_ratio,
+        )
+        self._ws_feeds: list[WsFeed] = []
+        ws_endpoints = dict.fromkeys(
+            [str(settings.ton.ws_endpoint), *(str(url) for url in settings.ton.ws_endpoints)]
+        )
+        for endpoint_idx, raw_endpoint in enumerate(ws_endpoints):
+            endpoint, headers = self._normalize_ws_endpoint(raw_endpoint)
+            for conn_idx in range(settings.ton.ws_connections_per_endpoint):
+                self._ws_feeds.append(
+                    WsFeed(name=f"ws{endpoint_idx}.{conn_idx}", endpoint=endpoint, headers=headers)
+                )
+        self._ws_endpoint = self._ws_feeds[0].endpoint
         self._network = settings.ton.network
         self._use_websocket = settings.ton.use_websocket
         self._session: aiohttp.ClientSession | None = None
-        self._ws_task: asyncio.Task[None] | None = None
+        self._ws_tasks: list[asyncio.Task[None]] = []
         self._callbacks: set[Callable[[JettonMinterEvent], Awaitable[None]]] = set()
-        self._ws_reconnect_delay = 3
+        self._ws_reconnect_delay = settings.ton.ws_reconnect_base_delay_sec
+        self._ws_reconnect_max_delay = settings.ton.ws_reconnect_max_delay_sec
+        self._backfill_method = settings.ton.ws_backfill_method
+        self._backfill_page_size = settings.ton.ws_backfill_page_size
+        self._backfill_attempts = settings.ton.ws_backfill_attempts
+        self._backfill_task: asyncio.Task[None] | None = None
+        self._state_method = settings.ton.jetton_state_method
+        # Курсор последнего доставленного минтера: (unixtime, logical time).
+        self._last_seen_ts = 0
+        self._last_seen_lt = 0
+        # address -> (monotonic время первого прихода, имя фида/источника).
+        self._recent_minters: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._recent_minters_limit = settings.ton.ws_dedup_window
+        self._replayed = 0
+        self._duplicates = 0
+        self._ingest = EventIngestQueue(
+            self._dispatch_event,
+            maxsize=settings.ton.ws_queue_size,
+            workers=settings.ton.ws_workers,
+            policy=OverflowPolicy(settings.ton.ws_overflow_policy),
+            spill_path=settings.ton.ws_spill_path,
+        )
         self._stop_event = asyncio.Event()
+        self._rpc_ids = itertools.count(1)
+        self._transport_mode = settings.ton.transport_mode
+        self._transport_path = settings.ton.transport_path
+        self._replay_speed = settings.ton.replay_speed
+        self._recorder: TrafficRecorder | None = None
+        self._replayer: TrafficReplayer | None = None
+        self._replay_task: asyncio.Task[None] | None = None
+        self._result_cache: GetMethodCache | None = None
+        if settings.ton.rpc_cache_max_entries > 0:
+            self._result_cache = GetMethodCache(
+                max_entries=settings.ton.rpc_cache_max_entries,
+                ttl=settings.ton.rpc_cache_ttl_ms / 1000,
+                token_ttl=settings.ton.rpc_cache_token_ttl_sec,
+            )
+        self._singleflight: SingleFlight[Any] | None = (
+            SingleFlight("ton-rpc") if settings.ton.rpc_singleflight else None
+        )
+        self._limiter: PriorityRateLimiter | None = None
+        if settings.ton.rpc_rate_limit_per_sec > 0:
+            self._limiter = PriorityRateLimiter(
+                settings.ton.rpc_rate_limit_per_sec,
+                settings.ton.rpc_rate_burst,
+            )
+        self._batcher: RpcBatcher | None = None
+        if settings.ton.rpc_batch_enabled:
+            self._batcher = RpcBatcher(
+                self._post_batch,
+                window=settings.ton.rpc_batch_window_ms / 1000,
+                max_size=settings.ton.rpc_batch_max_size,
+            )
+        self._batch_max_size = settings.ton.rpc_batch_max_size
 
     async def start(self) -> None:
         """Инициализирует HTTP session и (опционально) запускает WebSocket поток."""
 
         if self._session is None or self._session.closed:
-            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+            self._session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                json_serialize=codec.dumps_str,
+            )
         
+        if self._transport_mode == "record" and self._recorder is None:
+            self._recorder = TrafficRecorder(self._transport_path)
+            logger.info("TonDirectClient пишет трафик в {path}", path=self._transport_path)
+        if self._transport_mode == "replay":
+            await self._start_replay()
+            return
         if self._use_websocket:
-            if self._ws_task is None or self._ws_task.done():
+            await self._ingest.start()
+            if not self._ws_tasks or all(task.done() for task in self._ws_tasks):
                 self._stop_event.clear()
-                self._ws_task = asyncio.create_task(self._run_ws_loop(), name="ton-ws-loop")
+                self._ws_tasks = [
+                    asyncio.create_task(self._run_ws_loop(feed), name=f"ton-ws-loop-{feed.name}")
+                    for feed in self._ws_feeds
+                ]
             logger.info(
-                "TonDirectClient готов: RPC {rpc}, WS {ws}",
+                "TonDirectClient готов: RPC {rpc} (узлов в пуле: {pool}), WS {ws} (фидов: {feeds})",
                 rpc=self._rpc_endpoint,
+                pool=len(self._pool),
                 ws=self._ws_endpoint,
+                feeds=len(self._ws_feeds),
             )
         else:
             logger.info(
-                "TonDirectClient готов: RPC {rpc}, WebSocket ОТКЛЮЧЁН (используем индексер)",
+                "TonDirectClient готов: RPC {rpc} (узлов в пуле: {pool}), "
+                "WebSocket ОТКЛЮЧЁН (используем индексер)",
                 rpc=self._rpc_endpoint,
+                pool=len(self._pool),
             )
 
     async def close(self) -> None:
         """Чисто останавливает соединения."""
 
         self._stop_event.set()
-        if self._ws_task:
-            self._ws_task.cancel()
+        for task in self._ws_tasks:
+            task.cancel()
+        if self._backfill_task:
+            self._backfill_task.cancel()
+        await self._ingest.stop()
+        if self._replay_task:
+            self._replay_task.cancel()
+        if self._batcher is not None:
+            await self._batcher.close()
+        if self._recorder is not None:
+            await self._recorder.close()
+            self._recorder = None
         if self._session and not self._session.closed:
             await self._session.close()
 
-    async def rpc_call(self, method: str, params: dict[str, Any] | None = None) -> Any:
-        """Выполняет JSON-RPC вызов к toncenter."""
+    async def _start_replay(self) -> None:
+        """Офлайн режим: WS кадры и RPC ответы берутся из записи трафика."""
+
+        if self._replayer is None:
+            self._replayer = TrafficReplayer(self._transport_path, speed=self._replay_speed)
+            self._ws_feeds = []
+        await self._ingest.start()
+        if self._replay_task is None or self._replay_task.done():
+            self._replay_task = asyncio.create_task(
+                self._replayer.play_ws(self._handle_replay_frame),
+                name="ton-replay",
+            )
+        logger.info(
+            "TonDirectClient в режиме replay: {frames} WS кадров из {path}, скорость {speed}",
+            frames=self._replayer.frames_total,
+            path=self._transport_path,
+            speed=self._replay_speed or "max",
+        )
+
+    async def _handle_replay_frame(self, raw: str, feed_name: str) -> None:
+        feed = next((feed for feed in self._ws_feeds if feed.name == feed_name), None)
+        if feed is None:
+            feed = WsFeed(name=feed_name, endpoint="replay", connected=True)
+            self._ws_feeds.append(feed)
+        await self._handle_ws_payload(raw, feed)
+
+    async def wait_replay(self) -> None:
+        """Ждёт, пока запись проиграна и очередь событий обработана."""
+
+        if self._replayer is None:
+            raise TonDirectError("wait_replay доступен только в режиме replay")
+        await self._replayer.finished.wait()
+        await self._ingest.join()
+
+    async def rpc_call(
+        self,
+        method: str,
+        params: dict[str, Any] | None = None,
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> Any:
+        """Выполняет JSON-RPC вызов к toncenter (напрямую или в составе batch).
+
+        Одинаковые параллельные вызовы (method + params + priority) объединяются в
+        один запрос: срочный вызов не встаёт в очередь лимитера фонового. При
+        включённом лимитере каждый HTTP запрос (одиночный или batch) ждёт токен
+        класса ``priority`` — для batch самого срочного из его вызовов.
+        """
 
         if self._session is None:
             raise TonDirectError("HTTP-сессия не инициализирована, вызовите start()")
-        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
-        async with self._session.post(self._rpc_endpoint, json=payload) as resp:
-            if resp.status >= 400:
-                text = await resp.text()
-                raise TonDirectError(f"RPC {method} завершился с HTTP {resp.status}: {text}")
-            data = await resp.json()
+        if self._singleflight is None:
+            return await self._rpc_call(method, params, priority)
+        key = (method, codec.dumps_str(dict(sorted((params or {}).items()))), priority)
+        try:
+            return await self._singleflight.do(
+                key, lambda: self._rpc_call(method, params, priority)
+            )
+        except TonRpcDeadlineExceeded as exc:
+            # Общий вызов ограничен дедлайном ведущего; с более поздним своим — повторяем сами.
+            own = _rpc_deadline.get()
+            if exc.deadline is None or (own is not None and own <= exc.deadline):
+                raise
+            if own is not None and own <= time.monotonic():
+                raise
+            return await self._rpc_call(method, params, priority)
+
+    async def _rpc_call(
+        self,
+        method: str,
+        params: dict[str, Any] | None,
+        priority: RpcPriority,
+    ) -> Any:
+        if self._replayer is not None:
+            data = self._replayer.rpc_response(method, params)
+            if data is None:
+                raise TonDirectError(f"RPC {method}: ответ отсутствует в записи трафика")
             if "error" in data:
                 raise TonDirectError(f"RPC ошибка {method}: {data['error']}")
             return data.get("result")
+        self._retry.on_request()
+        attempt = 0
+        while True:
+            payload = {
+                "jsonrpc": "2.0",
+                "id": next(self._rpc_ids),
+                "method": method,
+                "params": params or {},
+            }
+            try:
+                if self._batcher is not None:
+                    data = await self._batcher.submit(payload, priority)
+                else:
+                    data = await self._post(payload, label=method, priority=priority)
+                break
+            except TonRpcUnavailable as exc:
+                delay = self._retry.next_delay(attempt, _rpc_deadline.get())
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.debug(
+                    "RPC {method}: повтор #{attempt} через {delay:.3f}s ({error})",
+                    method=method,
+                    attempt=attempt,
+                    delay=delay,
+                    error=exc,
+                )
+                await asyncio.sleep(delay)
+        if self._recorder is not None:
+            self._recorder.record_rpc(method, params, data)
+        if "error" in data:
+            raise TonDirectError(f"RPC ошибка {method}: {data['error']}")
+        return data.get("result")
+
+    async def rpc_call_many(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> list[Any]:
+        """Несколько вызовов явными JSON-RPC batch (частями по ``rpc_batch_max_size``).
+
+        Результаты возвращаются в порядке ``calls``; ошибка отдельного вызова
+        кладётся на его место как исключение TonDirectError.
+        """
+
+        if self._session is None:
+            raise TonDirectError("HTTP-сессия не инициализирована, вызовите start()")
+        if self._replayer is not None or len(calls) == 1:
+            return await asyncio.gather(
+                *(self.rpc_call(method, params, priority=priority) for method, params in calls),
+                return_exceptions=True,
+            )
+        chunks = await asyncio.gather(
+            *(
+                self._rpc_batch(calls[start : start + self._batch_max_size], priority)
+                for start in range(0, len(calls), self._batch_max_size)
+            )
+        )
+        return [result for chunk in chunks for result in chunk]
+
+    async def _rpc_batch(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        priority: RpcPriority,
+    ) -> list[Any]:
+        self._retry.on_request()
+        attempt = 0
+        while True:
+            payloads = [
+                {"jsonrpc": "2.0", "id": next(self._rpc_ids), "method": method, "params": params}
+                for method, params in calls
+            ]
+            try:
+                data = await self._post_batch(payloads, priority)
+                break
+            except TonRpcUnavailable as exc:
+                delay = self._retry.next_delay(attempt, _rpc_deadline.get())
+                if delay is None:
+                    raise
+                attempt += 1
+                logger.debug(
+                    "RPC batch[{size}]: повтор #{attempt} через {delay:.3f}s ({error})",
+                    size=len(calls),
+                    attempt=attempt,
+                    delay=delay,
+                    error=exc,
+                )
+                await asyncio.sleep(delay)
+        by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+        results: list[Any] = []
+        for (method, params), payload in zip(calls, payloads):
+            item = by_id.get(payload["id"])
+            if item is None:
+                results.append(TonDirectError(f"RPC {method}: ответ отсутствует в batch"))
+                continue
+            if self._recorder is not None:
+                self._recorder.record_rpc(method, params, item)
+            if "error" in item:
+                results.append(TonDirectError(f"RPC ошибка {method}: {item['error']}"))
+            else:
+                results.append(item.get("result"))
+        return results
+
+    @contextmanager
+    def deadline(self, timeout: float) -> Iterator[None]:
+        """Ограничивает RPC вызовы внутри блока дедлайном (повторы и HTTP таймауты).
+
+        Вложенные дедлайны не расширяют внешний.
+        """
+
+        current = _rpc_deadline.get()
+        candidate = time.monotonic() + timeout
+        token = _rpc_deadline.set(candidate if current is None else min(current, candidate))
+        try:
+            yield
+        finally:
+            _rpc_deadline.reset(token)
+
+    @staticmethod
+    def current_deadline() -> float | None:
+        """Дедлайн RPC текущего контекста (шкала ``time.monotonic``) или None."""
+
+        return _rpc_deadline.get()
+
+    async def _post(
+        self,
+        payload: dict[str, Any] | list[dict[str, Any]],
+        *,
+        label: str,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> Any:
+        """Отправляет JSON-RPC запрос (или batch) на лучший узел пула.
+
+        С лимитером запрос сначала ждёт токен класса ``priority``: лимит
+        считается по HTTP запросам, поэтому batch расходует один токен.
+
+        Узлы с открытым circuit breaker пропускаются; если недоступны все —
+        вызов сразу падает с TonRpcUnavailable. Для методов из
+        ``rpc_hedge_methods`` при медленном ответе основного узла запрос
+        дублируется на второй узел и возвращается первый успешный ответ.
+        """
+
+        if self._limiter is not None:
+            await self._limiter.acquire(priority)
+        blocked = {url for url, breaker in self._breakers.items() if not breaker.available()}
+        if len(blocked) == len(self._breakers):
+            raise TonRpcUnavailable(f"RPC {label}: все узлы недоступны (circuit breaker open)")
+        primary = self._pool.pick(exclude=blocked)
+        fallback = [url for url in self._pool.urls if url not in blocked and url != primary]
+        if not fallback or not self._needs_hedge(payload):
+            return await self._post_to(primary, payload, label=label)
+        first = asyncio.create_task(self._post_to(primary, payload, label=label))
+        pending = {first}
+        error: BaseException | None = None
+        # finally отменяет оставшиеся запросы, в том числе при отмене самого вызова.
+        try:
+            done, _ = await asyncio.wait(
+                {first},
+                timeout=self._pool.hedge_delay(primary, self._hedge_min_delay),
+            )
+            if done and first.exception() is None:
+                return first.result()
+            secondary = self._pool.pick(exclude={primary, *blocked})
+            logger.debug(
+                "RPC {label}: hedged-запрос на {secondary} (основной {primary})",
+                label=label,
+                secondary=secondary,
+                primary=primary,
+            )
+            pending = {first, asyncio.create_task(self._post_to(secondary, payload, label=label))}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+        finally:
+            for task in pending:
+                task.cancel()
+        assert error is not None
+        raise error
+
+    async def _post_to(
+        self,
+        endpoint: str,
+        payload: dict[str, Any] | list[dict[str, Any]],
+        *,
+        label: str,
+    ) -> Any:
+        """Один HTTP POST на конкретный узел с учётом статистики пула и breaker."""
+
+        if self._session is None:
+            raise TonDirectError("HTTP-сессия не инициализирована, вызовите start()")
+        breaker = self._breakers[endpoint]
+        timeout = self._request_timeout
+        # capped: HTTP таймаут укорочен дедлайном вызывающего кода.
+        capped = False
+        deadline = _rpc_deadline.get()
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TonRpcDeadlineExceeded(
+                    f"RPC {label}: дедлайн вызова истёк до отправки", deadline=deadline
+                )
+            if remaining < timeout:
+                timeout, capped = remaining, True
+        breaker.on_attempt()
+        started = time.perf_counter()
+        try:
+            async with self._session.post(
+                endpoint,
+                data=codec.dumps(payload),
+                headers=_JSON_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                if resp.status >= 400:
+                    text = await resp.text()
+                    message = f"RPC {label} завершился с HTTP {resp.status}: {text}"
+                    if resp.status in _RETRYABLE_HTTP_STATUSES:
+                        raise TonRpcUnavailable(message)
+                    breaker.on_success()
+                    raise TonDirectError(message)
+                body = await resp.read()
+            data = codec.loads(body)
+        except asyncio.CancelledError:
+            breaker.on_cancel()
+            raise
+        except TonRpcUnavailable:
+            self._record_failure(endpoint)
+            raise
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            if capped and isinstance(exc, asyncio.TimeoutError):
+                # Узел не успел за остаток дедлайна, а не за свой таймаут — не штрафуем.
+                breaker.on_cancel()
+                raise TonRpcDeadlineExceeded(
+                    f"RPC {label} на {endpoint}: истёк дедлайн вызова ({timeout * 1000:.0f} мс)",
+                    deadline=deadline,
+                ) from exc
+            self._record_failure(endpoint)
+            raise TonRpcUnavailable(f"RPC {label} на {endpoint} недоступен: {exc!r}") from exc
+        except codec.DecodeError as exc:
+            self._record_failure(endpoint)
+            raise TonRpcUnavailable(f"RPC {label}: некорректный JSON от {endpoint}") from exc
+        breaker.on_success()
+        self._pool.record_success(endpoint, time.perf_counter() - started)
+        return data
+
+    def _record_failure(self, endpoint: str) -> None:
+        self._pool.record_failure(endpoint)
+        breaker = self._breakers[endpoint]
+        breaker.on_failure()
+        if not breaker.available():
+            logger.warning(
+                "RPC узел {endpoint} отключён circuit breaker'ом ({state})",
+                endpoint=endpoint,
+                state=breaker.state.value,
+            )
+
+    def _needs_hedge(self, payload: dict[str, Any] | list[dict[str, Any]]) -> bool:
+        if not self._hedge_methods:
+            return False
+        items = payload if isinstance(payload, list) else [payload]
+        return any(item.get("method") in self._hedge_methods for item in items)
+
+    def rpc_stats(self) -> list[dict[str, Any]]:
+        """Статистика узлов RPC пула (EWMA задержки, доля ошибок, p95, breaker)."""
+
+        return [
+            {**stats, "breaker": self._breakers[stats["url"]].as_dict()}
+            for stats in self._pool.snapshot()
+        ]
+
+    def retry_stats(self) -> dict[str, Any]:
+        """Счётчики повторов RPC и остаток бюджета."""
+
+        return self._retry.as_dict()
+
+    def singleflight_stats(self) -> dict[str, Any]:
+        """Сколько RPC вызовов объединено с уже летящими (сэкономлено запросов)."""
+
+        if self._singleflight is None:
+            return {"name": "ton-rpc", "enabled": False}
+        return {"enabled": True, **self._singleflight.stats()}
+
+    def result_cache_stats(self) -> dict[str, Any]:
+        """Hit/miss статистика кеша get-методов."""
+
+        if self._result_cache is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._result_cache.stats()}
+
+    def replay_stats(self) -> dict[str, Any]:
+        """Прогресс воспроизведения записи (режим replay)."""
+
+        if self._replayer is None:
+            return {"mode": self._transport_mode}
+        return {"mode": self._transport_mode, **self._replayer.stats()}
+
+    def limiter_stats(self) -> dict[str, Any]:
+        """Состояние приоритетного лимитера (очереди и ожидание по классам)."""
 
-    async def get_jetton_data(self, address: str) -> dict[str, Any]:
-        """Возвращает данные JettonMinter через tonsdk get-method."""
+        if self._limiter is None:
+            return {"enabled": False}
+        return {"enabled": True, **self._limiter.stats()}
 
-        return await self.rpc_call(
+    def ingest_stats(self) -> dict[str, Any]:
+        """Глубина очереди WS событий, lag обработки и счётчики потерь."""
+
+        return self._ingest.stats()
+
+    async def _post_batch(
+        self,
+        payloads: list[dict[str, Any]],
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> list[dict[str, Any]]:
+        """Транспорт для RpcBatcher: один POST с массивом запросов."""
+
+        if len(payloads) == 1:
+            return [
+                await self._post(payloads[0], label=payloads[0]["method"], priority=priority)
+            ]
+        data = await self._post(payloads, label=f"batch[{len(payloads)}]", priority=priority)
+        if not isinstance(data, list):
+            raise TonDirectError(f"RPC batch вернул не массив: {data!r}")
+        return data
+
+    async def get_jetton_data(
+        self,
+        address: str,
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+        state_token: str | int | None = None,
+    ) -> dict[str, Any]:
+        """Возвращает данные JettonMinter через tonsdk get-method.
+
+        ``state_token`` — seqno блока или lt последней транзакции контракта;
+        пока он не меняется, ответ берётся из кеша get-методов.
+        """
+
+        return await self._cached_call(
             "getJettonData",
             {"address": address, "network": self._network},
+            address=address,
+            priority=priority,
+            state_token=state_token,
+        )
+
+    async def get_jetton_state(
+        self,
+        address: str,
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+    ) -> dict[str, Any]:
+        """Текущее состояние jetton: пул, объём, холдеры и lt — всегда мимо кеша."""
+
+        result = await self.rpc_call(
+            self._state_method,
+            {"address": address, "network": self._network},
+            priority=priority,
+        )
+        if not isinstance(result, dict):
+            raise TonDirectError(f"{self._state_method} вернул не объект: {result!r}")
+        return result
+
+    async def get_jetton_data_many(
+        self,
+        addresses: list[str],
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+        state_tokens: dict[str, str | int | None] | None = None,
+    ) -> dict[str, dict[str, Any] | Exception]:
+        """getJettonData для многих адресов: кеш get-методов, промахи — batch RPC.
+
+        Ошибка по отдельному адресу возвращается в словаре вместо данных.
+        """
+
+        state_tokens = state_tokens or {}
+        results: dict[str, dict[str, Any] | Exception] = {}
+        missing: list[tuple[str, dict[str, Any], str | None]] = []
+        for address in dict.fromkeys(addresses):
+            params = {"address": address, "network": self._network}
+            token = state_tokens.get(address)
+            token = str(token) if token is not None else None
+            if self._result_cache is not None:
+                found, value = self._result_cache.get(
+                    self._result_key(address, "getJettonData", params), token
+                )
+                if found:
+                    results[address] = value
+                    continue
+            missing.append((address, params, token))
+        if not missing:
+            return results
+        values = await self.rpc_call_many(
+            [("getJettonData", params) for _, params, _ in missing],
+            priority=priority,
         )
+        for (address, params, token), value in zip(missing, values):
+            results[address] = value
+            if self._result_cache is not None and not isinstance(value, Exception):
+                self._result_cache.set(
+                    self._result_key(address, "getJettonData", params), value, token
+                )
+        return results
 
-    async def simulate_tx(self, body_boc: str, address: str) -> dict[str, Any]:
+    async def simulate_tx(
+        self,
+        body_boc: str,
+        address: str,
+        *,
+        priority: RpcPriority = RpcPriority.BACKGROUND,
+        state_token: str | int | None = None,
+    ) -> dict[str, Any]:
         """simulateMessageProcess для honeypot/safety checker."""
 
-        return await self.rpc_call(
+        return await self._cached_call(
             "simulateMessageProcess",
             {"address": address, "boc": body_boc, "network": self._network},
+            address=address,
+            priority=priority,
+            state_token=state_token,
         )
 
-    async def estimate_fee(self, message_boc: str) -> dict[str, Any]:
+    async def estimate_fee(
+        self,
+        message_boc: str,
+        *,
+        priority: RpcPriority = RpcPriority.TRADE,
+        state_token: str | int | None = None,
+    ) -> dict[str, Any]:
         """Приблизительная комиссия для buy/sell операций."""
 
-        return await self.rpc_call(
+        return await self._cached_call(
             "estimateFee",
             {"boc": message_boc, "network": self._network},
+            address="",
+            priority=priority,
+            state_token=state_token,
         )
 
+    async def _cached_call(
+        self,
+        method: str,
+        params: dict[str, Any],
+        *,
+        address: str,
+        priority: RpcPriority,
+        state_token: str | int | None,
+    ) -> Any:
+        """rpc_call через кеш get-методов (если он включён)."""
+
+        if self._result_cache is None:
+            return await self.rpc_call(method, params, priority=priority)
+        token = str(state_token) if state_token is not None else None
+        key = self._result_key(address, method, params)
+        found, value = self._result_cache.get(key, token)
+        if found:
+            return value
+        value = await self.rpc_call(method, params, priority=priority)
+        self._result_cache.set(key, value, token)
+        return value
+
+    @staticmethod
+    def _result_key(address: str, method: str, params: dict[str, Any]) -> tuple[str, str, str]:
+        return (address, method, codec.dumps_str(dict(sorted(params.items()))))
+
     def subscribe_jetton_minters(
         self,
         callback: Callable[[JettonMinterEvent], Awaitable[None]],
@@ -131,51 +812,85 @@ class TonDirectClient:
 
         self._callbacks.add(callback)
 
-    async def _run_ws_loop(self) -> None:
-        """Основной поток чтения WebSocket сообщений."""
+    async def _run_ws_loop(self, feed: WsFeed) -> None:
+        """Поток чтения одной WebSocket подписки.
+
+        Переподключается с экспоненциальной задержкой. Если в момент
+        переподключения ни один фид не был на связи, дозапрашивает через RPC
+        минтеры, пропущенные за разрыв.
+        """
 
         assert self._session is not None
+        failures = 0
         while not self._stop_event.is_set():
             try:
                 async with self._session.ws_connect(
-                    self._ws_endpoint,
+                    feed.endpoint,
                     heartbeat=20,
-                    headers=self._ws_headers,
+                    headers=feed.headers,
                 ) as ws:
                     await ws.send_json(
                         {
                             "type": "subscribe",
                             "topic": "jetton-minter-created",
                             "network": self._network,
-                        }
+                        },
+                        dumps=codec.dumps_str,
                     )
-                    logger.info("Подписка на JettonMinter активирована")
+                    logger.info("Подписка на JettonMinter активирована ({feed})", feed=feed.name)
+                    failures = 0
+                    gap = not any(other.connected for other in self._ws_feeds)
+                    feed.connected = True
+                    if gap:
+                        self._schedule_backfill()
                     async for msg in ws:
                         if msg.type == aiohttp.WSMsgType.TEXT:
-                            await self._handle_ws_payload(msg.data)
+                            await self._handle_ws_payload(msg.data, feed)
                         elif msg.type == aiohttp.WSMsgType.ERROR:
                             raise TonDirectError(f"WS ошибка: {ws.exception()}")
             except Exception as exc:  # noqa: BLE001
+                feed.connected = False
                 if self._stop_event.is_set():
                     break
+                delay = self._reconnect_delay(failures)
+                failures += 1
+                feed.reconnects += 1
                 logger.warning(
-                    "WS toncenter отвалился: {error}, переподключение через {delay}s",
+                    "WS {feed} отвалился: {error}, переподключение через {delay:.1f}s",
+                    feed=feed.name,
                     error=str(exc),
-                    delay=self._ws_reconnect_delay,
+                    delay=delay,
                 )
-                await asyncio.sleep(self._ws_reconnect_delay)
+                await asyncio.sleep(delay)
+            else:
+                feed.connected = False
+                if not self._stop_event.is_set():
+                    await asyncio.sleep(self._reconnect_delay(0))
+
+    def _reconnect_delay(self, failures: int) -> float:
+        """Экспоненциальная задержка с jitter, ограниченная ws_reconnect_max_delay_sec."""
+
+        delay = min(self._ws_reconnect_max_delay, self._ws_reconnect_delay * 2**failures)
+        return delay * random.uniform(0.5, 1.0)
 
-    async def _handle_ws_payload(self, raw: str) -> None:
+    async def _handle_ws_payload(self, raw: str, feed: WsFeed | None = None) -> None:
         """Обработка входящих WS сообщений."""
 
+        if self._recorder is not None and feed is not None:
+            self._recorder.record_ws(feed.name, raw)
         try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
+            data = codec.loads(raw)
+        except codec.DecodeError:
             logger.debug("Не удалось декодировать WS сообщение: {raw}", raw=raw)
             return
         if data.get("type") != "jetton-minter-created":
             return
-        event = JettonMinterEvent(
+        # Не ждём колбэки: читатель WS сразу возвращается к следующему кадру.
+        await self._emit(self._event_from_frame(data), feed)
+
+    @staticmethod
+    def _event_from_frame(data: dict[str, Any]) -> JettonMinterEvent:
+        return JettonMinterEvent(
             address=data["payload"]["address"],
             owner_address=data["payload"].get("owner"),
             total_supply=int(data["payload"].get("total_supply") or 0) or None,
@@ -183,7 +898,151 @@ class TonDirectClient:
             timestamp=int(data.get("timestamp", 0)),
             raw=data,
         )
-        await self._dispatch_event(event)
+
+    async def _emit(self, event: JettonMinterEvent, feed: WsFeed | None = None) -> bool:
+        """Ставит событие в очередь, если этот минтер ещё не доставлялся.
+
+        При нескольких фидах побеждает первая копия, остальные отбрасываются,
+        а их отставание от первой копии копится в статистике фида.
+        """
+
+        now = time.monotonic()
+        origin = feed.name if feed is not None else event.raw.get("source", "rpc")
+        if feed is not None:
+            feed.events += 1
+            if event.timestamp:
+                feed.latency_total_ms += max(0.0, time.time() - event.timestamp) * 1000
+                feed.latency_samples += 1
+        first = self._recent_minters.get(event.address)
+        if first is not None:
+            self._recent_minters.move_to_end(event.address)
+            self._duplicates += 1
+            if feed is not None:
+                feed.late_arrivals += 1
+                feed.lag_total_ms += (now - first[0]) * 1000
+            return False
+        self._recent_minters[event.address] = (now, origin)
+        if len(self._recent_minters) > self._recent_minters_limit:
+            self._recent_minters.popitem(last=False)
+        if feed is not None:
+            feed.first_arrivals += 1
+            event.raw.setdefault("feed", feed.name)
+        self._advance_cursor(event)
+        await self._ingest.put(event)
+        return True
+
+    def _advance_cursor(self, event: JettonMinterEvent) -> None:
+        self._last_seen_ts = max(self._last_seen_ts, event.timestamp)
+        lt = event.raw.get("lt") or event.raw.get("payload", {}).get("lt")
+        try:
+            self._last_seen_lt = max(self._last_seen_lt, int(lt or 0))
+        except (TypeError, ValueError):
+            pass
+
+    def _schedule_backfill(self) -> None:
+        if not self._last_seen_ts and not self._last_seen_lt:
+            return
+        if self._backfill_task is not None and not self._backfill_task.done():
+            return
+        self._backfill_task = asyncio.create_task(
+            self._backfill(self._last_seen_ts, self._last_seen_lt),
+            name="ton-ws-backfill",
+        )
+
+    async def _backfill(self, since_ts: int, since_lt: int) -> None:
+        """Дозапрашивает минтеры, созданные после курсора, постранично через RPC."""
+
+        started_ts = since_ts
+        cursor_ts, cursor_lt = since_ts, since_lt
+        replayed = 0
+        while True:
+            items = await self._fetch_backfill_page(since_ts, since_lt)
+            if items is None:
+                break
+            for item in items:
+                frame = {
+                    "type": "jetton-minter-created",
+                    "timestamp": item.get("timestamp") or item.get("utime") or 0,
+                    "lt": item.get("lt"),
+                    "source": "backfill",
+                    "payload": item,
+                }
+                try:
+                    event = self._event_from_frame(frame)
+                except (KeyError, TypeError, ValueError) as exc:
+                    logger.debug("Backfill: пропущена запись {item}: {error}", item=item, error=exc)
+                    continue
+                cursor_ts = max(cursor_ts, event.timestamp)
+                try:
+                    cursor_lt = max(cursor_lt, int(item.get("lt") or 0))
+                except (TypeError, ValueError):
+                    pass
+                if await self._emit(event):
+                    replayed += 1
+            if len(items) < self._backfill_page_size:
+                break
+            if (cursor_ts, cursor_lt) <= (since_ts, since_lt):
+                logger.warning("Backfill: курсор не продвинулся, остановка пагинации")
+                break
+            since_ts, since_lt = cursor_ts, cursor_lt
+        self._replayed += replayed
+        logger.info(
+            "Backfill после переподключения: восстановлено {count} минтеров с ts={ts}",
+            count=replayed,
+            ts=started_ts,
+        )
+
+    async def _fetch_backfill_page(
+        self,
+        since_ts: int,
+        since_lt: int,
+    ) -> list[dict[str, Any]] | None:
+        """Одна страница backfill с экспоненциальными повторами; None — сдались."""
+
+        params = {
+            "since_utime": since_ts,
+            "since_lt": since_lt,
+            "limit": self._backfill_page_size,
+            "network": self._network,
+        }
+        for attempt in range(self._backfill_attempts):
+            try:
+                result = await self.rpc_call(
+                    self._backfill_method,
+                    params,
+                    priority=RpcPriority.SCANNER,
+                )
+            except TonDirectError as exc:
+                delay = self._reconnect_delay(attempt)
+                logger.warning(
+                    "Backfill {method} упал: {error}, повтор через {delay:.1f}s",
+                    method=self._backfill_method,
+                    error=exc,
+                    delay=delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+            if isinstance(result, dict):
+                result = result.get("minters") or result.get("items") or []
+            return [item for item in result or [] if isinstance(item, dict)]
+        logger.error(
+            "Backfill с ts={ts} не удался за {attempts} попыток — события за разрыв потеряны",
+            ts=since_ts,
+            attempts=self._backfill_attempts,
+        )
+        return None
+
+    def ws_stats(self) -> dict[str, Any]:
+        """Курсор WS потока, число восстановленных backfill и отброшенных дублей."""
+
+        return {
+            "last_seen_ts": self._last_seen_ts,
+            "last_seen_lt": self._last_seen_lt,
+            "replayed": self._replayed,
+            "duplicates": self._duplicates,
+            "backfill_running": bool(self._backfill_task and not self._backfill_task.done()),
+            "feeds": [feed.as_dict() for feed in self._ws_feeds],
+        }
 
     async def _dispatch_event(self, event: JettonMinterEvent) -> None:
         """Отправляет событие во все зарегистрированные колбэки."""
@@ -202,7 +1061,8 @@ class TonDirectClient:
         except Exception as exc:  # noqa: BLE001
             logger.exception("Колбэк TonDirect упал: {error}", error=exc)
 
-    def _normalize_ws_endpoint(self, endpoint: str) -> str:
+    @staticmethod
+    def _normalize_ws_endpoint(endpoint: str) -> tuple[str, dict[str, str] | None]:
         """Извлекает api_key из query и переносит его в заголовок."""
 
         parts = urlsplit(endpoint)
@@ -217,9 +1077,8 @@ class TonDirectClient:
                 parts.fragment,
             )
         )
-        if api_key:
-            self._ws_headers = {"X-API-Key": api_key}
-        return normalized
+        headers = {"X-API-Key": api_key} if api_key else None
+        return normalized, headers
 
 
 _client: TonDirectClient | None = None
@@ -235,7 +1094,16 @@ async def get_ton_client() -> TonDirectClient:
     return _client
 
 
-__all__ = ["TonDirectClient", "TonDirectError", "JettonMinterEvent", "get_ton_client"]
+__all__ = [
+    "JettonMinterEvent",
+    "RpcPriority",
+    "TonDirectClient",
+    "TonDirectError",
+    "TonRpcDeadlineExceeded",
+    "TonRpcUnavailable",
+    "WsFeed",
+    "get_ton_client",
+]
 
 
 
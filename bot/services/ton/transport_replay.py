@@ -0,0 +1,187 @@
+"""Запись и воспроизведение трафика TonDirectClient.
+
+В режиме ``record`` клиент пишет WS кадры и пары RPC запрос/ответ в сжатый
+JSONL (gzip). В режиме ``replay`` те же кадры проигрываются офлайн через
+обычный путь колбэков (очередь, дедупликация, GemScanner), а RPC ответы
+берутся из записи. Скорость: 1.0 — реальное время, 10.0 — в 10 раз быстрее,
+0 — максимально быстро.
+
+Записи копятся в памяти и дописываются в файл пачками, каждая пачка — отдельный
+gzip member, поэтому файл читается целиком даже после аварийного останова.
+Сжатие и запись идут в отдельном потоке, чтобы не блокировать event loop.
+Каждый запуск записи начинается с маркера сессии, метки ``t`` — unix-время.
+При воспроизведении паузы внутри сессии сохраняются, а между сессиями
+схлопываются: следующая сессия начинается сразу после предыдущей.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from loguru import logger
+
+from bot.utils import codec
+
+
+def rpc_key(method: str, params: dict[str, Any] | None) -> str:
+    return f"{method}:{codec.dumps_str(dict(sorted((params or {}).items())))}"
+
+
+class TrafficRecorder:
+    """Пишет трафик в gzip JSONL (одна запись — одна строка)."""
+
+    FLUSH_EVERY = 256
+
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._path = path
+        self._buffer: list[bytes] = []
+        self._closed = False
+        # Пачки пишутся в потоке по одной: lock сохраняет их порядок в файле.
+        self._lock = asyncio.Lock()
+        self._writes: set[asyncio.Task[None]] = set()
+        self.records = 0
+        self._write({"kind": "session"})
+
+    def record_ws(self, feed: str, raw: str) -> None:
+        self._write({"kind": "ws", "feed": feed, "data": raw})
+
+    def record_rpc(self, method: str, params: dict[str, Any] | None, response: Any) -> None:
+        self._write({"kind": "rpc", "method": method, "params": params or {}, "response": response})
+
+    async def close(self) -> None:
+        """Дописывает остаток буфера и дожидается фоновых записей."""
+
+        if self._closed:
+            return
+        self._closed = True
+        self._flush()
+        if self._writes:
+            await asyncio.gather(*self._writes, return_exceptions=True)
+        logger.info(
+            "Запись трафика TON завершена: {count} записей в {path}",
+            count=self.records,
+            path=self._path,
+        )
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if self._closed:
+            return
+        record["t"] = round(time.time(), 6)
+        self._buffer.append(codec.dumps(record) + b"\n")
+        if record["kind"] != "session":
+            self.records += 1
+        if len(self._buffer) >= self.FLUSH_EVERY:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buffer:
+            return
+        chunk, self._buffer = self._buffer, []
+        task = asyncio.create_task(self._append(chunk), name="ton-traffic-write")
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _append(self, chunk: list[bytes]) -> None:
+        async with self._lock:
+            try:
+                await asyncio.to_thread(self._append_sync, chunk)
+            except OSError as exc:
+                logger.warning(
+                    "Запись трафика TON: пачка из {count} записей потеряна ({error})",
+                    count=len(chunk),
+                    error=exc,
+                )
+
+    def _append_sync(self, chunk: list[bytes]) -> None:
+        with gzip.open(self._path, "ab") as fh:
+            fh.writelines(chunk)
+
+
+class TrafficReplayer:
+    """Проигрывает записанный трафик с заданной скоростью."""
+
+    def __init__(self, path: Path, *, speed: float = 1.0) -> None:
+        if not path.exists():
+            raise FileNotFoundError(f"Файл записи трафика не найден: {path}")
+        self._speed = speed
+        # Кадры с непрерывной шкалой времени: паузы между сессиями убраны.
+        self._ws_frames: list[tuple[float, str, str]] = []
+        self._rpc: dict[str, deque[Any]] = defaultdict(deque)
+        self._rpc_last: dict[str, Any] = {}
+        # Сдвиг текущей сессии, последний кадр (сдвинутый) и признак новой сессии.
+        shift = 0.0
+        last = 0.0
+        new_session = True
+        with gzip.open(path, "rb") as fh:
+            for line in fh:
+                record = codec.loads(line)
+                kind = record.get("kind")
+                if kind == "session":
+                    new_session = True
+                elif kind == "ws":
+                    t = record["t"]
+                    # Старые записи без маркеров: время пошло назад — новая сессия.
+                    if new_session or t + shift < last:
+                        shift = last - t
+                        new_session = False
+                    last = t + shift
+                    self._ws_frames.append((last, record["feed"], record["data"]))
+                elif record.get("kind") == "rpc":
+                    self._rpc[rpc_key(record["method"], record["params"])].append(
+                        record["response"]
+                    )
+        self.finished = asyncio.Event()
+        self.frames_played = 0
+        self.rpc_served = 0
+        self.rpc_missing = 0
+
+    @property
+    def frames_total(self) -> int:
+        return len(self._ws_frames)
+
+    def rpc_response(self, method: str, params: dict[str, Any] | None) -> Any | None:
+        """Ответ из записи: по порядку, последний ответ повторяется; None — не записан."""
+
+        key = rpc_key(method, params)
+        queue = self._rpc.get(key)
+        if queue:
+            self._rpc_last[key] = queue.popleft()
+        if key not in self._rpc_last:
+            self.rpc_missing += 1
+            return None
+        self.rpc_served += 1
+        return self._rpc_last[key]
+
+    async def play_ws(self, handler: Callable[[str, str], Awaitable[None]]) -> None:
+        """Отдаёт WS кадры в handler(raw, feed) с исходными интервалами / speed."""
+
+        started = time.monotonic()
+        base = self._ws_frames[0][0] if self._ws_frames else 0.0
+        for offset, feed, raw in self._ws_frames:
+            if self._speed > 0:
+                delay = (offset - base) / self._speed - (time.monotonic() - started)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                await asyncio.sleep(0)
+            await handler(raw, feed)
+            self.frames_played += 1
+        self.finished.set()
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "speed": self._speed,
+            "frames_total": self.frames_total,
+            "frames_played": self.frames_played,
+            "rpc_served": self.rpc_served,
+            "rpc_missing": self.rpc_missing,
+        }
+
+
+__all__ = ["TrafficRecorder", "TrafficReplayer", "rpc_key"]
@@ -0,0 +1,56 @@
+"""Bloom-фильтр для быстрых отрицательных ответов «точно нет в множестве».
+
+Размер битового массива и число хешей считаются из ожидаемой ёмкости и
+допустимой доли ложных срабатываний. Позиции — двойное хеширование одного
+blake2b дайджеста.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+from typing import Any, Iterator
+
+
+class BloomFilter:
+    """Bloom-фильтр на bytearray (без удаления элементов)."""
+
+    __slots__ = ("_bits", "_size", "_hashes", "capacity", "error_rate", "count")
+
+    def __init__(self, capacity: int, error_rate: float = 0.001) -> None:
+        self.capacity = max(capacity, 1)
+        self.error_rate = error_rate
+        self._size = max(
+            8, math.ceil(-self.capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self._hashes = max(1, round(self._size / self.capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self.count = 0
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "count": self.count,
+            "hashes": self._hashes,
+            "memory_kb": round(len(self._bits) / 1024, 1),
+            "error_rate": self.error_rate,
+        }
+
+    def _positions(self, key: str) -> Iterator[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        for idx in range(self._hashes):
+            yield (first + idx * second) % self._size
+
+
+__all__ = ["BloomFilter"]
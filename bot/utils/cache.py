@@ -18,6 +18,11 @@ from config.settings import get_settings
 settings = get_settings()
 _configured = False
 
+_SERIALIZERS = {
+    "compact": "bot.services.ton.report_codec.CompactSerializer",
+    "pickle": "aiocache.serializers.PickleSerializer",
+}
+
 
 def configure_cache() -> None:
     """Настраивает aiocache в зависимости от backend (memory/redis)."""
@@ -36,6 +41,8 @@ def configure_cache() -> None:
             {
                 "default": {
                     "cache": RedisCache,
+                    # Путь строкой: кодек импортирует сервисы, которые сами импортируют этот модуль.
+                    "serializer": {"class": _SERIALIZERS[settings.cache.serializer]},
                     **config,
                     "ttl": settings.cache.ttl_seconds,
                 }
@@ -0,0 +1,107 @@
+"""Единый JSON-кодек HyperSniper.
+
+Использует orjson или msgspec, если они установлены, иначе stdlib ``json``.
+Вывод у всех бэкендов компактный (без пробелов, UTF-8 без экранирования):
+для JSON-типов байты payload не зависят от того, какой бэкенд доступен.
+``datetime`` orjson, как и stdlib, пишет через ``str()``; msgspec кодирует
+его сам в ISO 8601 (с ``T``), как и dataclass/Enum — по-своему у каждого
+бэкенда, поэтому в ключах и подписях такие объекты заранее приводят к строке.
+
+Быстрые бэкенды ограничены 64-битными целыми и строковыми ключами: такие
+объекты кодируются через stdlib, а документы с длинными целыми (``total_supply``
+джеттонов — в полях и массивах) через stdlib же декодируются, чтобы не терять
+точность во float.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:  # pragma: no cover - optional dependency
+    msgspec = None  # type: ignore[assignment]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str).encode("utf-8")
+
+
+# Быстрые бэкенды держат только int64/uint64: документ, где значение поля или
+# элемент массива — целое из 19+ цифр (total_supply, баланс в nano), декодируем
+# через stdlib. Перед числом стоит ":", "[" или "," (и пробелы, знак "-"):
+# translate сводит их к ":", а цифры к "0", и дальше ищется подстрока — это в
+# разы дешевле regex с классом символов. Цифры в начале строки ("1000...") не
+# совпадают, а ложное срабатывание внутри строки лишь отдаёт документ stdlib.
+_NUMBER_SHAPE = bytes.maketrans(b"0123456789[, \t\r\n-", b"0000000000:::::::")
+_LONG_DIGITS = b"0" * 19
+_LONG_NUMBER = b":" + _LONG_DIGITS
+
+
+def _has_long_number(data: bytes) -> bool:
+    shape = data.translate(_NUMBER_SHAPE)
+    return _LONG_NUMBER in shape or shape.startswith(_LONG_DIGITS)
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    _loads: Callable[[str | bytes], Any] = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        # datetime — через default=str, как в stdlib, а не ISO с "T".
+        return orjson.dumps(obj, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME)
+
+elif msgspec is not None:
+    BACKEND = "msgspec"
+    _decoder = msgspec.json.Decoder()
+    _encoder = msgspec.json.Encoder(enc_hook=str)
+    _loads = _decoder.decode
+    _dumps = _encoder.encode
+else:
+    BACKEND = "json"
+    _loads = json.loads
+    _dumps = _stdlib_dumps
+
+# Общий тип ошибки декодирования для всех бэкендов.
+DecodeError: tuple[type[Exception], ...] = (ValueError,)
+if msgspec is not None:
+    DecodeError = (ValueError, msgspec.DecodeError)
+
+
+def loads(data: str | bytes | bytearray | memoryview) -> Any:
+    """Декодирует JSON из str/bytes."""
+
+    if isinstance(data, (bytearray, memoryview)):
+        data = bytes(data)
+    if BACKEND == "json":
+        return _loads(data)
+    if _has_long_number(data.encode("utf-8") if isinstance(data, str) else data):
+        return json.loads(data)
+    return _loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Кодирует объект в компактный JSON (bytes, UTF-8)."""
+
+    try:
+        return _dumps(obj)
+    except (TypeError, OverflowError):
+        # Целые больше 64 бит или нестроковые ключи словаря.
+        if BACKEND == "json":
+            raise
+        return _stdlib_dumps(obj)
+
+
+def dumps_str(obj: Any) -> str:
+    """То же, что dumps, но возвращает str (для aiohttp json_serialize)."""
+
+    return dumps(obj).decode("utf-8")
+
+
+__all__ = ["BACKEND", "DecodeError", "dumps", "dumps_str", "loads"]
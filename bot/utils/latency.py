@@ -0,0 +1,132 @@
+"""Гистограммы задержек по стадиям (HDR-подобные, фиксированная память).
+
+Значения хранятся в микросекундах в лог-линейных корзинах: до 128 мкс —
+точно, дальше каждая степень двойки делится на 64 корзины, поэтому
+относительная погрешность перцентилей не больше ~1.6% на всём диапазоне
+от микросекунд до минут. Запись — O(1) без аллокаций на горячем пути.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+_SUB_BUCKETS = 64
+_LINEAR_LIMIT = _SUB_BUCKETS * 2
+_MAX_US = 3_600_000_000
+
+
+def _bucket(value_us: int) -> int:
+    if value_us < _LINEAR_LIMIT:
+        return value_us
+    shift = value_us.bit_length() - 7
+    return (shift + 1) * _SUB_BUCKETS + (value_us >> shift) - _SUB_BUCKETS
+
+
+def _bucket_value(index: int) -> float:
+    """Середина корзины в микросекундах."""
+
+    if index < _LINEAR_LIMIT:
+        return float(index)
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return (mantissa << shift) + (1 << shift) / 2
+
+
+class LatencyHistogram:
+    """Распределение задержек одной стадии плюс счётчик таймаутов."""
+
+    __slots__ = ("_counts", "count", "timeouts", "total_us", "max_us")
+
+    def __init__(self) -> None:
+        self._counts: dict[int, int] = defaultdict(int)
+        self.count = 0
+        self.timeouts = 0
+        self.total_us = 0
+        self.max_us = 0
+
+    def record(self, seconds: float) -> None:
+        value = min(max(int(seconds * 1_000_000), 0), _MAX_US)
+        self._counts[_bucket(value)] += 1
+        self.count += 1
+        self.total_us += value
+        self.max_us = max(self.max_us, value)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+
+    def percentile(self, quantile: float) -> float:
+        """Перцентиль в миллисекундах (quantile от 0 до 100)."""
+
+        if not self.count:
+            return 0.0
+        rank = max(1, round(quantile / 100 * self.count))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(_bucket_value(index), self.max_us) / 1000
+        return self.max_us / 1000
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "p50_ms": round(self.percentile(50), 2),
+            "p95_ms": round(self.percentile(95), 2),
+            "p99_ms": round(self.percentile(99), 2),
+            "max_ms": round(self.max_us / 1000, 2),
+            "avg_ms": round(self.total_us / self.count / 1000, 2) if self.count else 0.0,
+        }
+
+
+class LatencyMetrics:
+    """Набор гистограмм по именам стадий."""
+
+    def __init__(self) -> None:
+        self._stages: dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+
+    def stage(self, name: str) -> LatencyHistogram:
+        histogram = self._stages.get(name)
+        if histogram is None:
+            histogram = self._stages[name] = LatencyHistogram()
+        return histogram
+
+    def observe(self, name: str, seconds: float) -> None:
+        self.stage(name).record(seconds)
+
+    def timeout(self, name: str) -> None:
+        self.stage(name).record_timeout()
+
+    @contextmanager
+    def measure(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage(name).record(time.perf_counter() - started)
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        return {name: histogram.snapshot() for name, histogram in self._stages.items()}
+
+    def reset(self) -> None:
+        self._stages.clear()
+        self.started_at = time.time()
+
+
+_metrics: LatencyMetrics | None = None
+
+
+def get_latency_metrics() -> LatencyMetrics:
+    """Общие гистограммы задержек пайплайна безопасности."""
+
+    global _metrics
+    if _metrics is None:
+        _metrics = LatencyMetrics()
+    return _metrics
+
+
+__all__ = ["LatencyHistogram", "LatencyMetrics", "get_latency_metrics"]
@@ -0,0 +1,110 @@
+"""Ограниченный рейтинг с индексом по ключу.
+
+Словарь ключ → запись плюс min-куча по score: вставка и обновление —
+O(log n), поиск по ключу — O(1), при переполнении вытесняется запись с
+минимальным score. Обновлённые и удалённые записи остаются в куче
+«устаревшими» и отбрасываются при извлечении; когда их становится больше
+живых, куча пересобирается. Топ-k считается ``heapq.nlargest`` за
+O(n log k) только при чтении, поэтому пул кандидатов может быть в сотни раз
+глубже показываемого топа без удорожания записи.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any, Callable, Generic, Iterator, TypeVar
+
+T = TypeVar("T")
+
+
+class RankedIndex(Generic[T]):
+    """Топ ``capacity`` элементов по score с обновлением на месте."""
+
+    __slots__ = ("capacity", "_entries", "_heap", "_seq", "evicted")
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(capacity, 1)
+        # ключ → (score, seq, элемент); seq отличает актуальную запись кучи от устаревших.
+        self._entries: dict[str, tuple[float, int, T]] = {}
+        self._heap: list[tuple[float, int, str]] = []
+        self._seq = itertools.count()
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __iter__(self) -> Iterator[T]:
+        return (item for _, _, item in self._entries.values())
+
+    def get(self, key: str) -> T | None:
+        entry = self._entries.get(key)
+        return entry[2] if entry is not None else None
+
+    def upsert(self, key: str, score: float, item: T) -> bool:
+        """Вставляет или обновляет элемент; True — если ключ уже был в рейтинге.
+
+        При переполнении вытесняется минимальный score — это может быть и сам
+        ``key``, поэтому попадание в рейтинг проверяется через ``key in index``.
+        """
+
+        seq = next(self._seq)
+        existed = key in self._entries
+        self._entries[key] = (score, seq, item)
+        heapq.heappush(self._heap, (score, seq, key))
+        if len(self._entries) > self.capacity:
+            self._evict()
+        self._maybe_compact()
+        return existed
+
+    def remove(self, key: str) -> T | None:
+        entry = self._entries.pop(key, None)
+        self._maybe_compact()
+        return entry[2] if entry is not None else None
+
+    def top(
+        self,
+        limit: int,
+        *,
+        where: Callable[[T], bool] | None = None,
+        sort_key: Callable[[T], Any] | None = None,
+    ) -> list[T]:
+        """Лучшие ``limit`` элементов (по score или ``sort_key``), опционально с фильтром."""
+
+        if sort_key is None:
+            ranked = (
+                (score, seq, item)
+                for score, seq, item in self._entries.values()
+                if where is None or where(item)
+            )
+            return [item for _, _, item in heapq.nlargest(limit, ranked)]
+        items = (item for _, _, item in self._entries.values() if where is None or where(item))
+        return heapq.nlargest(limit, items, key=sort_key)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "capacity": self.capacity,
+            "heap": len(self._heap),
+            "evicted": self.evicted,
+        }
+
+    def _evict(self) -> None:
+        while self._heap:
+            _score, seq, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] == seq:
+                del self._entries[key]
+                self.evicted += 1
+                return
+
+    def _maybe_compact(self) -> None:
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(score, seq, key) for key, (score, seq, _) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+
+__all__ = ["RankedIndex"]
@@ -0,0 +1,61 @@
+"""Singleflight: объединение одинаковых параллельных вызовов.
+
+Пока по ключу выполняется запрос, повторные вызовы не стартуют новый, а
+ждут результат уже летящего. Используется для RPC и тяжёлых проверок.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Делит один in-flight future между одинаковыми вызовами."""
+
+    def __init__(self, name: str = "singleflight") -> None:
+        self._name = name
+        self._inflight: dict[Hashable, asyncio.Future[T]] = {}
+        self.leaders = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет factory() либо присоединяется к уже идущему вызову по ключу."""
+
+        future = self._inflight.get(key)
+        if future is not None:
+            self.shared += 1
+            return await asyncio.shield(future)
+        self.leaders += 1
+        future = asyncio.ensure_future(factory())
+        self._inflight[key] = future
+        future.add_done_callback(lambda done: self._forget(key, done))
+        # shield: отмена одного ожидающего не должна отменять общий вызов.
+        return await asyncio.shield(future)
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def stats(self) -> dict[str, Any]:
+        """Счётчики: сколько вызовов выполнено и сколько сэкономлено."""
+
+        total = self.leaders + self.shared
+        return {
+            "name": self._name,
+            "leaders": self.leaders,
+            "shared": self.shared,
+            "in_flight": len(self._inflight),
+            "saved_ratio": round(self.shared / total, 3) if total else 0.0,
+        }
+
+    def _forget(self, key: Hashable, future: asyncio.Future[T]) -> None:
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            # Помечаем исключение как полученное, даже если ждущих не осталось.
+            future.exception()
+
+
+__all__ = ["SingleFlight"]
@@ -0,0 +1,39 @@
+"""Канонизация адресов TON.
+
+Один и тот же контракт приходит в разных формах: raw ``0:ab12...``,
+user-friendly bounceable ``EQ...`` / non-bounceable ``UQ...``, base64 или
+base64url. Для ключей кешей и дедупликации приводим всё к raw-виду
+``<workchain>:<hex в нижнем регистре>``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from functools import lru_cache
+
+
+@lru_cache(maxsize=65_536)
+def canonical_address(address: str) -> str:
+    """Возвращает raw-форму адреса; нераспознанные строки — как есть (strip)."""
+
+    value = address.strip()
+    if ":" in value:
+        workchain, _, account = value.partition(":")
+        try:
+            return f"{int(workchain)}:{int(account, 16):064x}"
+        except ValueError:
+            return value
+    if len(value) != 48:
+        return value
+    try:
+        raw = base64.urlsafe_b64decode(value.replace("+", "-").replace("/", "_"))
+    except (binascii.Error, ValueError):
+        return value
+    if len(raw) != 36:
+        return value
+    workchain = int.from_bytes(raw[1:2], "big", signed=True)
+    return f"{workchain}:{raw[2:34].hex()}"
+
+
+__all__ = ["canonical_address"]
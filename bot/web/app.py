@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import Depends, FastAPI, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from loguru import logger
 from pydantic import BaseModel, Field
@@ -18,10 +19,19 @@ from bot.context import gem_scanner, ton_connect
 from bot.middlewares.db import get_session_maker
 from bot.repositories import ensure_user_by_telegram_id
 from bot.services.ton.ton_direct import JettonMinterEvent
+from bot.utils import codec
+from bot.utils.latency import get_latency_metrics
 from bot.utils.security import decode_session_token
 from bot.web.webhooks import WebhookSubscription, get_webhook_subscribers, register_webhook
 from config.settings import get_settings
 
+class CodecJSONResponse(JSONResponse):
+    """JSON-ответ через общий кодек (orjson/msgspec, если установлены)."""
+
+    def render(self, content: Any) -> bytes:
+        return codec.dumps(content)
+
+
 bearer_scheme = HTTPBearer(auto_error=True)
 session_maker = get_session_maker()
 settings = get_settings()
@@ -130,7 +140,11 @@ async def lifespan(app: FastAPI):
     yield
 
 
-app = FastAPI(title="HyperSniper Mini App API", lifespan=lifespan)
+app = FastAPI(
+    title="HyperSniper Mini App API",
+    lifespan=lifespan,
+    default_response_class=CodecJSONResponse,
+)
 
 
 @app.post("/api/ton-connect/link", response_model=TonConnectLinkResponse)
@@ -162,6 +176,19 @@ async def api_gem_top(limit: int = 10) -> GemTopResponse:
     return GemTopResponse(tokens=[token.as_dict() for token in tokens])
 
 
+@app.get("/api/metrics/latency")
+async def api_metrics_latency(user_id: int = Depends(get_user_id)) -> dict:
+    """Перцентили задержек стадий SafetyChecker (только для админов)."""
+    if user_id not in settings.telegram.admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="admin only")
+    metrics = get_latency_metrics()
+    return {
+        "target_ms": settings.ton_security.max_safety_latency_ms,
+        "since": metrics.started_at,
+        "stages": metrics.snapshot(),
+    }
+
+
 @app.post("/api/webhooks", status_code=201)
 async def register_webhook_endpoint(req: WebhookRequest, user_id: int = Depends(get_user_id)) -> dict:
     register_webhook(user_id, WebhookSubscription(callback_url=req.callback_url, min_score=req.min_score))
@@ -204,6 +231,7 @@ async def receive_indexer_event(
             "source": "hypersniper_indexer",
             "code_hash": payload.code_hash,
             "tx_hash": payload.tx_hash,
+            "tx_lt": payload.tx_lt,
             "workchain": payload.workchain,
             "seqno": payload.seqno,
             "latency_ms": payload.meta.latency_ms,
@@ -62,6 +62,114 @@ class TonCenterSettings(BaseModel):
     use_websocket: bool = Field(
         True, description="Использовать WebSocket toncenter (отключить если используем индексер)"
     )
+    ws_endpoints: list[AnyUrl] = Field(
+        default_factory=list,
+        description="Дополнительные WebSocket фиды (события сливаются, побеждает первая копия)",
+    )
+    ws_connections_per_endpoint: int = Field(
+        1, ge=1, description="Параллельных подключений к каждому WS endpoint"
+    )
+    ws_queue_size: int = Field(
+        1000, ge=1, description="Ёмкость очереди WS событий между читателем и воркерами"
+    )
+    ws_workers: int = Field(4, ge=1, description="Число воркеров обработки WS событий")
+    ws_overflow_policy: Literal["drop_oldest", "block", "spill"] = Field(
+        "drop_oldest", description="Что делать при переполнении очереди WS событий"
+    )
+    ws_spill_path: Path = Field(
+        BASE_DIR / "database" / "ws_spill.jsonl",
+        description="Файл для сброса избытка событий при политике spill",
+    )
+    ws_reconnect_base_delay_sec: PositiveFloat = Field(
+        1.0, description="Начальная задержка переподключения WS (растёт экспоненциально)"
+    )
+    ws_reconnect_max_delay_sec: PositiveFloat = Field(
+        30.0, description="Потолок задержки переподключения WS"
+    )
+    ws_backfill_method: str = Field(
+        "getJettonMinters",
+        description="RPC метод выборки минтеров после (since_utime, since_lt) для backfill",
+    )
+    ws_backfill_page_size: int = Field(100, ge=1, description="Размер страницы backfill")
+    ws_backfill_attempts: int = Field(
+        5, ge=1, description="Попыток на страницу backfill (экспоненциальная задержка)"
+    )
+    ws_dedup_window: int = Field(
+        10_000, ge=1, description="Сколько последних минтеров помнить для отсева дублей"
+    )
+    jetton_state_method: str = Field(
+        "getJettonState",
+        description="RPC метод текущего состояния jetton (пул, холдеры, lt) для перепроверок",
+    )
+    transport_mode: Literal["live", "record", "replay"] = Field(
+        "live",
+        description="live — сеть; record — сеть + запись трафика; replay — офлайн из записи",
+    )
+    transport_path: Path = Field(
+        BASE_DIR / "database" / "ton_traffic.jsonl.gz",
+        description="Файл записи трафика TON (gzip JSONL)",
+    )
+    replay_speed: float = Field(
+        1.0, ge=0, description="Скорость replay: 1 — реальное время, 10 — x10, 0 — максимум"
+    )
+    rpc_endpoints: list[AnyHttpUrl] = Field(
+        default_factory=list,
+        description="Дополнительные RPC узлы пула (основной — rpc_endpoint)",
+    )
+    rpc_hedge_methods: list[str] = Field(
+        default_factory=lambda: ["getJettonData", "simulateMessageProcess"],
+        description="Методы, для которых медленный ответ дублируется на второй узел",
+    )
+    rpc_hedge_min_delay_ms: int = Field(
+        50, ge=0, description="Минимальная задержка перед hedged-запросом (иначе p95 узла)"
+    )
+    rpc_singleflight: bool = Field(
+        True, description="Объединять одинаковые параллельные RPC вызовы в один запрос"
+    )
+    rpc_rate_limit_per_sec: float = Field(
+        0.0,
+        ge=0,
+        description="Общий бюджет RPC запросов в секунду (0 — без ограничений)",
+    )
+    rpc_rate_burst: int = Field(
+        10, ge=1, description="Размер token bucket (допустимый всплеск запросов)"
+    )
+    rpc_request_timeout_ms: int = Field(
+        3000, ge=1, description="Таймаут одного HTTP RPC запроса (сужается дедлайном вызова)"
+    )
+    rpc_retry_attempts: int = Field(
+        2, ge=0, description="Максимум повторов при сетевой ошибке/таймауте/HTTP 429/5xx"
+    )
+    rpc_retry_base_delay_ms: int = Field(
+        25, ge=0, description="Базовая задержка повтора (экспонента с полным jitter)"
+    )
+    rpc_retry_budget_ratio: float = Field(
+        0.2, ge=0, description="Бюджет повторов: доля от числа первичных запросов"
+    )
+    rpc_breaker_failure_threshold: int = Field(
+        5, ge=1, description="Сбоев подряд до размыкания circuit breaker узла"
+    )
+    rpc_breaker_reset_sec: float = Field(
+        10.0, gt=0, description="Через сколько секунд пропускать пробный запрос (half-open)"
+    )
+    rpc_cache_max_entries: int = Field(
+        10_000, ge=0, description="Размер LRU кеша get-методов (0 — кеш выключен)"
+    )
+    rpc_cache_ttl_ms: int = Field(
+        2000, ge=0, description="Свежесть ответа get-метода, если токен состояния неизвестен"
+    )
+    rpc_cache_token_ttl_sec: float = Field(
+        300.0, gt=0, description="Максимальный возраст ответа при совпавшем seqno/lt"
+    )
+    rpc_batch_enabled: bool = Field(
+        False, description="Собирать параллельные RPC вызовы в один JSON-RPC batch"
+    )
+    rpc_batch_window_ms: int = Field(
+        5, ge=0, description="Окно накопления batch в миллисекундах"
+    )
+    rpc_batch_max_size: int = Field(
+        20, ge=1, description="Максимум вызовов в одном batch (при достижении — отправка сразу)"
+    )
 
 
 class TonSecuritySettings(BaseModel):
@@ -69,11 +177,104 @@ class TonSecuritySettings(BaseModel):
 
     simulate_workchain: int = 0
     max_safety_latency_ms: int = 600
+    report_finish_timeout_sec: float = Field(
+        10.0,
+        gt=0,
+        description="Сколько ждать в фоне проверки, не успевшие к max_safety_latency_ms",
+    )
+    report_stale_sec: int = Field(
+        0,
+        ge=0,
+        description="Окно stale-while-revalidate после TTL отчёта, секунд (0 — выключено)",
+    )
+    report_ttl_blacklisted_sec: int = Field(
+        3600, ge=1, description="TTL отчёта для токенов из чёрного списка / с нулевым score"
+    )
+    report_ttl_unsafe_sec: int = Field(300, ge=1, description="TTL отчёта для небезопасных токенов")
+    report_ttl_safe_sec: int | None = Field(
+        None, ge=1, description="TTL отчёта для безопасных токенов (None — CACHE__TTL_SECONDS)"
+    )
+    report_ttl_degraded_sec: int = Field(
+        10, ge=1, description="TTL отчёта, где часть проверок упала или не уложилась в дедлайн"
+    )
+    report_refresh_ahead_ratio: float = Field(
+        0.5,
+        gt=0,
+        le=1,
+        description="Доля TTL degraded отчёта, после которой он обновляется в фоне",
+    )
     min_liquidity_usd: PositiveFloat = 5_000.0
     min_volume_5m_usd: PositiveFloat = 20_000.0
     honeypot_ban_score: PositiveFloat = 0.9
     blacklist_addresses: list[str] = Field(default_factory=list)
+    simulation_concurrency: int = Field(
+        8, ge=1, description="Максимум одновременных simulateMessageProcess (honeypot)"
+    )
+    simulation_view_ttl_sec: float = Field(
+        120.0,
+        ge=0,
+        description="Сколько секунд открытый пользователем токен приоритетен в очереди симуляций",
+    )
+    code_verdict_memo: bool = Field(
+        True,
+        description="Запоминать honeypot-вердикт по code hash шаблона и не симулировать повторно",
+    )
+    code_verdict_ttl_sec: float = Field(
+        21_600.0,
+        ge=0,
+        description="Сколько секунд действует вердикт шаблона до повторного анализа (0 — вечно)",
+    )
+    code_verdict_resample_ratio: float = Field(
+        0.02,
+        ge=0,
+        le=1,
+        description="Доля токенов известного шаблона, которые всё равно симулируются для сверки",
+    )
+    code_verdict_honeypot_confirmations: int = Field(
+        2,
+        ge=1,
+        description="Сколько разных токенов шаблона должны провалить продажу до вердикта honeypot",
+    )
+    blacklist_db_path: Path = Field(
+        BASE_DIR / "database" / "blacklist.db",
+        description="SQLite с точным чёрным списком владельцев и code hash",
+    )
+    blacklist_bloom_capacity: int = Field(
+        1_000_000, ge=1, description="Ёмкость Bloom-фильтра чёрного списка (растёт при нехватке)"
+    )
+    blacklist_bloom_error_rate: float = Field(
+        0.001, gt=0, lt=1, description="Доля ложных срабатываний Bloom-фильтра"
+    )
+    blacklist_reload_sec: float = Field(
+        30.0, ge=0, description="Как часто проверять изменения файла чёрного списка (0 — никогда)"
+    )
     trusted_smart_money: list[str] = Field(default_factory=list)
+    smart_money_path: Path | None = Field(
+        None, description="Файл реестра смарт-кошельков: строки address[,weight[,label]]"
+    )
+    smart_money_reload_sec: float = Field(
+        60.0, ge=0, description="Период перезагрузки реестра смарт-кошельков, с (0 — только старт)"
+    )
+    recheck_enabled: bool = Field(
+        True, description="Перепроверять токены из топа, подписок и позиций по расписанию"
+    )
+    recheck_base_sec: float = Field(
+        300.0, gt=0, description="Базовый интервал перепроверки спокойного непопулярного токена"
+    )
+    recheck_min_sec: float = Field(
+        20.0, gt=0, description="Минимальный интервал перепроверки (волатильные/популярные)"
+    )
+    recheck_max_sec: float = Field(900.0, gt=0, description="Максимальный интервал перепроверки")
+    recheck_per_minute: float = Field(
+        60.0, gt=0, description="Бюджет перепроверок в минуту (каждая — несколько RPC)"
+    )
+    recheck_concurrency: int = Field(4, ge=1, description="Одновременных перепроверок не больше")
+    recheck_sync_sec: float = Field(
+        15.0, gt=0, description="Как часто сверять расписание с топом, подписками и позициями"
+    )
+    recheck_notify_score_delta: float = Field(
+        10.0, ge=0, description="Изменение score, о котором уведомляются подписчики токена"
+    )
 
 
 class CacheSettings(BaseModel):
@@ -82,6 +283,10 @@ class CacheSettings(BaseModel):
     backend: Literal["memory", "redis"] = "memory"
     ttl_seconds: int = 30
     redis_dsn: str | None = None
+    serializer: Literal["compact", "pickle"] = Field(
+        "compact",
+        description="Сериализатор Redis: compact — бинарный кодек отчётов и сигналов, pickle",
+    )
 
 
 class DatabaseSettings(BaseModel):
@@ -99,9 +304,18 @@ class GemScannerSettings(BaseModel):
 
     refresh_interval_sec: int = 15
     burst_threshold_tokens: int = 10
+    candidate_pool_size: int = Field(
+        2_000, ge=1, description="Глубина пула кандидатов Gem Hunter (топ берётся из него)"
+    )
     min_liquidity_usd: float = 5_000.0  # 0 = агрессивный режим
     min_volume_5m_usd: float = 20_000.0  # 0 = без фильтра
     hot_growth_percent: float = 35.0  # 0 = без фильтра
+    dedup_max_entries: int = Field(
+        50_000, ge=1, description="Бюджет памяти дедупликации минтеров (число адресов)"
+    )
+    dedup_ttl_sec: int = Field(
+        3600, ge=1, description="Сколько секунд помнить минтер для отсева дублей"
+    )
 
 
 class PriceFeedSettings(BaseModel):
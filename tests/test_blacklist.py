@@ -0,0 +1,49 @@
+"""Чёрный список: адреса из настроек не копятся в БД между рестартами."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from bot.services.ton.blacklist import BlacklistService, BlacklistStore
+from bot.utils.ton_address import canonical_address
+
+REMOVED = "0:" + "aa" * 32
+KEPT = "0:" + "bb" * 32
+IMPORTED = "0:" + "cc" * 32
+
+
+def _service(path: Path, addresses: list[str]) -> BlacklistService:
+    service = BlacklistService()
+    service._path = path
+    service._reload_interval = 0
+    service._static = frozenset(canonical_address(address) for address in addresses)
+    return service
+
+
+def test_address_removed_from_settings_is_unblocked_after_restart(tmp_path: Path) -> None:
+    path = tmp_path / "blacklist.db"
+
+    async def scenario() -> None:
+        # Так адреса из настроек сохраняли прежние версии.
+        legacy = BlacklistStore(path)
+        legacy.import_keys("owner", [REMOVED, KEPT], "settings")
+        legacy.import_keys("owner", [IMPORTED], "rugdb")
+        legacy.close()
+
+        first = _service(path, [REMOVED, KEPT])
+        await first.start()
+        assert await first.contains("owner", REMOVED)
+        assert await first.contains("owner", IMPORTED)
+        await first.stop()
+
+        restarted = _service(path, [KEPT])
+        await restarted.start()
+        try:
+            assert not await restarted.contains("owner", REMOVED)
+            assert await restarted.contains("owner", KEPT)
+            assert await restarted.contains("owner", IMPORTED)
+        finally:
+            await restarted.stop()
+
+    asyncio.run(scenario())
@@ -0,0 +1,55 @@
+"""CodeVerdictMemo: число подтверждений вердикта переживает рестарт."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from bot.models import CodeHashVerdict
+from bot.services.ton.code_verdicts import CodeVerdict, CodeVerdictMemo
+
+CODE_HASH = "cd" * 32
+
+
+def _memo(session_maker: async_sessionmaker[AsyncSession]) -> CodeVerdictMemo:
+    memo = CodeVerdictMemo()
+    memo._ttl = 0
+    memo._resample_ratio = 0.0
+    memo._honeypot_confirmations = 2
+    memo.set_session_maker(session_maker)
+    return memo
+
+
+def test_confirmations_are_loaded_after_restart(tmp_path: Path) -> None:
+    async def scenario() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'verdicts.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all, tables=[CodeHashVerdict.__table__])
+        session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        async def honeypot() -> CodeVerdict:
+            return CodeVerdict(sell_allowed=False)
+
+        first = _memo(session_maker)
+        for token in ("t1", "t2"):
+            await first.resolve(CODE_HASH, token, honeypot)
+        first._resample_ratio = 1.0
+        await first.resolve(CODE_HASH, "t3", honeypot)
+        assert first.info(CODE_HASH)["confirmations"] == 3
+        await asyncio.gather(*first._persist_tasks)
+
+        restarted = _memo(session_maker)
+        await restarted.start()
+        try:
+            info = restarted.info(CODE_HASH)
+            assert info is not None
+            assert info["verdict"] == CodeVerdict(sell_allowed=False)
+            assert info["confirmations"] == 3
+        finally:
+            await engine.dispose()
+
+    asyncio.run(scenario())
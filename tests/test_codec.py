@@ -0,0 +1,51 @@
+"""Кодек JSON: совпадение с stdlib на больших целых и нестроковых ключах."""
+
+from __future__ import annotations
+
+import json
+from datetime import date, datetime, timezone
+
+from bot.utils import codec
+
+TOTAL_SUPPLY = 10**30 + 7
+
+
+def test_loads_keeps_big_ints_exact() -> None:
+    payload = json.dumps({"total_supply": TOTAL_SUPPLY, "decimals": 9})
+
+    for data in (payload, payload.encode("utf-8")):
+        decoded = codec.loads(data)
+        assert decoded["total_supply"] == TOTAL_SUPPLY
+        assert isinstance(decoded["total_supply"], int)
+
+
+def test_dumps_big_ints_and_int_keys() -> None:
+    obj = {"supply": TOTAL_SUPPLY, "holders": {1: "a", 2: "b"}, "neg": -(2**70)}
+
+    encoded = codec.dumps(obj)
+
+    assert json.loads(encoded) == json.loads(json.dumps(obj))
+    assert codec.dumps_str(obj) == encoded.decode("utf-8")
+    assert codec.loads(encoded)["supply"] == TOTAL_SUPPLY
+
+
+def test_regular_payload_roundtrip() -> None:
+    obj = {"address": "0:" + "ab" * 32, "amount": 2**63 - 1, "symbol": "ТОН"}
+
+    assert codec.loads(codec.dumps(obj)) == obj
+
+
+def test_loads_keeps_big_ints_in_arrays() -> None:
+    for payload in (
+        "[1000000000000000000000000000007]",
+        '{"supplies": [1, -1000000000000000000000000000007]}',
+        '{"a": [1, 2,  10000000000000000000]}',
+    ):
+        for data in (payload, payload.encode("utf-8")):
+            assert codec.loads(data) == json.loads(payload)
+
+
+def test_dumps_datetime_matches_stdlib() -> None:
+    obj = {"at": datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc), "d": date(2024, 5, 1)}
+
+    assert codec.dumps(obj) == codec._stdlib_dumps(obj)
@@ -0,0 +1,73 @@
+"""RankedIndex и GemScanner: ключ, вытесненный сразу при вставке, не считается в топе."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from bot.services.ton.gem_scanner import GemScanner
+from bot.services.ton.safety_checker import SafetyChecker, SafetyReport
+from bot.services.ton.ton_direct import JettonMinterEvent
+from bot.utils.ranking import RankedIndex
+
+
+def test_lower_scored_key_is_evicted_on_insert() -> None:
+    index: RankedIndex[str] = RankedIndex(2)
+    index.upsert("a", 10.0, "a")
+    index.upsert("b", 20.0, "b")
+
+    existed = index.upsert("c", 5.0, "c")
+
+    assert not existed
+    assert "c" not in index
+    assert sorted(index) == ["a", "b"]
+    assert index.stats()["evicted"] == 1
+
+
+def _report() -> SafetyReport:
+    return SafetyReport(
+        is_safe=True,
+        score=1.0,
+        reasons=(),
+        liquidity_usd=50_000,
+        volume_5m_usd=50_000,
+        smart_money_hits=0,
+        lp_burned=False,
+        is_new=False,
+        owner=None,
+    )
+
+
+def test_admit_skips_signal_that_did_not_make_the_pool() -> None:
+    async def scenario() -> None:
+        scanner = GemScanner(SafetyChecker())
+        scanner._ranking = RankedIndex(2)
+        for key in ("0:" + "01" * 32, "0:" + "02" * 32):
+            scanner._ranking.upsert(key, 1_000.0, key)
+        persisted: list[Any] = []
+        notified: list[Any] = []
+
+        async def persist(signal: Any) -> None:
+            persisted.append(signal)
+
+        async def notify(*args: Any) -> None:
+            notified.append(args)
+
+        scanner._persist_signal = persist
+        scanner._notify_admins_new_token = notify
+        event = JettonMinterEvent(
+            address="0:" + "03" * 32,
+            owner_address=None,
+            total_supply=None,
+            symbol="LOW",
+            timestamp=0,
+            raw={},
+        )
+
+        await scanner._admit(event, _report())
+
+        assert event.address not in scanner._ranking
+        assert persisted == []
+        assert notified == []
+
+    asyncio.run(scenario())
@@ -0,0 +1,68 @@
+"""Компактный кодек кеша: round-trip отчётов с extra плагинов и адресами."""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from bot.services.ton.check_graph import ScoreAdjustment
+from bot.services.ton.gem_scanner import GemSignal
+from bot.services.ton.report_codec import CompactSerializer, is_compact
+from bot.services.ton.safety_checker import SafetyReport
+
+
+def _report(**overrides: object) -> SafetyReport:
+    fields: dict[str, object] = {
+        "is_safe": True,
+        "score": 82.5,
+        "reasons": ("LP burned",),
+        "liquidity_usd": 12_345.6,
+        "volume_5m_usd": 4_567.8,
+        "smart_money_hits": 2,
+        "lp_burned": True,
+        "is_new": True,
+        "owner": "0:" + "ab" * 32,
+    }
+    fields.update(overrides)
+    return SafetyReport(**fields)  # type: ignore[arg-type]
+
+
+def test_json_extra_stays_compact() -> None:
+    serializer = CompactSerializer()
+    report = _report(extra={"socials": {"count": 3, "links": ["t.me/x"]}, "score": 1.5})
+
+    data = serializer.dumps(report)
+
+    assert is_compact(data)
+    assert serializer.loads(data) == report
+
+
+def test_non_json_extra_round_trips_unchanged() -> None:
+    serializer = CompactSerializer()
+    report = _report(
+        extra={"plugin": ScoreAdjustment(delta=-5.0, reason="dev sold"), "pair": (1, 2)}
+    )
+    signal = GemSignal(
+        address="0:" + "cd" * 32,
+        symbol="GEM",
+        score=91.0,
+        tags=("new",),
+        report=report,
+        created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+    )
+
+    for value in (report, signal, [signal]):
+        restored = serializer.loads(serializer.dumps(value))
+        assert restored == value
+    assert serializer.loads(serializer.dumps(report)).extra["plugin"] == ScoreAdjustment(
+        delta=-5.0, reason="dev sold"
+    )
+
+
+def test_out_of_range_workchain_falls_back_to_text() -> None:
+    serializer = CompactSerializer()
+    report = _report(owner="300:" + "ef" * 32)
+
+    data = serializer.dumps(report)
+
+    assert is_compact(data)
+    assert serializer.loads(data).owner == report.owner
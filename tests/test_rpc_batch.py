@@ -0,0 +1,81 @@
+"""Лимитер RPC и микро-батчинг: токен берётся на HTTP запрос, а не на вызов."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from bot.services.ton.rpc_batch import RpcBatcher
+from bot.services.ton.rpc_limiter import RpcPriority
+from bot.services.ton.ton_direct import TonDirectClient
+
+
+class RecordingLimiter:
+    """Пропускает сразу, запоминая приоритет каждого acquire."""
+
+    def __init__(self) -> None:
+        self.acquired: list[RpcPriority] = []
+
+    async def acquire(self, priority: RpcPriority = RpcPriority.BACKGROUND) -> None:
+        self.acquired.append(priority)
+
+
+def test_batch_is_sent_with_most_urgent_priority() -> None:
+    async def scenario() -> None:
+        sent: list[tuple[int, RpcPriority]] = []
+
+        async def send(payloads: list[dict[str, Any]], priority: RpcPriority) -> list[dict]:
+            sent.append((len(payloads), priority))
+            return [{"id": payload["id"], "result": payload["id"]} for payload in payloads]
+
+        batcher = RpcBatcher(send, window=0.01, max_size=10)
+        results = await asyncio.gather(
+            batcher.submit({"id": 1}, RpcPriority.SCANNER),
+            batcher.submit({"id": 2}, RpcPriority.TRADE),
+            batcher.submit({"id": 3}, RpcPriority.BACKGROUND),
+        )
+        await batcher.submit({"id": 4}, RpcPriority.USER)
+        await batcher.close()
+
+        assert [item["result"] for item in results] == [1, 2, 3]
+        assert sent == [(3, RpcPriority.TRADE), (1, RpcPriority.USER)]
+
+    asyncio.run(scenario())
+
+
+def test_limiter_spends_one_token_per_batch() -> None:
+    async def scenario() -> None:
+        client = TonDirectClient()
+        client._session = object()
+        client._singleflight = None
+        client._recorder = None
+        client._replayer = None
+        limiter = RecordingLimiter()
+        client._limiter = limiter
+        client._batcher = RpcBatcher(client._post_batch, window=0.01, max_size=10)
+        posted: list[int] = []
+
+        async def post_to(endpoint: str, payload: Any, *, label: str) -> Any:
+            posted.append(len(payload) if isinstance(payload, list) else 1)
+            items = payload if isinstance(payload, list) else [payload]
+            responses = [{"id": item["id"], "result": item["method"]} for item in items]
+            return responses if isinstance(payload, list) else responses[0]
+
+        client._post_to = post_to
+        client._hedge_methods = frozenset()
+
+        results = await asyncio.gather(
+            *(
+                client.rpc_call(f"m{idx}", priority=priority)
+                for idx, priority in enumerate(
+                    [RpcPriority.BACKGROUND, RpcPriority.SCANNER, RpcPriority.USER] * 2
+                )
+            )
+        )
+        await client._batcher.close()
+
+        assert results == [f"m{idx}" for idx in range(6)]
+        assert posted == [6]
+        assert limiter.acquired == [RpcPriority.USER]
+
+    asyncio.run(scenario())
@@ -0,0 +1,101 @@
+"""SafetyChecker.check_jettons: медленный или упавший batch getJettonData."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from typing import Any
+
+from bot.services.ton.safety_checker import SafetyChecker, SafetyReport
+from bot.services.ton.ton_direct import TonRpcDeadlineExceeded, TonRpcUnavailable
+
+
+def _addresses(first: int) -> list[str]:
+    # Кеш отчётов общий для процесса — у каждого сценария свои адреса.
+    return [f"0:{idx:064x}" for idx in range(first, first + 3)]
+
+
+class FakeClient:
+    """getJettonData по адресу быстрый, batch — как задано в тесте."""
+
+    def __init__(self, batch_delay: float, batch_result: Any) -> None:
+        self.batch_delay = batch_delay
+        self.batch_result = batch_result
+        self.single: list[str] = []
+
+    @contextmanager
+    def deadline(self, timeout: float):
+        yield
+
+    async def get_jetton_data_many(self, addresses: list[str], **kwargs: Any) -> Any:
+        await asyncio.sleep(self.batch_delay)
+        if isinstance(self.batch_result, Exception):
+            raise self.batch_result
+        return self.batch_result
+
+    async def get_jetton_data(self, address: str, **kwargs: Any) -> dict[str, Any]:
+        self.single.append(address)
+        await asyncio.sleep(0.01)
+        return {"admin_address": None, "liquidity_usd": 50_000}
+
+
+def _checker(client: FakeClient) -> tuple[SafetyChecker, dict[str, SafetyReport]]:
+    checker = SafetyChecker()
+    checker._ton_client = client
+    published: dict[str, SafetyReport] = {}
+
+    async def on_update(address: str, report: SafetyReport) -> None:
+        published[address] = report
+
+    checker.subscribe_updates(on_update)
+    return checker, published
+
+
+def test_slow_batch_returns_provisional_reports_and_publishes_final() -> None:
+    async def scenario() -> None:
+        addresses = _addresses(1)
+        client = FakeClient(0.3, TonRpcDeadlineExceeded("batch deadline"))
+        checker, published = _checker(client)
+
+        reports = await checker.check_jettons(addresses, timeout=0.1)
+
+        assert set(reports) == set(addresses)
+        for report in reports.values():
+            assert report.is_provisional
+            assert "jetton_data" in report.pending_checks
+            # Проверки без зависимости от getJettonData не ждали batch.
+            assert not {"honeypot", "volume", "smart_money"} & set(report.pending_checks)
+            assert not report.is_safe
+        await asyncio.sleep(0.5)
+        assert set(published) == set(addresses)
+        assert all(not report.is_provisional for report in published.values())
+        assert sorted(client.single) == sorted(addresses)
+
+    asyncio.run(scenario())
+
+
+def test_failed_batch_and_per_address_errors_fall_back_to_single_fetch() -> None:
+    async def scenario() -> None:
+        failed, partial = _addresses(10), _addresses(20)
+        for addresses, batch_result, expected in (
+            (failed, TonRpcUnavailable("node down"), failed),
+            (
+                partial,
+                {
+                    partial[0]: {"admin_address": None, "liquidity_usd": 50_000},
+                    partial[1]: TonRpcUnavailable("bad address"),
+                },
+                partial[1:],
+            ),
+        ):
+            client = FakeClient(0.0, batch_result)
+            checker, _ = _checker(client)
+
+            reports = await checker.check_jettons(addresses, timeout=1.0)
+
+            assert set(reports) == set(addresses)
+            assert all(not report.is_provisional for report in reports.values())
+            assert all(report.liquidity_usd == 50_000 for report in reports.values())
+            assert sorted(client.single) == sorted(expected)
+
+    asyncio.run(scenario())
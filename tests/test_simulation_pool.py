@@ -0,0 +1,67 @@
+"""SimulationPool: общая симуляция не наследует дедлайн первого отправителя."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from bot.services.ton.rpc_limiter import RpcPriority
+from bot.services.ton.simulation_pool import SimulationPool
+from bot.services.ton.ton_direct import TonDirectClient, TonRpcDeadlineExceeded
+
+ADDRESS = "0:" + "ee" * 32
+
+
+def test_joiner_outlives_first_submitter_deadline() -> None:
+    async def scenario() -> None:
+        client = TonDirectClient()
+        seen: list[tuple[float | None, RpcPriority]] = []
+
+        async def simulate_tx(boc: str, address: str, **kwargs: Any) -> dict[str, Any]:
+            seen.append((client.current_deadline(), kwargs["priority"]))
+            await asyncio.sleep(0.2)
+            return {"success": True}
+
+        client.simulate_tx = simulate_tx
+        pool = SimulationPool(concurrency=1, view_ttl=0)
+
+        async def first() -> dict[str, Any]:
+            with client.deadline(0.05):
+                return await pool.simulate(client, "boc", ADDRESS, priority=RpcPriority.SCANNER)
+
+        async def joiner() -> dict[str, Any]:
+            await asyncio.sleep(0)
+            return await pool.simulate(client, "boc", ADDRESS, priority=RpcPriority.SCANNER)
+
+        first_result, joiner_result = await asyncio.gather(
+            first(), joiner(), return_exceptions=True
+        )
+
+        assert isinstance(first_result, TonRpcDeadlineExceeded)
+        assert joiner_result == {"success": True}
+        assert seen == [(None, RpcPriority.SCANNER)]
+        assert pool.stats()["shared"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_own_deadline_applies_to_joiner() -> None:
+    async def scenario() -> None:
+        client = TonDirectClient()
+
+        async def simulate_tx(boc: str, address: str, **kwargs: Any) -> dict[str, Any]:
+            await asyncio.sleep(0.2)
+            return {"success": False}
+
+        client.simulate_tx = simulate_tx
+        pool = SimulationPool(concurrency=1, view_ttl=0)
+        job = asyncio.ensure_future(pool.simulate(client, "boc", ADDRESS))
+        await asyncio.sleep(0)
+
+        with client.deadline(0.05), pytest.raises(TonRpcDeadlineExceeded):
+            await pool.simulate(client, "boc", ADDRESS)
+        assert await job == {"success": False}
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+"""TrafficRecorder: пачки пишутся вне event loop и в исходном порядке."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import threading
+from pathlib import Path
+
+from bot.services.ton.transport_replay import TrafficRecorder
+from bot.utils import codec
+
+
+def test_flush_writes_in_thread_and_keeps_order(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl.gz"
+
+    async def scenario() -> None:
+        recorder = TrafficRecorder(path)
+        recorder.FLUSH_EVERY = 4
+        writers: list[str] = []
+        append = recorder._append_sync
+
+        def tracking_append(chunk: list[bytes]) -> None:
+            writers.append(threading.current_thread().name)
+            append(chunk)
+
+        recorder._append_sync = tracking_append
+        for idx in range(10):
+            recorder.record_ws("ws0", f"frame{idx}")
+        await recorder.close()
+
+        assert len(writers) == 3
+        assert threading.main_thread().name not in writers
+
+    asyncio.run(scenario())
+
+    with gzip.open(path, "rb") as fh:
+        records = [codec.loads(line) for line in fh]
+    assert records[0]["kind"] == "session"
+    assert [record["data"] for record in records[1:]] == [f"frame{idx}" for idx in range(10)]